@@ -0,0 +1,719 @@
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+import pandas as pd
+import numpy as np
+import os
+import uuid
+from datetime import datetime
+import threading
+import functools
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# [시트 스키마 (열 정의 / 타입 정리)]
+import sheet_schema
+from sheet_schema import BOOK_COLS, READER_COLS, READ_COLS, BOARD_COLS, STATS_COLS, LOG_ID_POS, with_id_index
+import reading_stats
+
+# [독자 / 책 x 독자 기록 (횟수·별점·메모)]
+import book_readers
+
+# [저장소 백엔드 (구글 시트 / 로컬 SQLite)]
+import storage_backend
+
+# [로컬 저장소 (SQLite) + 시트 동기화]
+from local_store import LocalStore, SyncEngine
+from frame_snapshot import FrameSnapshot
+
+# [성능 기록 (구간별 시간 / 실행당 API 호출·바이트)]
+import perf_trace
+
+# =========================================================
+# 모든 화면(app_pages/*)이 함께 쓰는 것: 저장소 연결 / 데이터 로드 / 저장 / 동기화 / 성능 기록
+# 무거운 라이브러리(plotly, pyzbar, PIL, requests, gspread)는 여기서 불러오지 않고 쓰는 화면에서만
+# =========================================================
+
+# =========================================================
+# 🚨 [필수 설정] 사용자의 구글 시트 주소 (유지)
+# =========================================================
+SHEET_URL = "https://docs.google.com/spreadsheets/d/1WyA_dM3_cxqurORJ1wbYACBFBgDG9-4b_wPk8nWbwhA/edit?gid=1353177291#gid=1353177291"
+
+# --- [로컬 캐시 폴더 (표지 / 로컬 저장소 / 스냅샷)] ---
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(APP_DIR, ".cache")
+
+# --- [행 버전 열] books_df / reads_df / board_df에만 있는 열 (로컬 저장소의 행 버전, 비교 후 쓰기에 사용) ---
+ROW_VER = "_버전"
+
+# --- [함수 1] 저장소 연결 ---
+@st.cache_resource
+def get_backend():
+    # secrets의 [storage] 설정으로 구글 시트 / 로컬 SQLite 중 선택 (기본: 구글 시트)
+    try: config = st.secrets.to_dict()
+    except Exception: config = {}  # secrets 파일 없이 로컬 백엔드로 실행하는 경우
+    return storage_backend.from_config(config, SHEET_URL)
+
+def get_api_stats():
+    """작업별 시트 API 호출 수 (집계하지 않는 백엔드면 None)"""
+    return get_backend().api_stats()
+
+@st.cache_resource
+def get_spreadsheet():
+    return get_backend().open()
+
+@st.cache_resource
+def get_worksheets():
+    # 워크시트 이름 -> Worksheet 객체
+    return {w.title: w for w in get_spreadsheet().worksheets()}
+
+def get_worksheet(name, rows=100, cols=20):
+    wss = get_worksheets()
+    if name not in wss: wss[name] = get_spreadsheet().add_worksheet(name, rows, cols)
+    return wss[name]
+
+def fetch_sheet_values(names):
+    """여러 워크시트 값을 values batchGet 한 번으로 읽기 (없는 시트는 결과에서 빠짐)"""
+    wss = get_worksheets()
+    names = [n for n in names if n in wss]
+    if not names: return {}
+    resp = get_spreadsheet().values_batch_get([f"'{n}'" for n in names])
+    out = {}
+    for n, vr in zip(names, resp.get('valueRanges', [])):
+        values = vr.get('values', [])
+        # batchGet은 행 끝의 빈 칸을 잘라서 주므로 get_all_values처럼 폭을 맞춤
+        width = max((len(r) for r in values), default=0)
+        out[n] = [r + [""] * (width - len(r)) for r in values]
+    return out
+
+# --- [성능 기록] 실행(rerun)마다 구간별 시간과 시트 API 호출 수 / 바이트 ---
+@st.cache_resource
+def get_tracer():
+    # 환경변수 PERF_LOG에 파일 경로를 주면 끝난 실행마다 JSON 한 줄씩 붙임
+    return perf_trace.Tracer(log_path=os.environ.get("PERF_LOG"))
+
+def _api_totals():
+    stats = get_api_stats() or {}
+    return sum(r["calls"] for r in stats.values()), sum(r.get("bytes", 0) for r in stats.values())
+
+def perf_begin(kind):
+    # 이전 실행이 st.rerun / st.stop으로 끝났다면 여기서 마감 (마지막 구간까지만 셈)
+    prev = st.session_state.get('_perf_run')
+    if prev is not None: get_tracer().finish(prev, _api_totals(), complete=False)
+    if '_perf_session' not in st.session_state: st.session_state['_perf_session'] = uuid.uuid4().hex[:8]
+    st.session_state['_perf_run'] = get_tracer().begin(kind, _api_totals(), st.session_state['_perf_session'])
+
+def perf_end():
+    run = st.session_state.pop('_perf_run', None)
+    if run is not None: get_tracer().finish(run, _api_totals())
+
+def perf_span(name):
+    return perf_trace.span(st.session_state.get('_perf_run'), name)
+
+def perf_timed(name):
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with perf_span(name): return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+def perf_fragment(kind):
+    # 조각만 다시 실행될 때는 그 자체를 한 번의 실행으로 기록, 전체 실행 중에는 구간 하나로 기록
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            ctx = get_script_run_ctx()
+            if not (ctx and ctx.fragment_ids_this_run):
+                with perf_span(kind): return fn(*args, **kwargs)
+            perf_begin(f"fragment:{kind}")
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                perf_end()
+        return wrapper
+    return deco
+
+# --- [시트 스냅샷 & 변경분 기록] ---
+@st.cache_resource
+def get_sheet_lock():
+    # 저장/대기열 기록이 스냅샷을 동시에 건드리지 않도록
+    return threading.RLock()
+
+@st.cache_resource
+def get_sheet_snapshots():
+    # 워크시트 이름 -> 마지막으로 읽거나 쓴 시트 내용 (시트 행 순서 그대로, 저장 형식)
+    return {}
+
+def _cell(v):
+    if isinstance(v, np.generic): v = v.item()
+    if isinstance(v, bool): return {"userEnteredValue": {"boolValue": v}}
+    if isinstance(v, (int, float)): return {"userEnteredValue": {"numberValue": v}}
+    return {"userEnteredValue": {"stringValue": str(v)}}
+
+def _rewrite_sheet(wks, df_tosave):
+    header = df_tosave.columns.values.tolist()
+    data = df_tosave.values.tolist()
+    wks.clear()
+    wks.update(range_name='A1', values=[header] + data)
+    get_sheet_snapshots()[wks.title] = with_id_index(df_tosave)
+
+def write_sheet_delta(wks, df_tosave, extra=None):
+    """스냅샷과 비교해 바뀐 셀 / 추가된 행 / 삭제된 행만 한 번의 batch_update로 기록 (ID 기준, 입력은 _*_tosave 결과)
+    extra: 같은 batch_update에 함께 보낼 요청 (예: 로그 행 추가) - 둘 다 반영되거나 둘 다 실패"""
+    new = with_id_index(df_tosave)
+    snaps = get_sheet_snapshots()
+    old = snaps.get(wks.title)
+    cols = new.columns.tolist()
+    # 스냅샷이 없거나 열 구성이 다르면 전체 다시 쓰기
+    if old is None or old.columns.tolist() != cols:
+        _rewrite_sheet(wks, new)
+        if extra: wks.spreadsheet.batch_update({"requests": extra})
+        return
+
+    kept = old.index.isin(new.index)
+    deleted = np.flatnonzero(~kept)          # 스냅샷(=시트) 행 위치
+    appended = new[~new.index.isin(old.index)]
+    # 데이터 행이 모두 지워지는 경우 (고정 행 삭제 불가) 전체 다시 쓰기
+    if len(old) and len(deleted) == len(old):
+        _rewrite_sheet(wks, new)
+        if extra: wks.spreadsheet.batch_update({"requests": extra})
+        return
+
+    # 1) 바뀐 셀 (기존 행 위치 기준)
+    new_common = new.loc[old.index[kept]]
+    reqs = _changed_cells_requests(wks, old, new_common)
+    # 2) 삭제된 행
+    reqs += _delete_rows_requests(wks, deleted.tolist())
+    # 3) 추가된 행: 맨 뒤에 붙이기
+    if len(appended): reqs.append(_append_rows_request(wks, appended.values.tolist()))
+
+    reqs += extra or []
+    if reqs: wks.spreadsheet.batch_update({"requests": reqs})
+
+    snaps[wks.title] = pd.concat([new_common, appended])
+
+def write_sheet_rows(wks, df_rows, deleted=(), extra=None):
+    """바뀐 행만 올림 (입력은 _*_tosave 결과): 시트에 있던 행은 바뀐 칸만, 없던 행은 맨 뒤에 붙이고, deleted(ID)는 행 삭제
+    표 전체를 비교하지 않고 그 행들의 위치만 스냅샷에서 찾음 (스냅샷이 있어야 함). extra는 write_sheet_delta와 같음"""
+    new = with_id_index(df_rows)
+    snaps = get_sheet_snapshots()
+    old = snaps[wks.title]
+    gone = [old.index.get_loc(rid) for rid in deleted if rid in old.index]
+    # 데이터 행이 모두 지워지는 경우 (고정 행 삭제 불가) 전체 다시 쓰기
+    if len(old) and len(gone) == len(old):
+        _rewrite_sheet(wks, _apply_rows(old, new, deleted))
+        if extra: wks.spreadsheet.batch_update({"requests": extra})
+        return
+    hit = _in_index(new.index, old.index)
+    reqs = _changed_cells_requests(wks, old, new[hit])
+    reqs += _delete_rows_requests(wks, gone)
+    if (~hit).any(): reqs.append(_append_rows_request(wks, new[~hit].values.tolist()))
+    reqs += extra or []
+    if reqs: wks.spreadsheet.batch_update({"requests": reqs})
+    snaps[wks.title] = _apply_rows(old, new, deleted)
+
+def _apply_rows(old, new, deleted=()):
+    # old(ID 인덱스) 순서 그대로 new의 행으로 바꾸고, 없던 행은 뒤에 붙이고, deleted(ID)는 뺌 (시트에 한 일과 같은 모양)
+    drop = [rid for rid in deleted if rid in old.index]
+    out = old.drop(index=drop) if drop else old.copy()
+    hit = _in_index(new.index, out.index)
+    if hit.any(): out.loc[new.index[hit], :] = new.loc[hit, out.columns].to_numpy()
+    return pd.concat([out, new[~hit]]) if (~hit).any() else out
+
+def _in_index(ids, index):
+    # 몇 개 안 되는 ID를 큰 인덱스에서 찾을 때는 isin(전체를 훑음) 대신 인덱스의 해시 조회로
+    return np.array([rid in index for rid in ids], dtype=bool)
+
+def _changed_cells_requests(wks, old, new_common):
+    # 시트에 있던 행끼리 한 번에 비교하고, 행마다 처음~마지막 변경 열 구간만 (스냅샷의 행 위치 기준)
+    common = new_common.index
+    diff = old.loc[common].astype(str).to_numpy() != new_common.astype(str).to_numpy()
+    reqs = []
+    for r in np.flatnonzero(diff.any(axis=1)):
+        changed = np.flatnonzero(diff[r])
+        c0, c1 = int(changed[0]), int(changed[-1])
+        values = new_common.iloc[r, c0:c1 + 1].tolist()
+        reqs.append({"updateCells": {
+            "start": {"sheetId": wks.id, "rowIndex": old.index.get_loc(common[r]) + 1, "columnIndex": c0},
+            "rows": [{"values": [_cell(v) for v in values]}],
+            "fields": "userEnteredValue"
+        }})
+    return reqs
+
+def _delete_rows_requests(wks, positions):
+    # 데이터 행 위치(머리글 제외, 0부터) -> 이어진 구간마다 행 삭제 하나. 아래쪽부터 지워야 위치가 밀리지 않음
+    runs = []
+    for i in sorted(positions):
+        if runs and runs[-1][1] == i: runs[-1][1] = i + 1
+        else: runs.append([i, i + 1])
+    return [{"deleteDimension": {"range": {
+        "sheetId": wks.id, "dimension": "ROWS", "startIndex": start + 1, "endIndex": end + 1
+    }}} for start, end in reversed(runs)]
+
+def _append_rows_request(wks, rows):
+    return {"appendCells": {
+        "sheetId": wks.id,
+        "rows": [{"values": [_cell(v) for v in r]} for r in rows],
+        "fields": "userEnteredValue"
+    }}
+
+def _books_tosave(df):
+    for col in BOOK_COLS:
+        if col not in df.columns: df[col] = ""
+    return sheet_schema.to_sheet_values(df, BOOK_COLS)
+
+def _readers_tosave(df):
+    return sheet_schema.to_sheet_values(df, READER_COLS)
+
+def _reads_tosave(df):
+    return sheet_schema.to_sheet_values(df, READ_COLS)
+
+def _board_tosave(df):
+    for col in BOARD_COLS:
+        if col not in df.columns: df[col] = ""
+    df_tosave = sheet_schema.to_sheet_values(df, BOARD_COLS)
+    df_tosave['날짜'] = df_tosave['날짜'].astype(str)
+    return df_tosave
+
+def _stats_tosave(df):
+    return sheet_schema.to_sheet_values(df, STATS_COLS)
+
+def load_stats(raw_stats):
+    """stats 시트 원본 -> 집계표. 시트가 비어 있으면 logs 전체로 한 번 만들어 저장"""
+    snaps = get_sheet_snapshots()
+    if raw_stats:
+        stats_df, exact = sheet_schema.normalize_stats(raw_stats)
+        if exact: snaps["stats"] = _stats_tosave(stats_df)
+        else: snaps.pop("stats", None)
+        return stats_df
+    with get_sheet_lock():
+        logs_df = sheet_schema.normalize_logs(fetch_sheet_values(["logs"]).get("logs", []))
+        stats_df = reading_stats.build(logs_df)
+        snaps.pop("stats", None)
+        write_sheet_delta(get_worksheet("stats", 100, 10), _stats_tosave(stats_df))
+    return stats_df
+
+# --- [함수 2] 데이터 저장 (게시판) ---
+# 새 글은 한 행 추가, 고정/중요/수정/삭제는 그 행만 고침 (삭제는 '삭제' 표시만 하고 쌓이면 한꺼번에 정리)
+def _board_changed():
+    get_sync_engine().kick()
+    load_board.clear()
+
+@perf_timed("add_post")
+def add_post(content):
+    post = {'ID': str(uuid.uuid4()), '날짜': datetime.now().strftime("%Y-%m-%d %H:%M"), '내용': content,
+            '고정': False, '즐겨찾기': False, '삭제': False}
+    record = sheet_schema.to_records(_board_tosave(pd.DataFrame([post])), BOARD_COLS)[post['ID']]
+    get_local_store().compare_and_set("board", {post['ID']: (None, record)})
+    _board_changed()
+
+@perf_timed("update_post")
+def update_post(row, values):
+    """row: 화면에 보였던 글 (ROW_VER 포함). 그 사이 다른 곳에서 고쳤으면 지금 글 위에 values만 다시 씀
+    반환: 반영했는지 (그 사이 지워졌으면 False)"""
+    values = {c: sheet_schema.to_text(v) for c, v in values.items()}
+    resolve = lambda rid, cur, vals: False if cur is None or cur.get('삭제') == "TRUE" else vals
+    failed = get_local_store().update_rows("board", {row['ID']: (int(row[ROW_VER]), values)}, resolve)
+    _board_changed()
+    return not failed
+
+@perf_timed("compact_board")
+def compact_board():
+    """'삭제' 표시된 글을 실제로 지움 (시트에서는 다음 동기화 때 행 삭제 요청을 한 번에). 반환: 지운 수"""
+    store = get_local_store()
+    raw, vers = store.read_versioned("board", ['ID', '삭제'])
+    ids = [rid for rid, flag in raw[1:] if str(flag).upper() == "TRUE"]
+    if not ids: return 0
+    failed = store.update_rows("board", {rid: (vers[rid], None) for rid in ids}, lambda rid, cur, vals: False)
+    _board_changed()
+    return len(ids) - len(failed)
+
+# --- [함수 3] 데이터 로드 ---
+# 화면마다 필요한 표만: 로컬 저장소에서 그 표만 정리하고, 처음 여는 표는 시트에서 그 표만 받아 옴
+FRAMES = ("books", "stats", "readers", "reads")
+# 화면용 표 -> 그 표를 만드는 로컬 데이터 (집계는 아직 올리지 않은 로그도 더해서 보여 줌)
+FRAME_SOURCES = {"stats": ("stats", "logs")}
+# 화면(app_pages/<이름>.py) -> 그 화면이 읽는 표 (독자 목록은 사이드바에서 늘 씀)
+PAGE_TABLES = {
+    "dashboard": ("books", "readers", "reads", "stats"),
+    "library": ("books", "readers", "reads"),
+    "register": ("books", "readers"),
+    "board": ("board",),
+}
+
+def ensure_local(names):
+    """names 표를 로컬 저장소에 한 번도 받아 온 적이 없으면 (처음 실행 / 표가 새로 생긴 뒤 처음) 그 표만 받을 때까지 기다림
+    나머지 표는 바로 이어서 백그라운드에서 받음"""
+    # 예전 books 시트(독자별 열)를 옮길 때 reads 시트도 함께 봐야 하므로 books는 reads와 같이
+    names = set(names) | ({"reads"} if "books" in names else set())
+    if get_sync_engine().ready(names): return
+    try:
+        get_sync_engine().sync_once(names)
+    except Exception as e:
+        st.error(f"구글 시트 연결 오류: {e}")
+        st.stop()
+
+def frame_version(store, name):
+    # 저장소 파일 구분값 + 그 표를 만드는 로컬 표들의 버전 (JSON으로 저장해도 그대로 비교되도록 리스트)
+    return [store.uid] + [store.version(t) for t in FRAME_SOURCES.get(name, (name,))]
+
+def _with_versions(df, vers):
+    df[ROW_VER] = df.index.map(vers).fillna(0).astype("int64")
+    return df
+
+def _build_frame(store, name):
+    # 정리(빈 ID 채우기, 중복 제거, 타입 지정)는 sheet_schema에서 열 단위로 처리
+    # books / reads에는 읽은 시점의 행 버전도 붙임
+    if name == "books":
+        raw, vers = store.read_versioned("books", BOOK_COLS)
+        return _with_versions(sheet_schema.normalize_books(raw)[0], vers)
+    if name == "readers":
+        return sheet_schema.normalize_readers(store.read_raw("readers", READER_COLS))[0]
+    if name == "reads":
+        # 책 x 독자 기록 (읽었거나 별점/메모가 있는 조합만)
+        raw, vers = store.read_versioned("reads", READ_COLS)
+        return _with_versions(sheet_schema.normalize_reads(raw)[0], vers)
+    # 독서 집계 (일별/월별/아이별) + 아직 시트에 올리지 않은 로그
+    stats_df, _ = sheet_schema.normalize_stats(store.read_raw("stats", STATS_COLS))
+    _, logs = store.unpushed_logs()
+    return reading_stats.apply_logs(stats_df, logs) if logs else stats_df
+
+@st.cache_data(ttl=60, show_spinner="불러오는 중...")
+def load_data(names=FRAMES):
+    """반환: names 순서대로 DataFrame 튜플"""
+    ensure_local(names)
+    store = get_local_store()
+    # 그 표의 로컬 데이터가 지난번과 같으면 정리해 둔 Parquet 스냅샷을 그대로 사용 (재시작 포함)
+    # 버전은 만들기 전에 읽어 둠 (그 사이 바뀌면 다음 로드에서 다시 만듦)
+    versions = {name: frame_version(store, name) for name in names}
+    frames = get_frame_snapshot().load(versions)
+    built = {name: _build_frame(store, name) for name in names if name not in frames}
+    if built: get_frame_snapshot().save(versions, built)
+    frames.update(built)
+    return tuple(frames[name] for name in names)
+
+@st.cache_data(ttl=60, show_spinner="불러오는 중...")
+def load_board(fav_only=False, page=1, page_size=20):
+    """게시판 한 화면: 고정 글 전부 + 나머지 글 중 page쪽만 (최신 글부터). 게시판 전체를 DataFrame으로 만들지 않음
+    반환: (고정 글 df, 그 쪽 글 df, 나머지 글 수, '삭제' 표시만 된 글 수)"""
+    ensure_local(("board",))
+    store = get_local_store()
+    flag = lambda r, col: str(r.get(col, "")).upper() == "TRUE"
+    live = lambda r: not flag(r, '삭제') and (not fav_only or flag(r, '즐겨찾기'))
+    frame = lambda raw, vers: _with_versions(sheet_schema.normalize_board(raw)[0], vers)
+    start = (page - 1) * page_size
+    with store.lock:
+        pinned = frame(*store.select("board", BOARD_COLS, lambda r: live(r) and flag(r, '고정'))[:2])
+        raw, vers, n_feed = store.select("board", BOARD_COLS, lambda r: live(r) and not flag(r, '고정'),
+                                         start, start + page_size, reverse=True)
+        n_deleted = store.select("board", ['ID'], lambda r: flag(r, '삭제'), stop=0)[2]
+    return pinned.sort_values(by='날짜', ascending=False), frame(raw, vers), n_feed, n_deleted
+
+def clear_frames():
+    # 로컬 데이터가 바뀌면 화면용 캐시를 모두 비움 (동기화로 시트의 새 내용을 받았을 때 등)
+    load_data.clear()
+    load_board.clear()
+
+@st.cache_data(ttl=300, show_spinner="기록 불러오는 중...")
+def load_logs(names=("logs",)):
+    """상세 기록 보기용 logs 원본 (보관 시트 이름을 함께 주면 이어 붙임)"""
+    raw = fetch_sheet_values(list(names))
+    frames = [sheet_schema.normalize_logs(raw[n]) for n in names if n in raw]
+    if not frames: return sheet_schema.normalize_logs([])
+    return pd.concat(frames, ignore_index=True)
+
+def archive_logs(keep_months=3):
+    """최근 keep_months달만 logs에 남기고 이전 달은 연도별 logs_YYYY 시트로 옮김 (집계는 그대로). 반환: 옮긴 행 수"""
+    get_sync_engine().sync_once()
+    with get_sheet_lock():
+        raw = fetch_sheet_values(["logs"]).get("logs", [])
+        _, moved, gone = reading_stats.split_archive(raw, keep_months, datetime.now())
+        if not moved: return 0
+        # 보관 시트에 붙이기와 logs에서 옮긴 행 지우기를 한 번의 batch_update로
+        # (둘 다 반영되거나 둘 다 실패: logs가 비거나 같은 기록이 두 곳에 남는 순간이 없음)
+        reqs = []
+        for name, rows in sorted(moved.items()):
+            wks = get_worksheet(name, 100, 10)
+            if not wks.get_all_values(): rows = [raw[0]] + rows
+            reqs.append(_append_rows_request(wks, rows))
+        wks = get_worksheet("logs", 100, 10)
+        wks.spreadsheet.batch_update({"requests": reqs + _delete_rows_requests(wks, gone)})
+    load_logs.clear()
+    return sum(len(r) for r in moved.values())
+
+def sheet_logs():
+    """시트의 logs + 연도별 보관 시트 전체 (집계를 다시 만들거나, 예전 기록을 가져올 때 이미 있는 기록과 비교)"""
+    names = ["logs"] + sorted(n for n in get_worksheets() if n.startswith(reading_stats.ARCHIVE_PREFIX))
+    raw = fetch_sheet_values(names)
+    all_logs = [sheet_schema.normalize_logs(raw[n]) for n in names if n in raw]
+    return pd.concat(all_logs, ignore_index=True) if all_logs else sheet_schema.normalize_logs([])
+
+def rebuild_stats():
+    """시트를 직접 고친 경우 등: logs + 보관 시트 전체로 집계를 새로 만듦"""
+    get_sync_engine().sync_once()
+    with get_sheet_lock():
+        rebuilt = reading_stats.build(sheet_logs())
+        get_sheet_snapshots().pop("stats", None)
+        write_sheet_delta(get_worksheet("stats", 100, 10), _stats_tosave(rebuilt))
+    get_sync_engine().sync_once()  # 로컬 집계도 새 것으로
+    load_data.clear()
+
+# --- [함수 4] 데이터 저장 (책) ---
+# 표 전체를 다시 쓰지 않고 바뀐 행만: 화면에서 본 행 버전과 지금 버전이 같을 때만 쓰고 (compare-and-set),
+# 그 사이 다른 세션이 고친 행만 지금 값 기준으로 다시 시도
+def _book_record(row):
+    # books_df의 한 행 -> 저장 형식 {열: 문자열}
+    return sheet_schema.to_records(_books_tosave(row.to_frame().T), BOOK_COLS)[str(row['ID'])]
+
+def _books_changed():
+    get_sync_engine().kick()
+    load_data.clear()
+
+@perf_timed("insert_books")
+def insert_books(new_df):
+    records = sheet_schema.to_records(_books_tosave(new_df), BOOK_COLS)
+    get_local_store().update_rows("books", {rid: (None, r) for rid, r in records.items()}, lambda rid, cur, values: False)
+    _books_changed()
+
+def _update_fields(tbl, rid, ver, seen, mine):
+    """seen: 화면에서 본 행 {열: 문자열} (ver가 None이면 아직 없는 행의 기본값), mine: 바꿀 칸
+    반환: 반영하지 못한 칸 (다른 곳에서 같은 칸을 먼저 다른 값으로 고쳤거나 행이 지워진 경우)"""
+    lost = []
+
+    def resolve(rid, cur, vals):
+        if cur is None:
+            lost.extend(mine)
+            return False
+        # 내가 본 뒤로 다른 곳에서도 바뀐 칸이 있으면 덮어쓰지 않음 (다른 칸만 바뀌었으면 그대로 다시 시도)
+        clash = [c for c in mine if cur.get(c, "") != seen[c] and cur.get(c, "") != mine[c]]
+        if clash:
+            lost.extend(clash)
+            return False
+        return mine
+    # 없던 행은 기본값 위에 바꾼 칸을 얹어 새 행으로 (그 사이 다른 곳에서 만들었으면 그 행 위에 다시 시도)
+    first = mine if ver is not None else dict(seen, **mine)
+    failed = get_local_store().update_rows(tbl, {rid: (ver, first)}, resolve)
+    return lost or (list(mine) if failed else [])
+
+@perf_timed("update_book")
+def update_book(row, values):
+    """row: 화면에 보였던 행 (ROW_VER 포함), values: {열: 새 값}. 반환: 반영하지 못한 칸"""
+    seen = _book_record(row)
+    mine = {c: sheet_schema.to_text(v) for c, v in values.items() if sheet_schema.to_text(v) != seen[c]}
+    if not mine: return []
+    lost = _update_fields("books", str(row['ID']), int(row[ROW_VER]), seen, mine)
+    _books_changed()
+    return lost
+
+def _new_read(book_id, reader_id):
+    # 아직 없는 책 x 독자 행의 기본값 (저장 형식)
+    return {'ID': sheet_schema.read_id(book_id, reader_id), '책ID': str(book_id), '독자ID': str(reader_id),
+            **{c: sheet_schema.to_text(v) for c, v in book_readers.EMPTY.items()}}
+
+def read_snapshot(reads_df, book_id, reader_id):
+    """reads_df에서 본 (행 버전, 저장 형식 행). 행이 없으면 (None, 기본값)"""
+    rid = sheet_schema.read_id(book_id, reader_id)
+    if rid not in reads_df.index: return None, _new_read(book_id, reader_id)
+    row = reads_df.loc[rid]
+    return int(row[ROW_VER]), sheet_schema.to_records(_reads_tosave(row.to_frame().T), READ_COLS)[rid]
+
+@perf_timed("update_reads")
+def update_reads(book_id, seen, values):
+    """seen: {독자ID: read_snapshot 결과}, values: {독자ID: {열: 새 값}}
+    반환: 반영하지 못한 (독자ID, 칸) 목록"""
+    lost = []
+    for reader_id, vals in values.items():
+        ver, rec = seen[reader_id]
+        mine = {c: sheet_schema.to_text(v) for c, v in vals.items() if sheet_schema.to_text(v) != rec[c]}
+        if mine: lost += [(reader_id, c) for c in _update_fields("reads", rec['ID'], ver, rec, mine)]
+    if values: _books_changed()
+    return lost
+
+@perf_timed("insert_reads")
+def insert_reads(book_id, values):
+    """새 책의 첫 별점 등: values {독자ID: {열: 값}} (기본값과 같은 독자는 행을 만들지 않음)"""
+    changes = {}
+    for reader_id, vals in values.items():
+        rec = _new_read(book_id, reader_id)
+        mine = {c: sheet_schema.to_text(v) for c, v in vals.items()}
+        if any(rec[c] != v for c, v in mine.items()): changes[rec['ID']] = (None, dict(rec, **mine))
+    if changes: get_local_store().update_rows("reads", changes, lambda rid, cur, vals: False)
+
+@perf_timed("delete_book")
+def delete_book(row):
+    """화면에서 본 뒤로 바뀌지 않았을 때만 지움 (그 책의 독자 기록도 함께). 반환: 지웠는지"""
+    store = get_local_store()
+    failed = store.update_rows("books", {str(row['ID']): (int(row[ROW_VER]), None)}, lambda rid, cur, values: False)
+    if not failed:
+        drop = {}
+        for (reader_id,) in store.read_raw("readers", ['ID'])[1:]:
+            rid = sheet_schema.read_id(row['ID'], reader_id)
+            ver, cur = store.get_row("reads", rid)
+            if cur is not None: drop[rid] = (ver, None)
+        store.update_rows("reads", drop, lambda rid, cur, values: None)
+    _books_changed()
+    return not failed
+
+@perf_timed("add_reader")
+def add_reader(name, icon):
+    """새 독자 (ID = 이름). 반환: 추가했는지 (같은 이름이 이미 있으면 False)"""
+    record = {'ID': name, '이름': name, '아이콘': icon or sheet_schema.DEFAULT_ICON}
+    conflicts = get_local_store().compare_and_set("readers", {name: (None, record)})
+    _books_changed()
+    return not conflicts
+
+# --- [함수 5] 로컬 저장소 & 시트 동기화 ---
+class SheetRemote:
+    """SyncEngine이 쓰는 구글 시트 쪽 구현 (가져오기 / 변경분 올리기 / 로그 붙이기)"""
+
+    TABLES = {
+        "readers": (sheet_schema.normalize_readers, _readers_tosave, READER_COLS, 5),
+        "reads": (sheet_schema.normalize_reads, _reads_tosave, READ_COLS, 10),
+        "books": (sheet_schema.normalize_books, _books_tosave, BOOK_COLS, 10),
+        "board": (sheet_schema.normalize_board, _board_tosave, BOARD_COLS, 10),
+    }
+    # readers / reads를 books보다 먼저: 예전 books 시트를 옮길 때 독자 기록을 먼저 써 두고 books 열을 줄임
+    SYNCED = ("readers", "reads", "books", "board")
+
+    def revision(self):
+        # Drive 메타데이터 요청 한 번 (시트 내용은 받지 않음)
+        return get_spreadsheet().get_lastUpdateTime()
+
+    def pull(self, tables):
+        try:
+            # logs 원본은 계속 늘어나므로 읽지 않고 집계표(stats)만 읽음
+            raw = fetch_sheet_values(tables)
+        except Exception:
+            # 시트 구성이 바뀌었을 수 있으니 캐시된 핸들은 버림
+            get_spreadsheet.clear()
+            get_worksheets.clear()
+            raise
+        # 예전 books 시트(횟수_첫째 등 독자별 열): reads 시트가 비어 있으면 그 열을 reads 행으로 옮김
+        # 독자 시트가 비어 있으면 기본 독자(첫째/둘째)로 시작. 옮긴 표는 시트에 새로 씀
+        migrated = sheet_schema.migrate_wide_books(raw)
+        if "readers" in tables and len(raw.get("readers", [])) < 2:
+            raw["readers"] = sheet_schema.default_readers_raw()
+            migrated.add("readers")
+        snaps = get_sheet_snapshots()
+        out = {}
+        for name in tables:
+            if name == "stats":
+                out[name] = (sheet_schema.to_records(_stats_tosave(load_stats(raw.get("stats", []))), STATS_COLS), False)
+                continue
+            normalize, tosave, cols, _ = self.TABLES[name]
+            df, _, exact = normalize(raw.get(name, []))
+            exact = exact and name not in migrated
+            df_tosave = tosave(df)
+            # 시트와 행 순서가 그대로 맞을 때만 스냅샷 기록 (아니면 다음 저장은 전체 다시 쓰기)
+            if exact: snaps[name] = df_tosave
+            else: snaps.pop(name, None)
+            out[name] = (sheet_schema.to_records(df_tosave, cols), name in migrated or (name in raw and not exact))
+        return out
+
+    def push(self, tbl, rows, deleted=()):
+        normalize, tosave, cols, n_cols = self.TABLES[tbl]
+        df = tosave(normalize(sheet_schema.records_to_raw(rows, cols))[0])
+        with get_sheet_lock():
+            wks = get_worksheet(tbl, 100, n_cols)
+            snaps = get_sheet_snapshots()
+            if tbl not in snaps:
+                # 재시작 뒤 가져오지 않고 바로 올리는 경우: 행 위치를 알기 위해 이 시트만 한 번 읽음
+                cur, _, exact = normalize(fetch_sheet_values([tbl]).get(tbl, []))
+                if not exact:
+                    # 시트 모양이 어긋나 있으면 (머리글 / 중복 / 빈 ID) 지금 내용에 바뀐 행을 얹어 전체 다시 쓰기
+                    write_sheet_delta(wks, _apply_rows(with_id_index(tosave(cur)), with_id_index(df), deleted))
+                    return
+                snaps[tbl] = tosave(cur)
+            write_sheet_rows(wks, df, deleted)
+
+    def replace(self, tbl, rows):
+        normalize, tosave, cols, n_cols = self.TABLES[tbl]
+        df, _, _ = normalize(sheet_schema.records_to_raw(rows, cols))
+        with get_sheet_lock():
+            write_sheet_delta(get_worksheet(tbl, 100, n_cols), tosave(df))
+
+    def push_logs(self, logs, ids, unsure=False):
+        with get_sheet_lock():
+            # 로그 추가와 집계 갱신을 한 번의 batch_update로 (한쪽만 반영되어 숫자가 어긋나는 일이 없도록)
+            stats_wks = get_worksheet("stats", 100, 10)
+            logs_wks = get_worksheet("logs", 100, 10)
+            snaps = get_sheet_snapshots()
+            new = list(range(len(logs)))
+            if unsure:
+                # 지난번 batch_update가 반영됐는데 응답만 못 받았을 수 있음: 이미 붙은 로그는 빼고, 집계는 시트에서 다시 읽음
+                snaps.pop("stats", None)
+                on_sheet = {r[LOG_ID_POS] for r in fetch_sheet_values(["logs"]).get("logs", [])[1:] if len(r) > LOG_ID_POS}
+                new = [i for i in new if ids[i] not in on_sheet]
+            base = snaps.get("stats")
+            stats_df = load_stats(stats_wks.get_all_values()) if base is None else base
+            rows = [logs[i] for i in new]
+            if rows:
+                stats_df = reading_stats.apply_logs(stats_df, rows)
+                # 이번 로그가 더해진 칸만 올림 (집계표 전체를 비교하지 않음)
+                touched = _stats_tosave(stats_df.loc[reading_stats.count_logs(rows).index])
+                append = [_append_rows_request(logs_wks, [list(logs[i]) + [ids[i]] for i in new])]
+                if "stats" in snaps: write_sheet_rows(stats_wks, touched, extra=append)
+                else: write_sheet_delta(stats_wks, _stats_tosave(stats_df), extra=append)
+        load_logs.clear()
+        # 이미 붙어 있던 로그의 칸도 돌려줌 (로컬 집계에는 아직 없음)
+        return sheet_schema.to_records(_stats_tosave(stats_df.loc[reading_stats.count_logs(logs).index]), STATS_COLS)
+
+# 로컬 저장소와 스냅샷은 백엔드(시트 주소 / 로컬 파일)마다 따로 둠
+@st.cache_resource
+def get_local_store():
+    return LocalStore(os.path.join(CACHE_DIR, f"library_{get_backend().key}.sqlite3"))
+
+@st.cache_resource
+def get_frame_snapshot():
+    return FrameSnapshot(os.path.join(CACHE_DIR, "frames", get_backend().key))
+
+@st.cache_resource
+def get_sync_engine():
+    # 시트에서 새 내용을 받아 로컬이 바뀌면 화면용 캐시도 비움
+    return SyncEngine(get_local_store(), SheetRemote(), tables=SheetRemote.SYNCED, on_change=clear_frames).start()
+
+@perf_timed("bump_count")
+def bump_count(book_id, reader_id, delta):
+    # 지금 값에 delta를 더해 비교 후 쓰기 (그 사이 다른 세션이 더했으면 그 값에 다시 더함, 처음이면 행을 만듦)
+    def recount(rid, cur, values):
+        if cur is None: return dict(_new_read(book_id, reader_id), 횟수=str(delta)) if delta > 0 else False
+        n = pd.to_numeric(cur.get('횟수', "0"), errors='coerce')
+        return {'횟수': str(max(0, int(0 if pd.isna(n) else n) + delta))}
+    store = get_local_store()
+    rid = sheet_schema.read_id(book_id, reader_id)
+    ver, cur = store.get_row("reads", rid)
+    first = recount(rid, cur, None)
+    if first is not False: store.update_rows("reads", {rid: (ver, first)}, recount)
+    _books_changed()
+
+@perf_timed("add_log")
+def add_log(book_id, title, level, who):
+    today_str = datetime.now().strftime("%Y-%m-%d")
+    get_local_store().add_log([today_str, str(book_id), str(title), int(level), str(who)])
+    get_sync_engine().kick()
+    load_data.clear()
+
+@st.fragment(run_every="3s")
+def render_write_status():
+    # 카드만 다시 그려지는 동안에도 동기화 상태가 갱신되도록 자체 주기로 다시 그림
+    store, sync = get_local_store(), get_sync_engine()
+    n = store.pending()
+    if sync.last_error:
+        st.warning(f"⚠️ 시트 연결 실패 - 이 기기에 저장해 두고 자동 재시도 중 ({sync.last_error})")
+    if n:
+        s1, s2 = st.columns([5, 1])
+        s1.caption(f"⏳ 시트에 올릴 변경 {n}건")
+        if s2.button("💾 지금 저장", key="flush_now"):
+            try:
+                sync.sync_once()
+                st.toast("저장 완료")
+            except Exception as e:
+                st.error(f"저장 실패: {e}")
+            st.rerun()
+    elif sync.last_sync:
+        st.caption(f"✅ 모두 저장됨 ({datetime.fromtimestamp(sync.last_sync).strftime('%H:%M:%S')})")
+
+# --- [함수 6] 카드 / 글 조각 다시 그리기 ---
+def rerun_fragment():
+    # 조각 재실행 중이 아니면 (전체 실행 중 클릭 처리 등) 전체 화면을 다시 그림
+    try: st.rerun(scope="fragment")
+    except StreamlitAPIException: st.rerun()
@@ -0,0 +1,116 @@
+import pandas as pd
+import streamlit as st
+
+from app_core import load_board, perf_span, perf_fragment, rerun_fragment, add_post, update_post, compact_board
+
+# =========================================================
+# 📌 정보 게시판: 고정 글 + 최신 글 한 페이지씩 (그 글들만 읽음)
+# =========================================================
+
+# --- [게시판] 한 페이지 글 수 / 지운 글이 이만큼 쌓이면 시트에서 실제로 정리 ---
+BOARD_PAGE_SIZE = 20
+BOARD_COMPACT_AT = 20
+
+def post_gone():
+    # 그 사이 다른 곳에서 지운 글: 알리고 게시판을 다시 읽음 (화면의 글은 고치지 않음)
+    st.toast("⚠️ 다른 곳에서 지운 글입니다.")
+    st.session_state['editing_id'] = None
+    st.rerun()
+
+# --- [게시글] 글 단위로 다시 그림 ---
+@st.fragment
+@perf_fragment("board_post")
+def render_board_post(post_id):
+    if post_id not in board_df.index: return
+    row = board_df.loc[post_id]
+
+    with st.container(border=True):
+        c_info, c_acts = st.columns([2, 1])
+        with c_info:
+            pin_icon = "📌" if row['고정'] else ""
+            st.caption(f"{pin_icon} {row['날짜']}")
+        
+        with c_acts:
+            act1, act2 = st.columns(2)
+            
+            pin_label = "📌 해제" if row['고정'] else "📌 고정"
+            if act1.button(pin_label, key=f"pin_{post_id}", use_container_width=True):
+                if not update_post(row, {'고정': not row['고정']}): post_gone()
+                # 고정 글 목록이 바뀌므로 전체 화면을 다시 그림
+                st.rerun()
+
+            fav_label = "★ 해제" if row['즐겨찾기'] else "☆ 중요"
+            if act2.button(fav_label, key=f"fav_{post_id}", use_container_width=True):
+                if not update_post(row, {'즐겨찾기': not row['즐겨찾기']}): post_gone()
+                board_df.at[post_id, '즐겨찾기'] = not row['즐겨찾기']
+                rerun_fragment()
+
+        if st.session_state.get('editing_id') == post_id:
+            edit_txt = st.text_area("내용 수정", value=row['내용'], key=f"txt_{post_id}", height=100)
+            b1, b2 = st.columns(2)
+            if b1.button("완료", key=f"sav_{post_id}", use_container_width=True):
+                if not update_post(row, {'내용': edit_txt}): post_gone()
+                board_df.at[post_id, '내용'] = edit_txt
+                st.session_state['editing_id'] = None
+                rerun_fragment()
+            if b2.button("취소", key=f"cnl_{post_id}", use_container_width=True):
+                st.session_state['editing_id'] = None
+                rerun_fragment()
+        else:
+            st.write(row['내용'])
+            b_edit, b_del = st.columns([1, 1])
+            if b_edit.button("✏️ 수정", key=f"edt_{post_id}", use_container_width=True):
+                st.session_state['editing_id'] = post_id
+                rerun_fragment()
+            if b_del.button("🗑 삭제", key=f"del_{post_id}", use_container_width=True):
+                update_post(row, {'삭제': True})
+                # 지운 글이 쌓이면 한꺼번에 정리 (시트 행이 한 번에 당겨지도록)
+                if n_deleted + 1 >= BOARD_COMPACT_AT: compact_board()
+                st.toast("삭제됨")
+                st.rerun()
+
+
+# ---------------------------------------------------------
+# 정보 게시판 화면
+# ---------------------------------------------------------
+st.subheader("📌 정보 게시판")
+st.caption("고정(📌)과 즐겨찾기(★)를 활용해보세요.")
+
+with st.form("new_post", clear_on_submit=True):
+    content = st.text_area("메모 작성", height=70, placeholder="내용 입력...")
+    if st.form_submit_button("등록"):
+        if content:
+            add_post(content)
+            st.success("등록됨")
+            st.rerun()
+
+st.divider()
+filter_fav = st.checkbox("⭐ 중요 메모(즐겨찾기)만 보기", on_change=lambda: st.session_state.update(board_page=1))
+
+# 고정 글(몇 개 안 됨)과 나머지 글의 이번 쪽만 받아 옴 (글 수가 줄어 쪽이 없어졌으면 마지막 쪽으로)
+page = st.session_state.get('board_page', 1)
+with perf_span("load_data"):
+    pinned_df, page_df, n_feed, n_deleted = load_board(filter_fav, page, BOARD_PAGE_SIZE)
+    n_pages = max(1, -(-n_feed // BOARD_PAGE_SIZE))
+    if page > n_pages:
+        st.session_state['board_page'] = page = n_pages
+        pinned_df, page_df, n_feed, n_deleted = load_board(filter_fav, page, BOARD_PAGE_SIZE)
+# 글 단위 조각이 ID로 찾아 쓰는 표 (이번 화면에 보이는 글만)
+board_df = pd.concat([pinned_df, page_df])
+
+if len(board_df):
+    if 'editing_id' not in st.session_state: st.session_state['editing_id'] = None
+
+    for post_id in pinned_df.index:
+        render_board_post(post_id)
+
+    if n_pages > 1:
+        b_info, b_num = st.columns([4, 1])
+        b_num.number_input("페이지", min_value=1, max_value=n_pages, step=1, key="board_page")
+        b_info.caption(f"메모 {n_feed}개 · {page}/{n_pages} 페이지")
+    for post_id in page_df.index:
+        render_board_post(post_id)
+elif filter_fav:
+    st.info("조건에 맞는 메모가 없습니다.")
+else:
+    st.info("작성된 메모가 없습니다.")
@@ -0,0 +1,82 @@
+import streamlit as st
+# [그래프 (plotly) - 이 화면에서만]
+import plotly.express as px
+
+import reading_stats
+import book_readers
+
+from app_core import PAGE_TABLES, get_worksheets, load_data, load_logs, archive_logs, rebuild_stats, perf_span
+
+# =========================================================
+# 📊 대시보드: 독서량 / 월간 추이 / 별점 분석 / 상세 기록 (logs 원본은 펼칠 때만)
+# =========================================================
+TABLES = PAGE_TABLES["dashboard"]
+
+# ---------------------------------------------------------
+# 대시보드 화면
+# ---------------------------------------------------------
+with perf_span("load_data"): books_df, readers_df, reads_df, stats_df = load_data(TABLES)
+reader_rows = book_readers.reader_rows(readers_df)
+
+st.subheader("📈 독서 현황판")
+
+if books_df.empty:
+    st.info("등록된 책이 없습니다.")
+else:
+    # 독자별 독서량은 reads 행만 독자ID로 묶어서 (독자가 늘어도 한 줄에 넷씩)
+    totals = book_readers.totals(reads_df)
+    metrics = [("총 보유 도서", f"{len(books_df)}권"), ("전체 누적 읽기", f"{reading_stats.total(stats_df)}회")]
+    metrics += [(f"{icon} {name} 독서량", f"{int(totals.get(r, 0))}회") for r, name, icon in reader_rows]
+    for i in range(0, len(metrics), 4):
+        for c, (label, value) in zip(st.columns(4), metrics[i:i + 4]): c.metric(label, value)
+
+    st.markdown("---")
+
+    col_chart1, col_chart2 = st.columns([2, 1])
+    with col_chart1:
+        st.markdown("##### 🗓️ 월간 독서 추이")
+        by_month = st.toggle("월별로 보기", key="dash_by_month")
+        counts = reading_stats.monthly(stats_df) if by_month else reading_stats.daily(stats_df)
+        if not counts.empty:
+            fig = px.bar(counts, x='월' if by_month else '날짜', y='권수', color='누가', barmode='group')
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.caption("독서 기록이 없습니다.")
+
+    with col_chart2:
+        st.markdown("##### ⭐ 별점 반응 분석")
+        names = {name: r for r, name, _ in reader_rows}
+        target = st.radio("분석 대상", list(names), horizontal=True)
+
+        if target is not None:
+            r_data = book_readers.star_counts(reads_df, names[target])
+            if not r_data.empty:
+                fig_pie = px.pie(r_data, values='권수', names='별점', hole=0.4)
+                st.plotly_chart(fig_pie, use_container_width=True)
+            else:
+                st.caption("아직 별점 기록이 없습니다.")
+
+    # 상세 기록: 펼칠 때만 logs 원본을 읽음
+    st.markdown("---")
+    if st.toggle("🔎 상세 기록 보기", key="dash_drill"):
+        month_list = reading_stats.months(stats_df)
+        if not month_list:
+            st.caption("독서 기록이 없습니다.")
+        else:
+            month = st.selectbox("월 선택", month_list, key="dash_month")
+            # 보관된 달이면 해당 연도 시트도 함께 읽음
+            archive = reading_stats.archive_sheet(month)
+            names = ("logs", archive) if archive in get_worksheets() else ("logs",)
+            month_logs = load_logs(names)
+            month_logs = month_logs[month_logs['날짜'].dt.strftime('%Y-%m') == month]
+            st.dataframe(month_logs.sort_values('날짜', ascending=False), hide_index=True, use_container_width=True)
+
+        with st.expander("🗄️ 기록 정리"):
+            keep = st.number_input("logs 시트에 남길 최근 개월 수", min_value=1, max_value=24, value=3, key="arch_keep")
+            a1, a2 = st.columns(2)
+            if a1.button("이전 기록 보관하기", key="arch_run"):
+                n = archive_logs(int(keep))
+                st.success(f"{n}건을 연도별 시트로 옮겼습니다." if n else "옮길 기록이 없습니다.")
+            if a2.button("집계 다시 만들기", key="stats_rebuild"):
+                rebuild_stats()
+                st.rerun()
@@ -0,0 +1,221 @@
+import streamlit as st
+import numpy as np
+import urllib.parse
+
+import sheet_schema
+from sheet_schema import STAR_OPTIONS
+import book_readers
+# [서재 검색 색인 (제목 n-gram / ISBN / 메모)]
+import book_search
+# [표지 썸네일 (PIL / requests) - 이 화면에서만]
+from cover_store import CoverStore
+
+from app_core import (
+    PAGE_TABLES, get_local_store, frame_version, load_data, perf_span, perf_fragment, rerun_fragment,
+    bump_count, add_log, update_book, read_snapshot, update_reads, delete_book,
+)
+
+# =========================================================
+# 📖 서재 관리: 검색 / 필터 / 정렬 / 페이지 나누기 + 책 카드 (책 / 독자 / 독자별 기록만 읽음)
+# =========================================================
+TABLES = PAGE_TABLES["library"]
+
+# --- [서재 목록 페이지 크기] ---
+PAGE_SIZE_OPTIONS = [10, 20, 50, 100]
+
+# --- [서재 검색 색인] 처음 검색할 때 만들고, 데이터 버전이 바뀌면 바뀐 행만 반영 ---
+@st.cache_resource
+def get_book_index():
+    return book_search.BookIndex()
+
+def reset_lib_page():
+    # 검색어/필터가 바뀌면 첫 페이지부터
+    st.session_state['lib_page'] = 1
+
+# --- [표지 썸네일 저장소] ---
+@st.cache_resource
+def get_cover_store():
+    return CoverStore()
+
+# --- [책 카드] 카드 단위로 다시 그림 ---
+def set_read(book_id, reader_id, values):
+    """이번 실행의 reads_df에 바로 반영. 반환: 반영했는지 (아직 행이 없던 조합이면 False -> 전체를 다시 읽어야 함)"""
+    rid = sheet_schema.read_id(book_id, reader_id)
+    if rid not in reads_df.index: return False
+    for c, v in values.items(): reads_df.at[rid, c] = v
+    return True
+
+@st.fragment
+@perf_fragment("book_card")
+def render_book_card(book_id):
+    # 카드 안의 클릭은 이 카드만 다시 그림. 변경은 이번 실행의 books_df에도 바로 반영 (ID 인덱스로 바로 찾음)
+    if book_id not in books_df.index: return
+    row = books_df.loc[book_id]
+
+    with st.container(border=True):
+        c1, c2 = st.columns([1, 4])
+        
+        # [좌측: 이미지 & 미디어]
+        with c1:
+            st.image(get_cover_store().get(row['표지URL']), width=90)
+            
+            # 미디어 버튼
+            audio_url = str(row.get('음원URL', '')).strip()
+            if audio_url.startswith("http"):
+                st.link_button("🎧 음원", audio_url, use_container_width=True)
+            
+            search_query = f"{row['제목']} read a loud"
+            yt_url = f"https://www.youtube.com/results?search_query={urllib.parse.quote(search_query)}"
+            st.link_button("▶️ 영상", yt_url, use_container_width=True)
+
+        # [우측: 정보 & 컨트롤]
+        with c2:
+            st.markdown(f"#### {row['제목']}")
+            st.caption(f"ISBN: {row['ISBN']} | Level: {row['레벨']}")
+            
+            st.write("") # 간격
+
+            # [UI 개선] 읽기 카운트 컨트롤 (6:1:1 비율로 버튼 작게) - 독자마다 한 줄, 값은 reads_df에서 (책ID, 독자ID)로 바로
+            for n, (reader_id, name, icon) in enumerate(reader_rows, 1):
+                count = int(book_readers.cell(reads_df, book_id, reader_id, '횟수'))
+                r_col, r_min, r_plus = st.columns([6, 1, 1])
+                with r_col:
+                    st.markdown(f"{icon} **{name}** : **{count}** 회")
+                with r_min:
+                    if st.button("➖", key=f"btn_m{n}_{book_id}"):
+                        if count > 0:
+                            bump_count(book_id, reader_id, -1)
+                            set_read(book_id, reader_id, {'횟수': count - 1})
+                            st.toast("수정됨 (-1)")
+                            rerun_fragment()
+                with r_plus:
+                    if st.button("➕", key=f"btn_p{n}_{book_id}"):
+                        bump_count(book_id, reader_id, 1)
+                        add_log(book_id, row['제목'], row['레벨'], reader_id)
+                        st.toast("기록됨 (+1)")
+                        # 처음 읽은 조합은 새 행이 생기므로 전체를 다시 읽음
+                        if set_read(book_id, reader_id, {'횟수': count + 1}): rerun_fragment()
+                        else: st.rerun()
+
+            # 관리 메뉴
+            # 관리 폼은 열었을 때만 만듦 (닫힌 카드는 위젯 1개)
+            if not st.toggle("⚙️ 관리 (수정/삭제/메모)", key=f"mg_{book_id}"):
+                st.session_state.pop(f"seen_{book_id}", None)
+                st.session_state.pop(f"seen_r_{book_id}", None)
+            else:
+                # 폼을 연 시점의 행 (입력칸의 처음 값). 저장/삭제는 이 버전을 기준으로 비교 후 쓰기
+                seen = st.session_state.setdefault(f"seen_{book_id}", row.copy())
+                seen_reads = st.session_state.setdefault(f"seen_r_{book_id}", {r: read_snapshot(reads_df, book_id, r) for r, _, _ in reader_rows})
+                widget_keys = {'제목': f"tt_{book_id}", '레벨': f"lv_{book_id}", '표지URL': f"url_{book_id}", '음원URL': f"aud_{book_id}"}
+                t_edit, l_edit = st.columns([3, 1])
+                new_title = t_edit.text_input("제목", value=row['제목'], key=f"tt_{book_id}")
+                new_lvl = l_edit.selectbox("레벨", [1,2,3,4,5], index=int(row['레벨'])-1, key=f"lv_{book_id}")
+
+                new_img = st.text_input("표지 URL", value=row['표지URL'], key=f"url_{book_id}")
+                new_aud = st.text_input("음원 URL", value=row.get('음원URL', ''), key=f"aud_{book_id}")
+
+                st.markdown("---")
+                read_edits = {}
+                for i in range(0, len(reader_rows), 2):
+                    for (n, (reader_id, name, icon)), k in zip(enumerate(reader_rows[i:i + 2], i + 1), st.columns(2)):
+                        if reader_id not in seen_reads: seen_reads[reader_id] = read_snapshot(reads_df, book_id, reader_id)
+                        cur = seen_reads[reader_id][1]
+                        widget_keys.update({(reader_id, '반응'): f"s{n}_{book_id}", (reader_id, '메모'): f"txt_m{n}_{book_id}"})
+                        with k:
+                            st.caption(f"{icon} {name}")
+                            idx_r = STAR_OPTIONS.index(cur['반응']) if cur['반응'] in STAR_OPTIONS else 0
+                            read_edits[reader_id] = {
+                                '반응': st.selectbox("별점", STAR_OPTIONS, index=idx_r, key=f"s{n}_{book_id}"),
+                                '메모': st.text_area("메모", value=cur['메모'], key=f"txt_m{n}_{book_id}", height=60),
+                            }
+
+                bs1, bs2 = st.columns([1, 4])
+                if bs1.button("💾 저장", key=f"sv_{book_id}"):
+                    edits = {'제목': new_title, '레벨': new_lvl, '표지URL': new_img, '음원URL': new_aud}
+                    lost = update_book(seen, edits) + update_reads(book_id, seen_reads, read_edits)
+                    del st.session_state[f"seen_{book_id}"]
+                    del st.session_state[f"seen_r_{book_id}"]
+                    if lost:
+                        # 다른 곳에서 먼저 고친 칸은 입력칸을 지금 값으로 되돌리고 전체를 다시 읽음
+                        names = {r: name for r, name, _ in reader_rows}
+                        for c in lost: st.session_state.pop(widget_keys[c], None)
+                        labels = [c if isinstance(c, str) else f"{names[c[0]]} {c[1]}" for c in lost]
+                        st.toast(f"⚠️ 다른 곳에서 먼저 고친 칸은 저장하지 않았습니다: {', '.join(labels)}")
+                        st.rerun()
+                    for k, v in edits.items(): books_df.at[book_id, k] = v
+                    st.toast("저장 완료")
+                    changed = {r: v for r, v in read_edits.items() if any(str(x) != seen_reads[r][1][c] for c, x in v.items())}
+                    # 처음 별점/메모를 남긴 조합이 있으면 새 행이 생기므로 전체를 다시 읽음
+                    if all([set_read(book_id, r, v) for r, v in changed.items()]): rerun_fragment()
+                    else: st.rerun()
+
+                if bs2.button("🗑 삭제", key=f"del_{book_id}"):
+                    if st.session_state.get(f"ck_{book_id}"):
+                        # 목록 구성이 바뀌므로 전체 화면을 다시 그림
+                        if not delete_book(seen):
+                            st.session_state.pop(f"seen_{book_id}", None)
+                            st.toast("⚠️ 폼을 연 뒤 다른 곳에서 바뀐 책이라 지우지 않았습니다. 확인 후 다시 눌러 주세요.")
+                        st.rerun()
+                    else:
+                        st.session_state[f"ck_{book_id}"] = True
+                        st.warning("삭제하려면 한 번 더 누르세요.")
+
+# ---------------------------------------------------------
+# 서재 관리 화면 (UI 개선)
+# ---------------------------------------------------------
+# 데이터 로드 (버전은 먼저 읽어 둠: 그 사이 바뀌면 다음 실행에서 색인을 다시 맞춤)
+data_version = [frame_version(get_local_store(), name) for name in ("books", "reads")]
+with perf_span("load_data"): books_df, readers_df, reads_df = load_data(TABLES)
+reader_rows = book_readers.reader_rows(readers_df)
+
+c_head, c_sort = st.columns([3, 2])
+with c_head: st.subheader("📖 보유 도서 목록")
+with c_sort:
+    by_reader = {f"{name} 많이 읽은 책": r for r, name, _ in reader_rows}
+    sort_option = st.selectbox("정렬 기준", ["최신 등록순", *by_reader, "레벨 높은 순"])
+
+if not books_df.empty:
+    # [검색 & 필터] 제목/ISBN/메모 검색은 색인으로, 레벨/별점/안 읽은 책은 열 단위 비교로
+    query = st.text_input("🔍 검색", key="lib_q", placeholder="제목 / ISBN / 메모 (띄어 쓰면 모두 포함)", on_change=reset_lib_page)
+    with st.expander("필터"):
+        f1, f2, f3, f4 = st.columns([2, 1, 2, 1])
+        f_levels = f1.multiselect("레벨", [1, 2, 3, 4, 5], key="lib_f_level", on_change=reset_lib_page)
+        reader_ids = {name: r for r, name, _ in reader_rows}
+        f_reader = f2.selectbox("누가", ["모두", *reader_ids], key="lib_f_reader", on_change=reset_lib_page)
+        f_stars = f3.multiselect("별점", STAR_OPTIONS, key="lib_f_stars", on_change=reset_lib_page)
+        f_never = f4.checkbox("안 읽은 책", key="lib_f_never", on_change=reset_lib_page)
+        st.caption("'누가'를 고르면 별점/안 읽은 책을 그 아이 기준으로 봅니다. (모두: 별점은 한 명이라도, 안 읽은 책은 모두)")
+
+    with perf_span("search"):
+        mask = book_search.filter_mask(books_df, reads_df, readers_df.index, f_levels, reader_ids.get(f_reader), f_stars, f_never)
+        if query.strip():
+            index = get_book_index()
+            index.refresh(data_version, books_df, reads_df)
+            mask &= index.mask(books_df, query)
+        found_df = books_df if mask.all() else books_df[mask]
+
+    # 정렬은 새 DataFrame을 돌려주므로 따로 복사하지 않음
+    if sort_option == "최신 등록순": display_df = found_df.iloc[::-1]
+    elif sort_option in by_reader:
+        counts = book_readers.per_book(reads_df, by_reader[sort_option], '횟수', found_df.index).to_numpy()
+        display_df = found_df.iloc[np.argsort(-counts, kind='stable')]
+    else: display_df = found_df.sort_values(by='레벨', ascending=False)
+
+    # [페이지 나누기] 한 번에 page_size권만 그림
+    p_info, p_size, p_num = st.columns([3, 1, 1])
+    page_size = p_size.selectbox("페이지당", PAGE_SIZE_OPTIONS, index=1, key="lib_page_size")
+    n_pages = max(1, -(-len(display_df) // page_size))
+    if st.session_state.get('lib_page', 1) > n_pages: st.session_state['lib_page'] = n_pages
+    page = p_num.number_input("페이지", min_value=1, max_value=n_pages, step=1, key="lib_page")
+    found = f"{len(books_df)}권 중 {len(display_df)}권" if len(display_df) != len(books_df) else f"총 {len(display_df)}권"
+    p_info.caption(f"{found} · {page}/{n_pages} 페이지")
+    if display_df.empty: st.info("조건에 맞는 책이 없습니다.")
+
+    page_df = display_df.iloc[(page - 1) * page_size: page * page_size]
+    with perf_span("cover_prefetch"): get_cover_store().prefetch(page_df['표지URL'].tolist())
+
+    with perf_span("library_render"):
+        for book_id in page_df.index:
+            render_book_card(book_id)
+else:
+    st.info("등록된 책이 없습니다.")
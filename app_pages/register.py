@@ -0,0 +1,190 @@
+import os
+import uuid
+
+import streamlit as st
+import pandas as pd
+
+import sheet_schema
+from sheet_schema import STAR_OPTIONS, with_id_index
+import book_readers
+# [도서 정보 검색 (ISBN 캐시, requests는 처음 조회할 때) / 일괄 등록 / 예전 기록 가져오기]
+from book_lookup import search_book_info
+import bulk_import
+import legacy_import
+
+from app_core import (
+    PAGE_TABLES, APP_DIR, get_local_store, get_sync_engine, load_data, perf_span, insert_books, insert_reads, sheet_logs,
+)
+
+# =========================================================
+# ➕ 새 책 등록: 바코드 / ISBN / 일괄 등록 / 예전 기록 가져오기 (책 / 독자만 읽음)
+# =========================================================
+TABLES = PAGE_TABLES["register"]
+
+
+def scan(img, kind):
+    # 바코드 인식(pyzbar / PIL)은 사진이 들어왔을 때 처음 불러옴
+    import barcode_scan
+    with perf_span("scan_code"):
+        return barcode_scan.scan_code(img, barcode_scan.BOOK_SYMBOLS if kind == "book" else barcode_scan.QR_SYMBOLS)
+
+
+# ---------------------------------------------------------
+# 새 책 등록 화면
+# ---------------------------------------------------------
+with perf_span("load_data"): books_df, readers_df = load_data(TABLES)
+reader_rows = book_readers.reader_rows(readers_df)
+
+st.subheader("➕ 새 책 등록")
+if 'reg_title' not in st.session_state: 
+    st.session_state.update({'reg_title':"", 'reg_isbn':"", 'reg_img':"", 'reg_audio':"", 'search_done':False})
+
+m = st.radio("입력 방식", ["📸 바코드 촬영", "🖼️ 갤러리 업로드", "✍️ 수동 입력", "📚 여러 권 한꺼번에", "🗂️ 예전 기록 가져오기"], horizontal=True, label_visibility="collapsed")
+
+if m == "🗂️ 예전 기록 가져오기":
+    st.caption("예전 앱의 books_data.csv(책 목록)와 reading_log.csv(읽기 기록)를 가져옵니다. "
+               "같은 ID/ISBN의 책은 합치고, 독자별 횟수는 기록에서 다시 셉니다 (이미 있는 기록은 건너뜀). 중간에 멈춰도 같은 파일로 다시 실행하면 이어서 진행합니다.")
+    bundled = [f for f in ("books_data.csv", "reading_log.csv") if os.path.exists(os.path.join(APP_DIR, f))]
+    with st.form("legacy_form"):
+        l_books = st.file_uploader("책 목록 (books_data.csv)", type=['csv'])
+        l_logs = st.file_uploader("읽기 기록 (reading_log.csv)", type=['csv'])
+        l_bundled = st.checkbox(f"앱 폴더의 파일 사용 ({', '.join(bundled)})") if bundled else False
+        names = {r_name: r_id for r_id, r_name, _ in reader_rows}
+        l_who = st.selectbox("'누가'가 없는 기록은 누구의 기록인가요?", list(names) or [sheet_schema.LEGACY_READERS[0][0]])
+        l_go = st.form_submit_button("📥 가져오기")
+
+    if l_go:
+        def _src(upload, name):
+            if upload: return upload.getvalue()
+            return os.path.join(APP_DIR, name) if l_bundled and name in bundled else None
+        books_src, logs_src = _src(l_books, "books_data.csv"), _src(l_logs, "reading_log.csv")
+        if books_src is None and logs_src is None:
+            st.warning("가져올 파일을 골라 주세요.")
+        else:
+            status = st.empty()
+            labels = {"books": "책", "logs": "읽기 기록", "counts": "예전 횟수"}
+            with st.spinner("가져오는 중..."), perf_span("legacy_import"):
+                # 이미 시트에 있는 기록과 같은 기록은 건너뜀 (대기 중인 로그를 먼저 올려 두고 시트 전체와 비교)
+                existing = None
+                if logs_src is not None:
+                    get_sync_engine().sync_once()
+                    existing = sheet_logs()
+                result = legacy_import.run(get_local_store(), books_src, logs_src, names.get(l_who, l_who),
+                                           on_progress=lambda phase, n: status.caption(f"{labels[phase]} {n:,}행 처리"), existing=existing)
+            get_sync_engine().kick()
+            load_data.clear()
+            status.empty()
+            st.success(f"새 책 {result['books_new']}권 · 합친 책 {result['books_merged']}권 · 읽기 기록 {result['logs']:,}건"
+                       f" (책을 찾지 못한 기록 {result['logs_orphan']:,}건, 이미 있던 기록 {result.get('logs_skipped', 0):,}건) · 새 독자 {result['readers_new']}명 · 보충한 횟수 {result['counts_fixed']:,}회")
+    st.stop()
+
+if m == "📚 여러 권 한꺼번에":
+    st.caption("바코드 사진 여러 장이나 ISBN 목록(붙여넣기/CSV)을 한 번에 인식하고, 확인 후 한꺼번에 저장합니다.")
+    with st.form("bulk_form"):
+        b_files = st.file_uploader("바코드 사진 (여러 장)", type=['jpg', 'jpeg', 'png'], accept_multiple_files=True)
+        b_text = st.text_area("ISBN 목록 붙여넣기", height=100, placeholder="한 줄에 하나씩 (쉼표/공백 구분도 가능)")
+        b_csv = st.file_uploader("ISBN CSV 파일", type=['csv'])
+        b_go = st.form_submit_button("🔍 인식 & 검색")
+
+    if b_go:
+        codes = []
+        if b_files:
+            with st.spinner(f"바코드 {len(b_files)}장 인식 중..."):
+                codes += bulk_import.scan_images([f.getvalue() for f in b_files])
+        codes += bulk_import.parse_isbn_text(b_text)
+        if b_csv: codes += bulk_import.parse_isbn_csv(b_csv.getvalue())
+        with st.spinner(f"{len(codes)}건 책 정보 찾는 중..."):
+            st.session_state['bulk_review'] = bulk_import.build_review(codes, books_df['ISBN'].tolist())
+
+    review = st.session_state.get('bulk_review')
+    if review is not None:
+        if review.empty:
+            st.info("인식된 ISBN이 없습니다.")
+        else:
+            edited = st.data_editor(
+                review, key="bulk_editor", hide_index=True, use_container_width=True,
+                disabled=['ISBN', '비고'],
+                column_config={
+                    '등록': st.column_config.CheckboxColumn("등록", width="small"),
+                    '레벨': st.column_config.SelectboxColumn("레벨", options=[1, 2, 3, 4, 5], width="small"),
+                    '표지URL': st.column_config.TextColumn("표지 URL"),
+                }
+            )
+            picked = edited[edited['등록'] & (edited['제목'].astype(str).str.strip() != "")]
+            st.caption(f"전체 {len(edited)}건 중 {len(picked)}권 등록 예정 (제목이 빈 행은 제외)")
+            if st.button(f"📥 {len(picked)}권 한꺼번에 등록", disabled=picked.empty):
+                new_rows = pd.DataFrame([{
+                    'ID': str(uuid.uuid4()), '제목': r['제목'], 'ISBN': r['ISBN'], '레벨': int(r['레벨']),
+                    '표지URL': r['표지URL'], '음원URL': ""
+                } for _, r in picked.iterrows()])
+                insert_books(with_id_index(new_rows))
+                del st.session_state['bulk_review']
+                st.toast(f"{len(new_rows)}권 등록 완료")
+                st.rerun()
+    st.stop()
+
+img_f = None
+if m == "📸 바코드 촬영": img_f = st.camera_input("바코드", key="c_reg")
+elif m == "🖼️ 갤러리 업로드": img_f = st.file_uploader("바코드 사진", type=['jpg','png'])
+
+if img_f and not st.session_state['search_done']:
+    c = scan(img_f, "book")
+    if c:
+        st.toast("인식 성공")
+        if st.session_state['reg_isbn'] != c:
+            with st.spinner("책 찾는 중..."):
+                with perf_span("search_book_info"): t, i = search_book_info(c)
+                st.session_state.update({'reg_isbn': c, 'reg_title': t or "", 'reg_img': i or "", 'search_done': True})
+                st.rerun()
+
+if m == "✍️ 수동 입력":
+    man = st.text_input("ISBN 입력", value=st.session_state['reg_isbn'])
+    if man and man != st.session_state.get('last_m', ''):
+         with st.spinner("검색..."):
+            with perf_span("search_book_info"): t, i = search_book_info(man)
+            st.session_state.update({'reg_isbn': man, 'reg_title': t or "", 'reg_img': i or "", 'last_m': man})
+            st.rerun()
+
+st.divider()
+with st.form("nb_form"):
+    c1, c2 = st.columns(2)
+    with c1:
+        title = st.text_input("제목 *", value=st.session_state['reg_title'])
+        isbn = st.text_input("ISBN", value=st.session_state['reg_isbn'])
+        level = st.selectbox("레벨", [1,2,3,4,5])
+    with c2:
+        img_url = st.text_input("표지 URL", value=st.session_state['reg_img'])
+        aud_url = st.text_input("음원 URL", value=st.session_state['reg_audio'])
+
+    st.markdown("##### 초기 반응 (선택)")
+    first_stars = {}
+    for i in range(0, len(reader_rows), 2):
+        for (r, name, _), k in zip(reader_rows[i:i + 2], st.columns(2)):
+            first_stars[r] = k.selectbox(f"{name} 별점", STAR_OPTIONS)
+
+    if st.form_submit_button("등록하기"):
+        if not title: st.error("제목 필수")
+        else:
+            new_data = {
+                'ID': str(uuid.uuid4()), '제목': title, 'ISBN': isbn, '레벨': level, 
+                '표지URL': img_url, '음원URL': aud_url
+            }
+            insert_reads(new_data['ID'], {r: {'반응': v} for r, v in first_stars.items()})
+            insert_books(with_id_index(pd.DataFrame([new_data])))
+            for k in ['reg_title', 'reg_isbn', 'reg_img', 'reg_audio', 'search_done', 'last_m']:
+                if k in st.session_state: del st.session_state[k]
+            st.success("등록 완료")
+            st.rerun()
+
+st.markdown("###### 🎵 음원 QR 등록 (선택)")
+q_method = st.radio("QR 스캔", ["촬영", "갤러리"], horizontal=True, key="qr_m_reg")
+q_file = None
+if q_method == "촬영": q_file = st.camera_input("QR 촬영", key="qc_reg")
+else: q_file = st.file_uploader("QR 사진", key="qu_reg")
+if q_file:
+    c = scan(q_file, "qr")
+    if c: 
+        st.success("QR 인식됨")
+        if st.session_state['reg_audio'] != c:
+            st.session_state['reg_audio'] = c
+            st.rerun()
@@ -0,0 +1,173 @@
+import io
+from collections import deque
+
+import numpy as np
+from PIL import Image, ImageEnhance, ImageOps
+from pyzbar.pyzbar import decode, ZBarSymbol
+
+# =========================================================
+# 바코드/QR 인식: 작은 이미지부터 단계적으로 시도하고
+# 체크섬이 맞는 결과가 나오면 바로 끝냄
+# =========================================================
+BOOK_SYMBOLS = [ZBarSymbol.EAN13, ZBarSymbol.ISBN13, ZBarSymbol.ISBN10, ZBarSymbol.UPCA, ZBarSymbol.EAN8]
+QR_SYMBOLS = [ZBarSymbol.QRCODE]
+ALL_SYMBOLS = BOOK_SYMBOLS + [ZBarSymbol.UPCE, ZBarSymbol.CODE128, ZBarSymbol.QRCODE]
+
+SMALL_SIDE = 1000   # 1단계: 대부분 여기서 끝남
+MID_SIDE = 2000     # 2단계: 바코드 후보 영역을 잘라낼 해상도 (12MP 사진은 JPEG 1/2 축소 디코딩)
+TILE = 16           # 후보 영역 탐색 격자 크기 (px, MID 기준)
+
+
+def _ean_checksum_ok(code):
+    if not code.isdigit() or len(code) not in (8, 12, 13): return False
+    digits = [int(c) for c in code]
+    check = digits.pop()
+    total = sum(d * (3 if i % 2 == 0 else 1) for i, d in enumerate(reversed(digits)))
+    return (10 - total % 10) % 10 == check
+
+
+def _isbn10_ok(code):
+    if len(code) != 10 or not code[:9].isdigit() or not (code[9].isdigit() or code[9] in "Xx"): return False
+    total = sum((10 - i) * int(c) for i, c in enumerate(code[:9]))
+    total += 10 if code[9] in "Xx" else int(code[9])
+    return total % 11 == 0
+
+
+def _valid(obj):
+    try: text = obj.data.decode("utf-8").strip()
+    except UnicodeDecodeError: return None
+    if not text: return None
+    if obj.type in ("EAN13", "ISBN13", "UPCA", "EAN8"):
+        return text if _ean_checksum_ok(text) else None
+    if obj.type == "ISBN10":
+        return text if _isbn10_ok(text) else None
+    return text
+
+
+def _decode_valid(img, symbols):
+    found = [t for t in (_valid(o) for o in decode(img, symbols=symbols)) if t]
+    if not found: return None
+    # 책 뒷면에 여러 코드가 있으면 ISBN(978/979)을 우선
+    for t in found:
+        if len(t) == 13 and t[:3] in ("978", "979"): return t
+    return found[0]
+
+
+def _is_plain_ean(text):
+    return text.isdigit() and len(text) in (8, 12, 13) and text[:3] not in ("978", "979")
+
+
+def _fit(img, side):
+    if max(img.size) <= side: return img
+    out = img.copy()
+    out.thumbnail((side, side), Image.BILINEAR)
+    return out
+
+
+def _threshold(img):
+    a = np.asarray(img)
+    return img.point(lambda v, t=int(a.mean()): 255 if v > t else 0)
+
+
+def candidate_regions(gray, tile=TILE, max_regions=3):
+    """막대가 한 방향으로 촘촘한 영역(가로/세로 기울기 차이가 큰 곳)을 바코드 후보로 골라 박스 목록 반환"""
+    a = np.asarray(gray, dtype=np.int16)
+    if a.shape[0] < tile * 2 or a.shape[1] < tile * 2: return []
+    gx = np.abs(np.diff(a, axis=1))[:-1, :]
+    gy = np.abs(np.diff(a, axis=0))[:, :-1]
+    energy = np.abs(gx - gy).astype(np.float32)
+
+    th, tw = energy.shape[0] // tile, energy.shape[1] // tile
+    blocks = energy[:th * tile, :tw * tile].reshape(th, tile, tw, tile).mean(axis=(1, 3))
+    mask = blocks > blocks.mean() + 1.5 * blocks.std()
+    # 막대 사이 빈틈을 메우기 위해 한 칸씩 팽창
+    grown = mask.copy()
+    grown[1:, :] |= mask[:-1, :]; grown[:-1, :] |= mask[1:, :]
+    grown[:, 1:] |= mask[:, :-1]; grown[:, :-1] |= mask[:, 1:]
+
+    seen = np.zeros_like(grown)
+    regions = []
+    for y0, x0 in zip(*np.nonzero(grown)):
+        if seen[y0, x0]: continue
+        q = deque([(y0, x0)])
+        seen[y0, x0] = True
+        ys, xs, score = [], [], 0.0
+        while q:
+            y, x = q.popleft()
+            ys.append(y); xs.append(x); score += blocks[y, x]
+            for ny, nx in ((y + 1, x), (y - 1, x), (y, x + 1), (y, x - 1)):
+                if 0 <= ny < th and 0 <= nx < tw and grown[ny, nx] and not seen[ny, nx]:
+                    seen[ny, nx] = True
+                    q.append((ny, nx))
+        if len(ys) < 4: continue
+        # 여백(조용한 영역)까지 포함되도록 넉넉히 자름
+        pad_y = max(2, (max(ys) - min(ys)) // 4 + 1)
+        pad_x = max(2, (max(xs) - min(xs)) // 4 + 1)
+        box = (
+            max(0, (min(xs) - pad_x) * tile), max(0, (min(ys) - pad_y) * tile),
+            min(a.shape[1], (max(xs) + 1 + pad_x) * tile), min(a.shape[0], (max(ys) + 1 + pad_y) * tile),
+        )
+        regions.append((score, box))
+    regions.sort(reverse=True)
+    return [box for _, box in regions[:max_regions]]
+
+
+def _open_gray(image_file, min_side=None):
+    image = Image.open(image_file)
+    # 큰 JPEG은 처음부터 1/2, 1/4... 크기로 디코딩 (min_side 이상은 유지)
+    if min_side and image.format == "JPEG":
+        k = 1
+        while k < 8 and max(image.size) // (k * 2) >= min_side: k *= 2
+        if k > 1: image.draft('L', (image.width // k, image.height // k))
+    return ImageOps.exif_transpose(image).convert('L')
+
+
+def _variants(gray, load_full):
+    """(단계, 이미지)를 싼 것부터 차례로 만들어 냄 (앞에서 성공하면 뒤는 계산하지 않음)"""
+    # 1단계: 축소본
+    small = _fit(gray, SMALL_SIDE)
+    yield 1, small
+
+    # 2단계: 바코드 후보 영역 잘라내기 + 중간 해상도
+    mid = _fit(gray, MID_SIDE)
+    crops = [mid.crop(box) for box in candidate_regions(mid)]
+    for img in crops: yield 2, img
+    if mid is not small: yield 2, mid
+
+    # 3단계: 대비/이진화, 회전
+    for img in crops + [small]:
+        yield 3, ImageOps.autocontrast(img, cutoff=2)
+        yield 3, _threshold(img)
+    for img in crops + [small]:
+        for angle in (90, 15, -15, 30, -30):
+            yield 3, img.rotate(angle, resample=Image.BILINEAR, expand=True, fillcolor=255)
+
+    # 4단계: 대비 강화, 마지막으로 원본 해상도
+    yield 4, ImageEnhance.Contrast(mid).enhance(2.0)
+    full = load_full()
+    if max(full.size) > max(mid.size): yield 4, full
+
+
+def scan_code(image_file, symbols=None):
+    """사진에서 바코드/QR 내용을 읽음. symbols로 찾을 종류를 좁히면 더 빠름 (실패 시 None)"""
+    def load_full():
+        if hasattr(image_file, "seek"): image_file.seek(0)
+        return _open_gray(image_file)
+
+    fallback, last_stage = None, None
+    try:
+        gray = _open_gray(image_file, MID_SIDE)
+        for stage, img in _variants(gray, load_full):
+            if last_stage is not None and stage > last_stage: break
+            found = _decode_valid(img, symbols or ALL_SYMBOLS)
+            if found and not _is_plain_ean(found): return found
+            # ISBN이 아닌 상품 바코드는 오인식일 수 있으니 2단계까지는 ISBN을 더 찾아보고 없으면 그것을 사용
+            if found and fallback is None:
+                fallback, last_stage = found, max(stage, 2)
+    except Exception: pass
+    return fallback
+
+
+def scan_bytes(data, symbols=None):
+    # 프로세스 풀에서 쓰기 위한 버전 (파일 객체 대신 바이트를 받음)
+    return scan_code(io.BytesIO(data), symbols)
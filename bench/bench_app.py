@@ -0,0 +1,188 @@
+"""앱 전체 벤치마크: 가짜(로컬 SQLite) 시트에 책 100~50,000권 / 로그 최대 100만 건을 넣고
+Streamlit AppTest로 화면을 돌려 시나리오별 시간과 시트 API 호출 수를 잼 (결과는 JSON)
+
+    python bench/bench_app.py [--sizes 100 1000 10000 50000] [--logs-per-book 20] [--latency-ms 0] [--repeat 3] [--out result.json]
+"""
+import os
+import sys
+import glob
+import json
+import time
+import shutil
+import random
+import argparse
+import tempfile
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import storage_backend
+import reading_stats
+import sheet_schema
+from sheet_schema import STAR_OPTIONS, BOOK_COLS, READ_COLS, BOARD_COLS, LOG_COLS, STATS_COLS
+
+APP = os.path.join(ROOT, "book_management_app.py")
+PAGES = {name: f"app_pages/{name}.py" for name in ("dashboard", "library", "register", "board")}
+CACHE_DIR = os.path.join(ROOT, ".cache")
+MAX_LOGS = 1_000_000
+SORTS = ["최신 등록순", "첫째 많이 읽은 책", "둘째 많이 읽은 책", "레벨 높은 순"]
+
+
+def make_library(n_books, n_logs, seed=0):
+    """시트에 들어 있는 모양 그대로의 books / readers / reads / logs / board / stats 행 (표지 URL은 비워서 네트워크를 타지 않게)
+    reads는 책 x 기본 독자(첫째/둘째)마다 읽은 적이 있는 조합만"""
+    rnd = random.Random(seed)
+    books = [BOOK_COLS] + [[f"bk{i:06d}", f"Book {i} 책 {i % 97}", f"979{i:010d}", str(rnd.randint(1, 5)), "", ""] for i in range(n_books)]
+    reads = [READ_COLS]
+    for b in books[1:]:
+        for who, _ in sheet_schema.LEGACY_READERS:
+            n = rnd.randint(0, 30)
+            if n: reads.append([sheet_schema.read_id(b[0], who), b[0], who, str(n), rnd.choice(STAR_OPTIONS), "메모" if rnd.random() < 0.1 else ""])
+    start = pd.Timestamp("2022-01-01")
+    logs = [LOG_COLS]
+    for _ in range(n_logs):
+        b = books[1 + rnd.randrange(n_books)]
+        day = (start + pd.Timedelta(days=rnd.randrange(1000))).strftime("%Y-%m-%d")
+        logs.append([day, b[0], b[1], b[3], rnd.choice(["첫째", "둘째"])])
+    board = [BOARD_COLS] + [[f"post{i:04d}", "2025-01-01 10:00", f"글 {i}", "TRUE" if i < 3 else "FALSE", "FALSE", "FALSE"] for i in range(50)]
+    stats_df = reading_stats.build(sheet_schema.normalize_logs(logs))
+    stats = sheet_schema.records_to_raw(sheet_schema.to_records(stats_df, STATS_COLS), STATS_COLS)
+    return {"books": books, "readers": sheet_schema.default_readers_raw(), "reads": reads, "logs": logs, "board": board, "stats": stats}
+
+
+def timed(fn, repeat=1):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return round(statistics.median(times), 1)
+
+
+class Harness:
+    """앱이 만든 백엔드를 붙잡아 두고 시나리오마다 시트 API 호출 수 차이를 기록"""
+
+    def __init__(self, path, latency_ms):
+        self.path = path
+        self.latency_ms = latency_ms
+        self.backends = []
+        self.original = original = storage_backend.from_config
+
+        def capture(config, sheet_url):
+            backend = original(config, sheet_url)
+            self.backends.append(backend)
+            return backend
+        storage_backend.from_config = capture
+
+    def new_app(self):
+        # 프로세스를 새로 띄운 것처럼 Streamlit 캐시를 비움 (로컬 저장소 / 스냅샷 파일은 그대로)
+        st.cache_data.clear()
+        st.cache_resource.clear()
+        at = AppTest.from_file(APP, default_timeout=600)
+        at.secrets["storage"] = {"backend": "local", "path": self.path, "latency_ms": self.latency_ms}
+        return at
+
+    def calls(self):
+        # 재시작 시나리오에서는 백엔드가 새로 생기므로 지금까지 만든 것 전부를 더함 (백그라운드 동기화 호출도 포함)
+        return sum(v["calls"] for b in self.backends for v in b.api_stats().values())
+
+    def scenario(self, results, name, fn, repeat=1):
+        before = self.calls()
+        ms = timed(fn, repeat)
+        results[name] = {"ms": ms, "api_calls": self.calls() - before}
+
+    def cleanup(self):
+        # 이 크기에서 만든 로컬 저장소 / 스냅샷 파일 정리
+        storage_backend.from_config = self.original
+        key = storage_backend.LocalSheetBackend(self.path).key
+        for p in glob.glob(os.path.join(CACHE_DIR, f"library_{key}.sqlite3*")): os.remove(p)
+        shutil.rmtree(os.path.join(CACHE_DIR, "frames", key), ignore_errors=True)
+
+
+def widget(elements, label):
+    return next(w for w in elements if w.label == label)
+
+
+def check(at):
+    if at.exception: raise RuntimeError(at.exception[0].value)
+    return at
+
+
+def run_size(n_books, n_logs, latency_ms, repeat):
+    tmp = tempfile.mkdtemp(prefix="bench_app_")
+    path = os.path.join(tmp, "sheet.sqlite3")
+    t0 = time.perf_counter()
+    data = make_library(n_books, n_logs)
+    sheet = storage_backend.LocalSheetBackend(path).open()
+    for name, rows in data.items(): sheet.load_rows(name, rows)
+    seed_ms = round((time.perf_counter() - t0) * 1000, 1)
+
+    h = Harness(path, latency_ms)
+    res = {}
+    try:
+        at = h.new_app()
+        h.scenario(res, "cold_load", lambda: check(at.run()))
+        at = h.new_app()
+        h.scenario(res, "restart_load", lambda: check(at.run()))
+
+        check(at.switch_page(PAGES["library"]).run())
+        h.scenario(res, "dashboard", lambda: check(at.switch_page(PAGES["dashboard"]).run()) and check(at.switch_page(PAGES["library"]).run()), repeat)
+        res["dashboard"]["note"] = "대시보드로 갔다가 서재로 돌아오는 두 번의 rerun"
+        for i, opt in enumerate(SORTS):
+            h.scenario(res, f"library_sort_{i}", lambda opt=opt: check(widget(at.selectbox, "정렬 기준").set_value(opt).run()), repeat)
+            res[f"library_sort_{i}"]["sort"] = opt
+
+        plus = lambda: check(widget(at.button, "➕").click().run())
+        h.scenario(res, "plus_click", plus, repeat)
+        h.scenario(res, "sync_push", lambda: check(at.button(key="flush_now").click().run()))
+
+        check(at.switch_page(PAGES["board"]).run())
+
+        def post():
+            widget(at.text_area, "메모 작성").input(f"벤치마크 글 {time.time()}")
+            check(widget(at.button, "등록").click().run())
+        h.scenario(res, "board_post", post, repeat)
+
+        check(at.switch_page(PAGES["register"]).run())
+        check(at.radio[0].set_value("✍️ 수동 입력").run())
+
+        def register():
+            widget(at.text_input, "제목 *").input(f"Bench Book {time.time()}")
+            check(widget(at.button, "등록하기").click().run())
+        h.scenario(res, "register_book", register, repeat)
+    finally:
+        h.cleanup()
+        shutil.rmtree(tmp, ignore_errors=True)
+    return {"books": n_books, "logs": n_logs, "latency_ms": latency_ms, "seed_ms": seed_ms, "scenarios": res}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 50000])
+    ap.add_argument("--logs-per-book", type=int, default=20, help=f"책 한 권당 로그 수 (최대 {MAX_LOGS:,}건)")
+    ap.add_argument("--latency-ms", type=float, default=0, help="시트 호출마다 넣을 평균 지연")
+    ap.add_argument("--repeat", type=int, default=3, help="상호작용 시나리오 반복 횟수 (중앙값)")
+    ap.add_argument("--out", help="JSON을 파일로 저장 (없으면 표준 출력)")
+    args = ap.parse_args()
+
+    results = {
+        "when": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "streamlit": st.__version__,
+        "pandas": pd.__version__,
+        "runs": [run_size(n, min(n * args.logs_per_book, MAX_LOGS), args.latency_ms, args.repeat) for n in args.sizes],
+    }
+    text = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f: f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""시트 데이터 정리(load_data) 벤치마크: 행 수별 시간과 메모리 (기존 행 단위 방식과 비교)
+기존 방식은 예전 books 시트(독자마다 횟수_/반응_/메모_ 열)를, 지금 방식은 같은 데이터를 books + reads로 나눠서 정리
+
+    python bench/bench_load.py [--sizes 1000 10000 100000] [--repeat 3] [--json]
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+import sheet_schema
+from sheet_schema import STAR_OPTIONS, BOOK_COLS, BOARD_COLS, LOG_COLS, READ_FIELDS, LEGACY_READERS
+
+WIDE_BOOK_COLS = BOOK_COLS + [f"{f}_{name}" for f in READ_FIELDS for name, _ in LEGACY_READERS]
+
+
+def make_raw(n_books, seed=0):
+    """시트에서 받은 것과 같은 문자열 행 목록 (빈 ID/잘못된 값 일부 포함). logs는 책 수의 5배"""
+    rnd = random.Random(seed)
+    books = [WIDE_BOOK_COLS]
+    for i in range(n_books):
+        books.append([
+            "" if i % 500 == 0 else str(uuid.UUID(int=rnd.getrandbits(128))),
+            f"Book {i} 책 제목", f"978{rnd.randrange(10**9, 10**10)}", str(rnd.randint(1, 5)),
+            f"http://covers.example/{i}.jpg", "",
+            str(rnd.randint(0, 30)), "" if i % 7 == 0 else str(rnd.randint(0, 30)),
+            rnd.choice(STAR_OPTIONS), rnd.choice(STAR_OPTIONS + [""]),
+            "메모" if i % 3 == 0 else "", "",
+        ])
+    logs = [LOG_COLS]
+    for i in range(n_books * 5):
+        b = books[1 + rnd.randrange(n_books)]
+        logs.append([f"2025-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}", b[0], b[1], b[3], rnd.choice(["첫째", "둘째"])])
+    board = [BOARD_COLS] + [
+        [str(uuid.UUID(int=rnd.getrandbits(128))), "2025-01-01 10:00", f"글 {i}", rnd.choice(["TRUE", "FALSE"]), "FALSE", "FALSE"]
+        for i in range(max(10, n_books // 100))
+    ]
+    books_long, reads = sheet_schema.split_wide_books(books)
+    return {"wide": books, "books": books_long, "reads": reads, "logs": logs, "board": board}
+
+
+def legacy_normalize(raw):
+    # 벡터화 이전 load_data 방식: apply / iterrows, 모든 열이 문자열(object)
+    books_df = pd.DataFrame(raw["wide"][1:], columns=raw["wide"][0])
+    for col in ['반응_첫째', '반응_둘째']:
+        books_df[col] = books_df[col].apply(lambda x: x if x in STAR_OPTIONS else "선택 안 함")
+    for col in ['횟수_첫째', '횟수_둘째']:
+        books_df[col] = pd.to_numeric(books_df[col], errors='coerce').fillna(0)
+    for i, row in books_df.iterrows():
+        if not row['ID'] or str(row['ID']).strip() == "":
+            books_df.at[i, 'ID'] = str(uuid.uuid4())
+    books_df = books_df.drop_duplicates(subset=['ID'], keep='first')
+
+    logs_df = pd.DataFrame(raw["logs"][1:], columns=raw["logs"][0])
+    logs_df['날짜'] = pd.to_datetime(logs_df['날짜'], errors='coerce')
+
+    board_df = pd.DataFrame(raw["board"][1:], columns=raw["board"][0])
+    board_df['고정'] = board_df['고정'].apply(lambda x: True if str(x).upper() == 'TRUE' else False)
+    board_df['즐겨찾기'] = board_df['즐겨찾기'].apply(lambda x: True if str(x).upper() == 'TRUE' else False)
+    for i, row in board_df.iterrows():
+        if pd.isna(row['ID']) or str(row['ID']).strip() == "":
+            board_df.at[i, 'ID'] = str(uuid.uuid4())
+    return books_df, logs_df, board_df
+
+
+def typed_normalize(raw):
+    books_df, _, _ = sheet_schema.normalize_books(raw["books"])
+    logs_df = sheet_schema.normalize_logs(raw["logs"])
+    board_df, _, _ = sheet_schema.normalize_board(raw["board"])
+    reads_df, _, _ = sheet_schema.normalize_reads(raw["reads"])
+    return books_df, logs_df, board_df, reads_df
+
+
+def run(fn, raw, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        frames = fn(raw)
+        times.append((time.perf_counter() - t0) * 1000)
+    mem = [int(df.memory_usage(deep=True).sum()) for df in frames]
+    return {
+        "median_ms": round(statistics.median(times), 1),
+        "books_mb": round(mem[0] / 2**20, 2),
+        "logs_mb": round(mem[1] / 2**20, 2),
+        "board_mb": round(mem[2] / 2**20, 2),
+        "reads_mb": round(sum(mem[3:]) / 2**20, 2),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = ap.parse_args()
+
+    results = []
+    for n in args.sizes:
+        raw = make_raw(n)
+        results.append({
+            "books": n, "logs": n * 5,
+            "typed": run(typed_normalize, raw, args.repeat),
+            "legacy": run(legacy_normalize, raw, args.repeat),
+        })
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+    for r in results:
+        print(f"책 {r['books']:,}권 / 기록 {r['logs']:,}건")
+        for label in ("typed", "legacy"):
+            m = r[label]
+            print(f"  [{label:<6}] {m['median_ms']:>9}ms | books {m['books_mb']}MB | reads {m['reads_mb']}MB | logs {m['logs_mb']}MB | board {m['board_mb']}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""바코드 인식 벤치마크: 샘플 이미지별 인식률과 p50/p95 시간 (기존 방식과 비교)
+
+    python bench/bench_scan.py [--repeat 3] [--json]
+"""
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageEnhance
+from pyzbar.pyzbar import decode
+
+from barcode_scan import scan_code
+from perf_trace import percentile
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus", "barcodes")
+
+
+def legacy_scan_code(image_file):
+    # 단계적 인식 도입 전 방식: 원본 / 흑백 / 대비 강화 3장을 원본 크기로 시도, 검증 없음
+    try:
+        image = Image.open(image_file)
+        attempts = [image, image.convert('L'), ImageEnhance.Contrast(image.convert('L')).enhance(2.0)]
+        for img in attempts:
+            for obj in decode(img): return obj.data.decode("utf-8")
+    except Exception: pass
+    return None
+
+
+def run(fn, samples, repeat):
+    times, correct, wrong, per_file = [], 0, 0, []
+    for name, expected in samples:
+        path = os.path.join(CORPUS, name)
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            got = fn(path)
+            times.append((time.perf_counter() - t0) * 1000)
+        if (got or "") == expected: correct += 1
+        elif got: wrong += 1
+        per_file.append({"file": name, "expected": expected, "got": got, "ms": round(times[-1], 1)})
+    return {
+        "decode_rate": round(correct / len(samples), 3),
+        "wrong": wrong,
+        "p50_ms": round(percentile(times, 50), 1),
+        "p95_ms": round(percentile(times, 95), 1),
+        "files": per_file,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = ap.parse_args()
+
+    with open(os.path.join(CORPUS, "manifest.csv"), encoding="utf-8") as f:
+        samples = [(r["file"], r["expected"]) for r in csv.DictReader(f)]
+
+    results = {"staged": run(scan_code, samples, args.repeat), "legacy": run(legacy_scan_code, samples, args.repeat)}
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+    for label, r in results.items():
+        print(f"[{label}] 인식률 {r['decode_rate']:.0%} (오인식 {r['wrong']}) | p50 {r['p50_ms']}ms | p95 {r['p95_ms']}ms")
+        for fr in r["files"]:
+            mark = "OK " if (fr["got"] or "") == fr["expected"] else "-- "
+            print(f"  {mark}{fr['file']:<28} {fr['ms']:>8}ms  {fr['got']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""시작 벤치마크: 화면마다 새 프로세스에서 첫 화면을 그릴 때까지의 시간, 그동안 불러온 모듈의 import 시간,
+프로세스 메모리(RSS), 불러온 무거운 라이브러리를 잼 (결과는 JSON)
+    - cold: 로컬 저장소 / 스냅샷이 없는 처음 실행 (그 화면에 필요한 표만 시트에서 받음)
+    - warm: 로컬 저장소 / 스냅샷이 있는 재시작
+
+    python bench/bench_startup.py [--books 2000] [--logs-per-book 20] [--latency-ms 0] [--repeat 3] [--out result.json]
+"""
+import os
+import sys
+import glob
+import json
+import time
+import shutil
+import argparse
+import builtins
+import statistics
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+
+APP = os.path.join(os.path.dirname(ROOT), "book_management_app.py")
+CACHE_DIR = os.path.join(os.path.dirname(ROOT), ".cache")
+PAGES = ("dashboard", "library", "register", "board")
+HEAVY = ("plotly.express", "pyzbar", "PIL.Image", "requests", "gspread", "google.oauth2")
+
+
+def rss_mb():
+    # 지금 프로세스의 상주 메모리 (리눅스 /proc, 없으면 최대값으로 대신)
+    try:
+        with open("/proc/self/statm") as f:
+            return round(int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20, 1)
+    except OSError:
+        import resource
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+class ImportTimer:
+    """처음 불러오는 모듈의 import 시간 합계 (안에서 다시 부르는 import는 겹쳐 세지 않음)"""
+
+    def __init__(self):
+        self.depth = 0
+        self.seconds = 0.0
+        self.original = builtins.__import__
+
+    def __call__(self, name, *args, **kwargs):
+        outer = self.depth == 0 and name not in sys.modules
+        self.depth += 1
+        t0 = time.perf_counter()
+        try:
+            return self.original(name, *args, **kwargs)
+        finally:
+            self.depth -= 1
+            if outer: self.seconds += time.perf_counter() - t0
+
+
+def child(page, path, latency_ms):
+    """새 프로세스에서 한 화면을 처음 그림"""
+    from streamlit.testing.v1 import AppTest
+
+    base = rss_mb()  # Streamlit / pandas까지 불러온 상태
+    timer = ImportTimer()
+    builtins.__import__ = timer
+    at = AppTest.from_file(APP, default_timeout=600)
+    at.secrets["storage"] = {"backend": "local", "path": path, "latency_ms": latency_ms}
+    t0 = time.perf_counter()
+    at.switch_page(f"app_pages/{page}.py").run()
+    ms = (time.perf_counter() - t0) * 1000
+    builtins.__import__ = timer.original
+    if at.exception: raise RuntimeError(at.exception[0].value)
+    return {"first_paint_ms": round(ms, 1), "import_ms": round(timer.seconds * 1000, 1),
+            "rss_mb": rss_mb(), "rss_base_mb": base, "heavy": [m for m in HEAVY if m in sys.modules]}
+
+
+def clear_local(path):
+    import storage_backend
+    key = storage_backend.LocalSheetBackend(path).key
+    for p in glob.glob(os.path.join(CACHE_DIR, f"library_{key}.sqlite3*")): os.remove(p)
+    shutil.rmtree(os.path.join(CACHE_DIR, "frames", key), ignore_errors=True)
+
+
+def run_child(page, path, latency_ms):
+    out = subprocess.run([sys.executable, __file__, "--child", page, "--sheet", path, "--latency-ms", str(latency_ms)],
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def median_run(runs):
+    # 숫자는 중앙값, 무거운 라이브러리 목록은 첫 실행 것
+    out = dict(runs[0])
+    for k, v in out.items():
+        if isinstance(v, float): out[k] = round(statistics.median(r[k] for r in runs), 1)
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--books", type=int, default=2000)
+    ap.add_argument("--logs-per-book", type=int, default=20)
+    ap.add_argument("--latency-ms", type=float, default=0, help="시트 호출마다 넣을 평균 지연")
+    ap.add_argument("--repeat", type=int, default=3, help="화면마다 cold / warm 반복 횟수 (중앙값)")
+    ap.add_argument("--out", help="JSON을 파일로 저장 (없으면 표준 출력)")
+    ap.add_argument("--child", choices=PAGES, help=argparse.SUPPRESS)
+    ap.add_argument("--sheet", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        print(json.dumps(child(args.child, args.sheet, args.latency_ms)))
+        return
+
+    import storage_backend
+    from bench_app import make_library
+    tmp = tempfile.mkdtemp(prefix="bench_startup_")
+    path = os.path.join(tmp, "sheet.sqlite3")
+    sheet = storage_backend.LocalSheetBackend(path).open()
+    for name, rows in make_library(args.books, args.books * args.logs_per_book).items(): sheet.load_rows(name, rows)
+
+    runs = {}
+    try:
+        for page in PAGES:
+            cold, warm = [], []
+            for _ in range(args.repeat):
+                clear_local(path)
+                cold.append(run_child(page, path, args.latency_ms))
+                warm.append(run_child(page, path, args.latency_ms))
+            runs[page] = {"cold": median_run(cold), "warm": median_run(warm)}
+    finally:
+        clear_local(path)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    results = {
+        "when": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "books": args.books, "logs": args.books * args.logs_per_book, "latency_ms": args.latency_ms,
+        "pages": runs,
+    }
+    text = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f: f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""바코드 인식 벤치마크용 샘플 이미지 생성 (bench/corpus/barcodes/ 에 이미 포함되어 있음)
+
+    python bench/make_barcode_corpus.py
+
+QR 샘플은 qrcode 패키지가 있을 때만 만듭니다.
+"""
+import os
+import csv
+import random
+
+from PIL import Image, ImageDraw, ImageFilter
+
+OUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus", "barcodes")
+
+L_CODES = ["0001101", "0011001", "0010011", "0111101", "0100011", "0110001", "0101111", "0111011", "0110111", "0001011"]
+G_CODES = ["0100111", "0110011", "0011011", "0100001", "0011101", "0111001", "0000101", "0010001", "0001001", "0010111"]
+R_CODES = ["1110010", "1100110", "1101100", "1000010", "1011100", "1001110", "1010000", "1000100", "1001000", "1110100"]
+PARITY = ["LLLLLL", "LLGLGG", "LLGGLG", "LLGGGL", "LGLLGG", "LGGLLG", "LGGGLL", "LGLGLG", "LGLGGL", "LGGLGL"]
+
+
+def ean13(prefix12):
+    total = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(prefix12))
+    return prefix12 + str((10 - total % 10) % 10)
+
+
+def ean13_image(code, module=4, height=220, fg=0, bg=255):
+    first, left, right = int(code[0]), code[1:7], code[7:]
+    bits = "101"
+    bits += "".join((L_CODES if p == "L" else G_CODES)[int(d)] for p, d in zip(PARITY[first], left))
+    bits += "01010"
+    bits += "".join(R_CODES[int(d)] for d in right)
+    bits += "101"
+    quiet = 11 * module
+    img = Image.new("L", (len(bits) * module + 2 * quiet, height + 2 * module * 4), bg)
+    draw = ImageDraw.Draw(img)
+    for i, b in enumerate(bits):
+        if b == "1":
+            x = quiet + i * module
+            draw.rectangle([x, module * 4, x + module - 1, module * 4 + height], fill=fg)
+    return img
+
+
+def qr_image(text, box=8):
+    import qrcode
+    qr = qrcode.QRCode(border=4, box_size=box)
+    qr.add_data(text)
+    return qr.make_image(fill_color="black", back_color="white").get_image().convert("L")
+
+
+def photo(symbol, size=(4032, 3024), scale=1.0, angle=0, at=(0.5, 0.55), clutter=True, seed=0):
+    """휴대폰 사진처럼 큰 배경(그라데이션 + 글자 비슷한 잡동사니) 위에 코드를 올림"""
+    rnd = random.Random(seed)
+    w, h = size
+    bg = Image.linear_gradient("L").resize((w, h)).point(lambda v: 150 + v // 3)
+    draw = ImageDraw.Draw(bg)
+    if clutter:
+        for _ in range(40):
+            x, y = rnd.randrange(w), rnd.randrange(h)
+            draw.rectangle([x, y, x + rnd.randrange(80, 600), y + rnd.randrange(8, 30)], fill=rnd.randrange(40, 120))
+    sym = symbol.convert("L")
+    if scale != 1.0:
+        sym = sym.resize((int(sym.width * scale), int(sym.height * scale)), Image.BILINEAR)
+    # 하얀 라벨 위에 붙은 것처럼
+    label = Image.new("L", (sym.width + 40, sym.height + 40), 250)
+    label.paste(sym, (20, 20))
+    if angle:
+        mask = Image.new("L", label.size, 255).rotate(angle, expand=True)
+        label = label.rotate(angle, expand=True, fillcolor=0)
+    else:
+        mask = None
+    bg.paste(label, (int(w * at[0] - label.width / 2), int(h * at[1] - label.height / 2)), mask)
+    return bg.filter(ImageFilter.GaussianBlur(1.2))
+
+
+def main():
+    os.makedirs(OUT_DIR, exist_ok=True)
+    isbn_a = ean13("978152907493")
+    isbn_b = ean13("978030640615")
+    isbn_c = ean13("978893643359")
+    other = ean13("880123456789")
+
+    samples = [
+        ("ean13_clean.png", ean13_image(isbn_a), isbn_a),
+        ("ean13_low_contrast.png", ean13_image(isbn_b, fg=120, bg=190), isbn_b),
+        ("ean13_blur.png", ean13_image(isbn_c, module=3).filter(ImageFilter.GaussianBlur(1.6)), isbn_c),
+        ("photo_ean13_center.jpg", photo(ean13_image(isbn_a), seed=1), isbn_a),
+        ("photo_ean13_small.jpg", photo(ean13_image(isbn_b, module=2, height=120), at=(0.3, 0.7), seed=2), isbn_b),
+        ("photo_ean13_tilt20.jpg", photo(ean13_image(isbn_c), angle=20, seed=3), isbn_c),
+        ("photo_ean13_vertical.jpg", photo(ean13_image(isbn_a), angle=90, at=(0.7, 0.5), seed=4), isbn_a),
+    ]
+    # 일반 상품 바코드와 ISBN이 함께 있으면 ISBN을 골라야 함
+    both = photo(ean13_image(other), at=(0.3, 0.3), seed=5)
+    both.paste(ean13_image(isbn_b), (2400, 1800))
+    samples.append(("photo_two_codes.jpg", both, isbn_b))
+    samples.append(("photo_no_code.jpg", photo(Image.new("L", (400, 200), 250), seed=6), ""))
+
+    try:
+        url = "https://example.com/audio/dear-zoo.mp3"
+        samples += [
+            ("qr_clean.png", qr_image(url), url),
+            ("photo_qr_small.jpg", photo(qr_image(url, box=6), at=(0.6, 0.4), seed=7), url),
+        ]
+    except ImportError:
+        print("qrcode 패키지가 없어 QR 샘플은 건너뜀")
+
+    with open(os.path.join(OUT_DIR, "manifest.csv"), "w", newline="", encoding="utf-8") as f:
+        wr = csv.writer(f)
+        wr.writerow(["file", "expected"])
+        for name, img, expected in samples:
+            path = os.path.join(OUT_DIR, name)
+            if name.endswith(".jpg"): img.save(path, quality=80, optimize=True)
+            else: img.save(path, optimize=True)
+            wr.writerow([name, expected])
+    print(f"{len(samples)}개 샘플 -> {OUT_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# =========================================================
+# ISBN -> (제목, 표지URL) 조회 + 디스크 캐시
+# =========================================================
+GOOGLE_BOOKS_URL = "https://www.googleapis.com/books/v1/volumes"
+OPEN_LIBRARY_URL = "https://openlibrary.org/api/books"
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "isbn_meta.sqlite3")
+HIT_TTL = 30 * 24 * 3600    # 찾은 결과: 30일
+MISS_TTL = 24 * 3600        # "없음" 결과: 하루 뒤 다시 확인
+MAX_ENTRIES = 5000
+TIMEOUT = (3.05, 5)         # (연결, 응답) 초
+
+
+def normalize_isbn(isbn):
+    """하이픈/공백 제거 후 ISBN-10은 ISBN-13으로 변환 (ISBN이 아니면 정리된 문자열 그대로)"""
+    clean = re.sub(r"[^0-9Xx]", "", str(isbn or "")).upper()
+    if len(clean) == 10 and clean[:9].isdigit():
+        body = "978" + clean[:9]
+        check = (10 - sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(body)) % 10) % 10
+        return body + str(check)
+    return clean
+
+
+class MetadataCache:
+    """SQLite 기반 TTL + LRU 캐시. 값이 None이면 "찾을 수 없음"을 기억한 것"""
+
+    def __init__(self, path=CACHE_PATH, max_entries=MAX_ENTRIES, hit_ttl=HIT_TTL, miss_ttl=MISS_TTL):
+        if path != ":memory:": os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.max_entries = max_entries
+        self.hit_ttl = hit_ttl
+        self.miss_ttl = miss_ttl
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS meta ("
+            " isbn TEXT PRIMARY KEY, value TEXT, expires_at REAL, accessed_at REAL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS meta_accessed ON meta(accessed_at)")
+        self.db.commit()
+
+    def get(self, isbn):
+        """(있음 여부, 값) - 만료된 항목은 없는 것으로 취급"""
+        now = time.time()
+        with self.lock:
+            row = self.db.execute("SELECT value, expires_at FROM meta WHERE isbn = ?", (isbn,)).fetchone()
+            if row is None or row[1] < now: return False, None
+            self.db.execute("UPDATE meta SET accessed_at = ? WHERE isbn = ?", (now, isbn))
+            self.db.commit()
+        return True, json.loads(row[0])
+
+    def put(self, isbn, value):
+        now = time.time()
+        ttl = self.hit_ttl if value is not None else self.miss_ttl
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO meta (isbn, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (isbn, json.dumps(value, ensure_ascii=False), now + ttl, now)
+            )
+            # 최대 개수를 넘으면 가장 오래 안 쓴 항목부터 정리
+            (n,) = self.db.execute("SELECT COUNT(*) FROM meta").fetchone()
+            if n > self.max_entries:
+                self.db.execute(
+                    "DELETE FROM meta WHERE isbn IN (SELECT isbn FROM meta ORDER BY accessed_at LIMIT ?)",
+                    (n - self.max_entries,)
+                )
+            self.db.commit()
+
+
+def _session(pool_size=4):
+    # requests는 실제로 조회할 때만 불러옴 (normalize_isbn만 쓰는 서재 검색 등은 필요 없음)
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    s = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+
+class BookLookup:
+    """두 제공처(Google Books, Open Library)에 동시에 묻고 먼저 온 정상 응답을 사용"""
+
+    def __init__(self, cache=None, google_url=GOOGLE_BOOKS_URL, openlib_url=OPEN_LIBRARY_URL, timeout=TIMEOUT):
+        self.cache = cache if cache is not None else MetadataCache()
+        self.google_url = google_url
+        self.openlib_url = openlib_url
+        self.timeout = timeout
+        self.session = _session()
+        self.pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="book-lookup")
+
+    def _google(self, isbn):
+        r = self.session.get(self.google_url, params={"q": f"isbn:{isbn}"}, timeout=self.timeout)
+        r.raise_for_status()
+        data = r.json()
+        if "items" not in data: return None
+        info = data["items"][0]["volumeInfo"]
+        return {"title": info.get("title", ""), "cover": info.get("imageLinks", {}).get("thumbnail", "")}
+
+    def _openlib(self, isbn):
+        r = self.session.get(
+            self.openlib_url,
+            params={"bibkeys": f"ISBN:{isbn}", "jscmd": "data", "format": "json"},
+            timeout=self.timeout
+        )
+        r.raise_for_status()
+        data = r.json()
+        if f"ISBN:{isbn}" not in data: return None
+        bk = data[f"ISBN:{isbn}"]
+        cv = bk.get("cover", {})
+        return {"title": bk.get("title", ""), "cover": cv.get("medium") or cv.get("large") or cv.get("small", "")}
+
+    def lookup(self, isbn):
+        """반환: (제목, 표지URL) 또는 (None, None)"""
+        key = normalize_isbn(isbn)
+        if not key: return None, None
+
+        found, value = self.cache.get(key)
+        if not found:
+            value, failed = None, False
+            futures = [self.pool.submit(self._google, key), self.pool.submit(self._openlib, key)]
+            for f in as_completed(futures):
+                try: result = f.result()
+                except Exception:
+                    failed = True
+                    continue
+                if result and result.get("title"):
+                    value = result
+                    break
+            # 네트워크 오류가 섞인 "없음"은 기억하지 않음 (다음에 다시 시도)
+            if value is not None or not failed: self.cache.put(key, value)
+
+        if value is None: return None, None
+        return value["title"], value["cover"]
+
+
+_default_lookup = None
+_default_lock = threading.Lock()
+
+
+def search_book_info(isbn):
+    global _default_lookup
+    if not isbn: return None, None
+    with _default_lock:
+        if _default_lookup is None: _default_lookup = BookLookup()
+    return _default_lookup.lookup(isbn)
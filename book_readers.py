@@ -0,0 +1,49 @@
+import pandas as pd
+
+from sheet_schema import STAR_OPTIONS, read_id
+
+# =========================================================
+# 독자(readers)와 책 x 독자 기록(reads)
+#   - readers_df: 독자 한 명당 한 행 (ID / 이름 / 아이콘), 시트에 적힌 순서 = 화면 순서
+#   - reads_df: (책ID, 독자ID) 한 쌍당 한 행 (횟수 / 반응 / 메모). 인덱스는 "책ID|독자ID"라서 한 칸은 바로 찾고,
+#     독자별 합계 / 별점은 독자ID(범주형)로 묶어서 계산
+# 읽은 적도 별점/메모도 없는 조합은 행이 없으므로 (횟수 0, 반응 "선택 안 함", 메모 "")로 봄
+# =========================================================
+EMPTY = {'횟수': 0, '반응': STAR_OPTIONS[0], '메모': ""}
+
+
+def reader_rows(readers_df):
+    """[(독자ID, 이름, 아이콘)] (화면 순서)"""
+    return list(zip(readers_df['ID'], readers_df['이름'], readers_df['아이콘']))
+
+
+def cell(reads_df, book_id, reader_id, col):
+    rid = read_id(book_id, reader_id)
+    return reads_df.at[rid, col] if rid in reads_df.index else EMPTY[col]
+
+
+def per_book(reads_df, reader_id, col, index):
+    """한 독자의 col 값을 index(책ID) 순서로 (기록이 없는 책은 기본값)"""
+    sub = reads_df[reads_df['독자ID'] == reader_id]
+    s = pd.Series(sub[col].to_numpy(), index=sub['책ID'].to_numpy())
+    return s.reindex(index, fill_value=EMPTY[col])
+
+
+def totals(reads_df):
+    """독자ID -> 읽은 횟수 합계"""
+    return reads_df.groupby('독자ID', observed=True)['횟수'].sum().astype(int)
+
+
+def star_counts(reads_df, reader_id):
+    """한 독자가 준 별점 -> 권수 (별점이 없는 책은 빼고)"""
+    stars = reads_df.loc[reads_df['독자ID'] == reader_id, '반응']
+    counts = stars[stars != STAR_OPTIONS[0]].astype(str).value_counts()
+    return counts.rename_axis('별점').reset_index(name='권수')
+
+
+def memo_text(reads_df, index):
+    """책마다 모든 독자의 메모를 이어 붙인 문자열 (index 순서, 검색 색인용)"""
+    sub = reads_df[reads_df['메모'] != ""]
+    if sub.empty: return pd.Series("", index=index, dtype=object)
+    joined = sub.groupby('책ID', sort=False)['메모'].agg(" ".join)
+    return joined.reindex(index, fill_value="")
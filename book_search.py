@@ -0,0 +1,196 @@
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+from sheet_schema import STAR_OPTIONS
+from book_lookup import normalize_isbn
+import book_readers
+
+# =========================================================
+# 서재 검색: 처음 검색할 때 한 번 만들어 두는 메모리 색인
+#   - 제목 / 메모(모든 독자): 글자 1~2개 조각(n-gram) 색인으로 후보를 좁히고, 세 글자 이상이면 실제 부분 문자열로 확인
+#     (대소문자·전각/반각·띄어쓰기를 무시하므로 "해리포터"로 "해리 포터"도, "potter"로 "Harry Potter"도 찾음)
+#   - ISBN: 정리된 ISBN-13으로 정확히 일치
+# 데이터 버전이 바뀌면 바뀐 행만 따로 표시해 두고 (검색할 때 직접 확인), 많이 바뀌거나 삭제되면 새로 만듦
+# =========================================================
+TEXT_COLS = ['제목', 'ISBN', '메모']   # 메모: 책마다 모든 독자의 메모를 이어 붙인 것
+REBUILD_RATIO = 0.2    # 바뀐 행이 이 비율을 넘으면 새로 만듦
+CHUNK = 4096           # 조각을 만들 때 한 번에 처리하는 행 수 (길이가 비슷한 행끼리)
+STRING_DTYPE = "string[pyarrow]"
+
+
+def normalize(s):
+    """검색용 정리 (Series 단위): NFKC + 대소문자 무시 + 공백 제거"""
+    return s.astype(str).str.normalize("NFKC").str.casefold().str.replace(r"\s+", "", regex=True)
+
+
+def _term_keys(term):
+    # 조각 번호: 한 글자는 코드 포인트, 두 글자는 (앞 << 21 | 뒤) (코드 포인트는 21비트 안)
+    cs = [ord(c) for c in term]
+    if len(cs) == 1: return cs
+    return list({a << 21 | b for a, b in zip(cs, cs[1:])})
+
+
+def _postings(texts):
+    """texts의 조각 번호 -> 행 위치 목록. 반환: (정렬된 조각 번호, 시작 위치(+끝), 행 위치)"""
+    order = np.argsort([len(t) for t in texts], kind="stable")
+    keys, rows = [], []
+    for start in range(0, len(order), CHUNK):
+        idx = order[start:start + CHUNK]
+        arr = np.array([texts[i] for i in idx])
+        if arr.dtype.itemsize == 0: continue
+        # 길이를 맞춘 유니코드 배열을 코드 포인트 행렬로 (짧은 행 끝은 0)
+        c = arr.view(np.uint32).reshape(len(idx), -1).astype(np.uint64)
+        uni = c != 0
+        bi = uni[:, :-1] & uni[:, 1:]
+        r = np.broadcast_to(idx[:, None], c.shape)
+        keys += [c[uni], ((c[:, :-1] << 21) | c[:, 1:])[bi]]
+        rows += [r[uni], r[:, :-1][bi]]
+    if not keys: return np.array([], dtype=np.uint64), np.zeros(1, dtype=np.int64), np.array([], dtype=np.int32)
+    keys, rows = np.concatenate(keys), np.concatenate(rows)
+    o = np.lexsort((rows, keys))
+    keys, rows = keys[o], rows[o]
+    # 한 행 안에서 같은 조각이 여러 번 나오면 하나만
+    keep = np.ones(len(keys), dtype=bool)
+    keep[1:] = (keys[1:] != keys[:-1]) | (rows[1:] != rows[:-1])
+    keys, rows = keys[keep], rows[keep]
+    uniq, starts = np.unique(keys, return_index=True)
+    return uniq, np.append(starts, len(keys)), rows.astype(np.int32)
+
+
+class NgramIndex:
+    """texts: 정리된 문자열 목록 (행 위치 = 목록 위치)"""
+
+    def __init__(self, texts):
+        self.texts = list(texts)
+        self.n_base = len(self.texts)
+        self.col = pd.Series(self.texts, dtype=STRING_DTYPE)
+        self.keys, self.offsets, self.rows = _postings(self.texts)
+        self.dirty = set()   # 색인을 만든 뒤 값이 바뀐 행 (검색할 때 직접 확인)
+
+    def set(self, pos, text):
+        if pos == len(self.texts): self.texts.append(text)
+        else: self.texts[pos] = text
+        if pos < self.n_base: self.dirty.add(pos)
+
+    def stale(self):
+        return len(self.dirty) + len(self.texts) - self.n_base
+
+    def _posting(self, key):
+        i = np.searchsorted(self.keys, key)
+        if i == len(self.keys) or self.keys[i] != key: return None
+        return self.rows[self.offsets[i]:self.offsets[i + 1]]
+
+    def search(self, term):
+        """term(정리된 문자열)이 들어 있는 행 (길이 len(texts)인 bool 배열)"""
+        base = None
+        for key in _term_keys(term):
+            p = self._posting(key)
+            if p is None:
+                base = np.zeros(self.n_base, dtype=bool)
+                break
+            m = np.zeros(self.n_base, dtype=bool)
+            m[p] = True
+            base = m if base is None else base & m
+        # 두 글자까지는 조각이 곧 답, 세 글자 이상은 조각이 모두 있어도 순서가 다를 수 있으므로 확인
+        if len(term) > 2:
+            cand = np.flatnonzero(base)
+            if len(cand): base[cand] = self.col.iloc[cand].str.contains(term, regex=False).to_numpy(dtype=bool)
+        out = np.zeros(len(self.texts), dtype=bool)
+        out[:self.n_base] = base
+        for pos in [*self.dirty, *range(self.n_base, len(self.texts))]:
+            out[pos] = term in self.texts[pos]
+        return out
+
+
+class BookIndex:
+    """books_df(ID 인덱스)의 제목 / ISBN / 메모 색인. 여러 세션이 함께 쓰므로 잠금 안에서 갱신/검색"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.ids = np.array([], dtype=object)
+        self.raw = None
+
+    def refresh(self, version, df, reads_df):
+        """데이터 버전이 바뀌었을 때만 df(+ reads_df의 메모)와 비교해 바뀐 행을 반영. 반환: 다시 색인한 행 수"""
+        if version == self.version: return 0
+        with self.lock:
+            n = self._update(df, reads_df)
+            self.version = version
+        return n
+
+    def _update(self, df, reads_df):
+        ids = df.index.to_numpy(dtype=object)
+        raw = {c: df[c].astype(str).to_numpy(dtype=object) for c in ['제목', 'ISBN']}
+        raw['메모'] = book_readers.memo_text(reads_df, df.index).to_numpy(dtype=object)
+        old = len(self.ids)
+        if self.raw is None or len(ids) < old or not np.array_equal(ids[:old], self.ids):
+            return self._build(ids, raw)
+        changed = np.zeros(len(ids), dtype=bool)
+        changed[old:] = True
+        for c in TEXT_COLS: changed[:old] |= raw[c][:old] != self.raw[c]
+        pos = np.flatnonzero(changed)
+        if self.title.stale() + len(pos) > REBUILD_RATIO * max(len(ids), 1): return self._build(ids, raw)
+        self.ids, self.raw = ids, raw
+        if not len(pos): return 0
+        sub = pd.DataFrame({c: raw[c][pos] for c in TEXT_COLS})
+        titles, memos = normalize(sub['제목']), normalize(sub['메모'])
+        self.isbn = np.concatenate([self.isbn, np.empty(len(ids) - old, dtype=object)])
+        for i, p in enumerate(pos.tolist()):
+            self.title.set(p, titles.iat[i])
+            self.memo.set(p, memos.iat[i])
+            self.isbn[p] = normalize_isbn(raw['ISBN'][p])
+        return len(pos)
+
+    def _build(self, ids, raw):
+        self.ids, self.raw = ids, raw
+        self.title = NgramIndex(normalize(pd.Series(raw['제목'])).tolist())
+        self.memo = NgramIndex(normalize(pd.Series(raw['메모'])).tolist())
+        # normalize_isbn과 같은 정리를 열 단위로 (ISBN-10만 한 건씩 변환)
+        isbn = pd.Series(raw['ISBN']).str.replace(r"[^0-9Xx]", "", regex=True).str.upper()
+        ten = isbn.str.len() == 10
+        if ten.any(): isbn[ten] = isbn[ten].map(normalize_isbn)
+        self.isbn = isbn.to_numpy(dtype=object)
+        return len(ids)
+
+    def search(self, query):
+        """ISBN 모양이면 ISBN 정확히 일치, 아니면 띄어 쓴 단어마다 제목이나 메모에 들어 있는 책 (모든 단어).
+        반환: 색인 행 순서의 bool 배열"""
+        with self.lock:
+            if re.fullmatch(r"\d{9}[\dXx]|\d{13}", re.sub(r"[\s-]", "", query)):
+                return self.isbn == normalize_isbn(query)
+            result = np.ones(len(self.ids), dtype=bool)
+            for term in normalize(pd.Series(query.split(), dtype=object)):
+                if term: result &= self.title.search(term) | self.memo.search(term)
+            return result
+
+    def mask(self, df, query):
+        """df 행 순서에 맞춘 검색 결과 (True = 찾은 책)"""
+        found = self.search(query)
+        ids = self.ids
+        if len(ids) == len(df) and (not len(ids) or (ids[0] == df.index[0] and ids[-1] == df.index[-1])):
+            return found
+        # 색인이 다른 버전의 df로 만들어진 경우 (다른 세션이 막 갱신한 직후 등): ID로 맞춤
+        return df.index.isin(ids[found])
+
+
+def filter_mask(df, reads_df, reader_ids, levels=(), reader=None, stars=(), never_read=False):
+    """레벨 / 별점 / 안 읽은 책 조건. reader가 없으면 reader_ids 전체 기준
+    (별점은 한 명이라도 그 별점이면, 안 읽은 책은 모두 0회면). 별점/횟수는 reads 행만 보고 계산"""
+    readers = [reader] if reader else list(reader_ids)
+    m = np.ones(len(df), dtype=bool)
+    if levels: m &= df['레벨'].isin(levels).to_numpy()
+    if not (stars or never_read): return m
+    sub = reads_df[reads_df['독자ID'].isin(readers)]
+    if stars:
+        hit = df.index.isin(sub.loc[sub['반응'].isin(stars), '책ID'])
+        # "선택 안 함": reads 행이 없는 독자도 별점이 없는 것
+        if STAR_OPTIONS[0] in stars:
+            rated = sub.loc[sub['반응'] != STAR_OPTIONS[0], '책ID'].value_counts()
+            hit |= rated.reindex(df.index, fill_value=0).to_numpy() < len(readers)
+        m &= hit
+    if never_read: m &= ~df.index.isin(sub.loc[sub['횟수'] > 0, '책ID'])
+    return m
@@ -0,0 +1,86 @@
+import io
+import re
+import csv
+import multiprocessing
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+
+from book_lookup import search_book_info, normalize_isbn
+
+# =========================================================
+# 일괄 등록: 바코드 사진 여러 장 / ISBN 목록 -> 검토용 표
+# =========================================================
+REVIEW_COLS = ['등록', 'ISBN', '제목', '레벨', '표지URL', '비고']
+
+
+def parse_isbn_text(text):
+    """붙여넣은 글에서 ISBN 후보만 골라냄 (줄바꿈/쉼표/공백 구분, 하이픈 허용)"""
+    out = []
+    for token in re.split(r"[\s,;]+", text or ""):
+        isbn = normalize_isbn(token)
+        if len(isbn) == 13 and isbn.isdigit(): out.append(isbn)
+    return out
+
+
+def parse_isbn_csv(data):
+    """CSV에서 'ISBN' 열(없으면 첫 열)을 읽음"""
+    rows = list(csv.reader(io.StringIO(data.decode("utf-8-sig", errors="replace"))))
+    if not rows: return []
+    header = [h.strip().upper() for h in rows[0]]
+    if "ISBN" in header:
+        col = header.index("ISBN")
+        rows = rows[1:]
+    else:
+        col = 0
+    return parse_isbn_text("\n".join(r[col] for r in rows if len(r) > col))
+
+
+def scan_images(blobs, max_workers=4):
+    """이미지 바이트 목록 -> 인식된 코드 목록 (실패는 None). 디코딩은 프로세스 풀에서"""
+    if not blobs: return []
+    # 바코드 인식(pyzbar / PIL)은 사진을 받았을 때만 불러옴
+    from barcode_scan import scan_bytes, BOOK_SYMBOLS
+    try:
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(blobs)), mp_context=ctx) as pool:
+            return list(pool.map(partial(scan_bytes, symbols=BOOK_SYMBOLS), blobs))
+    except Exception:
+        # 프로세스를 띄울 수 없는 환경이면 순서대로 처리
+        return [scan_bytes(b, BOOK_SYMBOLS) for b in blobs]
+
+
+def resolve_many(isbns, max_workers=8):
+    """ISBN 목록 -> {ISBN: (제목, 표지URL)} (동시에 조회)"""
+    if not isbns: return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(isbns))) as pool:
+        return dict(zip(isbns, pool.map(search_book_info, isbns)))
+
+
+def build_review(codes, existing_isbns):
+    """인식/입력된 코드 -> 검토용 DataFrame (보유 중이거나 중복이면 기본 해제)"""
+    existing = {normalize_isbn(x) for x in existing_isbns if str(x).strip()}
+    rows, seen, todo = [], set(), []
+    for code in codes:
+        if code is None:
+            rows.append({'ISBN': "", '비고': "인식 실패"})
+            continue
+        isbn = normalize_isbn(code)
+        if isbn in existing: note = "이미 보유"
+        elif isbn in seen: note = "목록 내 중복"
+        else:
+            note = ""
+            todo.append(isbn)
+        seen.add(isbn)
+        rows.append({'ISBN': isbn, '비고': note})
+
+    meta = resolve_many(todo)
+    for r in rows:
+        title, cover = meta.get(r['ISBN'], (None, None)) if not r['비고'] else (None, None)
+        r['제목'] = title or ""
+        r['표지URL'] = cover or ""
+        r['레벨'] = 1
+        if not r['비고'] and not title: r['비고'] = "정보 없음 (제목 입력 필요)"
+        r['등록'] = not r['비고'] or r['비고'].startswith("정보 없음")
+    return pd.DataFrame(rows, columns=REVIEW_COLS)
@@ -0,0 +1,29 @@
+import threading
+
+# =========================================================
+# 시트 API 호출 집계 (실제 구글 시트 클라이언트 / 로컬 SQLite 백엔드가 함께 씀)
+# gspread에 기대지 않으므로 로컬 백엔드만 쓸 때는 구글 라이브러리를 불러오지 않음
+# =========================================================
+
+
+class CallStats:
+    """작업별 호출 수 / 재시도 / 한도 대기 시간 / 합쳐진 읽기 / 실패 / 주고받은 바이트"""
+
+    FIELDS = ("calls", "retries", "waited_s", "coalesced", "errors", "bytes")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.ops = {}
+
+    def add(self, op, field, n=1):
+        with self.lock:
+            row = self.ops.setdefault(op, dict.fromkeys(self.FIELDS, 0))
+            row[field] += n
+
+    def snapshot(self):
+        with self.lock:
+            return {op: dict(row) for op, row in self.ops.items()}
+
+    def total(self, field="calls"):
+        with self.lock:
+            return sum(row[field] for row in self.ops.values())
@@ -0,0 +1,109 @@
+import os
+import time
+import hashlib
+import threading
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from PIL import Image, ImageDraw, features
+
+# =========================================================
+# 표지 썸네일 저장소: 한 번 받아서 작게 줄여 디스크에 두고 재사용
+# =========================================================
+COVER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "covers")
+THUMB_WIDTH = 180                 # 화면 표시 90px x 2 (고해상도 화면 대비)
+MAX_BYTES = 50 * 1024 * 1024      # 저장소 최대 크기 (넘으면 오래 안 쓴 것부터 삭제)
+TIMEOUT = (3.05, 10)
+FAIL_TTL = 600.0                  # 초: 받지 못한 URL은 이만큼 다시 요청하지 않음 (죽은 / 느린 주소를 화면마다 다시 보내지 않도록)
+EXT = "webp" if features.check("webp") else "jpg"
+
+
+class CoverStore:
+    def __init__(self, root=COVER_DIR, max_bytes=MAX_BYTES, width=THUMB_WIDTH, fail_ttl=FAIL_TTL, clock=time.monotonic):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.width = width
+        self.fail_ttl = fail_ttl
+        self.clock = clock
+        os.makedirs(root, exist_ok=True)
+        self.lock = threading.Lock()
+        self.inflight = set()
+        self.failed = {}   # 받지 못한 URL -> 실패한 시각
+        self.session = requests.Session()
+        self.pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cover-fetch")
+        self.total = sum(e.stat().st_size for e in os.scandir(root) if e.is_file())
+
+    def path_for(self, url):
+        return os.path.join(self.root, hashlib.sha1(url.encode("utf-8")).hexdigest()[:20] + "." + EXT)
+
+    def placeholder(self):
+        path = os.path.join(self.root, "_no_image." + EXT)
+        if not os.path.exists(path):
+            img = Image.new("RGB", (self.width, int(self.width * 1.4)), (235, 235, 235))
+            ImageDraw.Draw(img).text((self.width // 2 - 24, int(self.width * 0.65)), "No Image", fill=(150, 150, 150))
+            self._save(img, path)
+        return path
+
+    def get(self, url):
+        """저장된 썸네일 경로를 돌려줌. 없으면 백그라운드로 받아 두고 원래 URL을 돌려줌"""
+        if not url or not str(url).startswith("http"): return self.placeholder()
+        path = self.path_for(url)
+        if os.path.exists(path):
+            try: os.utime(path)  # 최근 사용 시각 (삭제 순서 기준)
+            except OSError: pass
+            return path
+        self.prefetch([url])
+        return url
+
+    def prefetch(self, urls):
+        for url in urls:
+            if not url or not str(url).startswith("http"): continue
+            path = self.path_for(url)
+            with self.lock:
+                if url in self.inflight or self._failed_recently(url) or os.path.exists(path): continue
+                self.inflight.add(url)
+            self.pool.submit(self._fetch, url, path)
+
+    def _fetch(self, url, path):
+        try:
+            r = self.session.get(url, timeout=TIMEOUT)
+            r.raise_for_status()
+            img = Image.open(BytesIO(r.content)).convert("RGB")
+            if img.width > self.width:
+                img = img.resize((self.width, max(1, round(img.height * self.width / img.width))), Image.LANCZOS)
+            self._save(img, path)
+        except Exception:
+            # fail_ttl초 뒤 다음 요청 때 다시 시도
+            with self.lock: self.failed[url] = self.clock()
+        finally:
+            with self.lock: self.inflight.discard(url)
+
+    def _failed_recently(self, url):
+        # self.lock 안에서 부름
+        at = self.failed.get(url)
+        if at is None: return False
+        if self.clock() - at < self.fail_ttl: return True
+        del self.failed[url]
+        return False
+
+    def _save(self, img, path):
+        tmp = path + ".tmp"
+        img.save(tmp, format="WEBP" if EXT == "webp" else "JPEG", quality=75)
+        os.replace(tmp, path)
+        with self.lock:
+            self.total += os.path.getsize(path)
+            if self.total > self.max_bytes: self._evict()
+
+    def _evict(self):
+        entries = sorted((e for e in os.scandir(self.root) if e.is_file()), key=lambda e: e.stat().st_mtime)
+        total = sum(e.stat().st_size for e in entries)
+        for e in entries:
+            if total <= self.max_bytes * 0.9: break
+            if e.name.startswith("_"): continue
+            try:
+                size = e.stat().st_size
+                os.remove(e.path)
+                total -= size
+            except OSError: pass
+        self.total = total
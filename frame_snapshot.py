@@ -0,0 +1,61 @@
+import os
+import json
+
+import pandas as pd
+
+from sheet_schema import with_id_index
+
+# =========================================================
+# 정리가 끝난 DataFrame(books/stats/reads 등)을 표마다 Parquet로 저장해 두고
+# 그 표의 데이터 버전이 저장할 때와 같으면 다시 정리하지 않고 바로 읽음 (재시작 포함)
+# 버전은 표마다 따로: 한 표에 쓰면 그 표의 스냅샷만 다시 만듦
+# =========================================================
+SNAP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "frames")
+
+
+class FrameSnapshot:
+    def __init__(self, root=SNAP_DIR):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.meta_path = os.path.join(root, "meta.json")
+
+    def _path(self, name):
+        return os.path.join(self.root, name + ".parquet")
+
+    def _meta(self):
+        try:
+            with open(self.meta_path, encoding="utf-8") as f:
+                frames = json.load(f).get("frames")
+            return frames if isinstance(frames, dict) else {}  # 예전 형식 (모든 표를 한 버전으로)은 버림
+        except Exception:
+            return {}
+
+    def _write_meta(self, frames):
+        tmp = self.meta_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"frames": frames}, f)
+        os.replace(tmp, self.meta_path)
+
+    def load(self, versions):
+        """versions: {이름: 지금 버전}. 그 버전으로 저장된 것만 {이름: DataFrame} (화면마다 필요한 표만 읽음)"""
+        out = {}
+        for name, saved in self._meta().items():
+            if name not in versions or saved != versions[name]: continue
+            try: out[name] = with_id_index(pd.read_parquet(self._path(name)))
+            except Exception: pass  # 없거나 깨진 스냅샷은 무시
+        return out
+
+    def save(self, versions, frames):
+        """frames: {이름: DataFrame}을 versions[이름]으로 저장
+        바꿀 표를 meta.json에서 먼저 빼고 DataFrame을 쓴 다음 다시 넣어서, 쓰다 멈춰도 어긋난 것을 읽지 않게 함"""
+        try:
+            meta = {n: v for n, v in self._meta().items() if n not in frames}
+            self._write_meta(meta)
+            for name, df in frames.items():
+                tmp = self._path(name) + ".tmp"
+                df.reset_index(drop=True).to_parquet(tmp, index=False)
+                os.replace(tmp, self._path(name))
+                meta[name] = versions[name]
+            self._write_meta(meta)
+        except Exception:
+            pass  # 저장 실패는 다음 로드 때 다시 정리하면 됨
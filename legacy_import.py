@@ -0,0 +1,284 @@
+import io
+import hashlib
+import argparse
+from collections import Counter
+from functools import partial
+
+import pandas as pd
+
+import sheet_schema
+from sheet_schema import BOOK_COLS, LOG_COLS, READ_FIELDS, STAR_OPTIONS, read_id
+from book_lookup import normalize_isbn
+
+# =========================================================
+# 예전 CSV -> 지금 구성 (books / readers / reads / logs)
+#   - books_data.csv: ID, 제목, ISBN, 레벨, 읽은횟수, 상태, 표지URL
+#     (내보낸 예전 books 시트처럼 횟수_첫째 / 반응_첫째 / 메모_첫째 같은 독자별 열이 있어도 읽음, 상태는 버림)
+#   - reading_log.csv: 날짜, 책ID, 제목, 레벨 (+ 누가). 누가가 없으면 기본 독자의 기록으로
+# 파일은 CHUNK_ROWS행씩 읽고 (메모리는 책 수만큼만 씀), 배치마다 로컬 저장소에 한 번의 트랜잭션으로 쓰면서
+# 같은 트랜잭션에 진행 위치를 남김 -> 중간에 멈춰도 다시 실행하면 이어서 (같은 로그를 두 번 세지 않음)
+# 순서: 1) 책 - ID나 ISBN이 같은 책은 새로 만들지 않고 기존 책으로 합침
+#       2) 로그 - 로그 대기열에 붙이고, (책, 독자)별 횟수를 로그 수만큼 더함
+#          이미 있는 기록(시트 + 아직 올리지 않은 로그)과 (날짜, 책ID, 누가)가 같은 기록은 그 수만큼 건너뜀
+#          (같은 기록이 든 다른 파일이나 몇 줄 고친 파일을 다시 가져와도 두 번 세지 않음)
+#       3) 예전 횟수 - 읽은횟수 / 횟수_* 가 로그로 센 것보다 크면 그만큼 채움, 빈 별점/메모는 예전 값으로
+# 시트에는 평소처럼 동기화가 올림 (로그는 local_store.PUSH_LOGS_MAX건씩)
+# =========================================================
+CHUNK_ROWS = 20000
+STATE_KEY = "import:"   # 로컬 저장소 meta 키 접두어 (+ 두 파일 내용의 지문)
+PHASES = ("books", "logs", "counts")
+
+
+def _read(src):
+    """경로 / bytes -> read_csv에 넣을 수 있는 것 (bytes는 읽을 때마다 처음부터)"""
+    return io.BytesIO(src) if isinstance(src, (bytes, bytearray)) else src
+
+
+def fingerprint(*sources):
+    h = hashlib.sha1()
+    for src in sources:
+        if src is None:
+            h.update(b"-")
+            continue
+        f = _read(src)
+        fh = open(f, "rb") if isinstance(f, str) else f
+        try:
+            for block in iter(lambda: fh.read(1 << 20), b""): h.update(block)
+        finally:
+            if isinstance(f, str): fh.close()
+        h.update(b"|")
+    return h.hexdigest()[:16]
+
+
+def chunks(src, skip=0, rows=CHUNK_ROWS):
+    """CSV를 rows행씩 (모든 값은 문자열, 앞의 skip행은 건너뜀). 반환: (이번 묶음, 이번 묶음까지 읽은 행 수)"""
+    done = 0
+    for chunk in pd.read_csv(_read(src), dtype=str, keep_default_na=False, chunksize=rows, encoding="utf-8-sig"):
+        chunk.columns = [str(c).strip() for c in chunk.columns]
+        done += len(chunk)
+        if done <= skip: continue
+        yield chunk.iloc[max(0, skip - (done - len(chunk))):], done
+
+
+def _col(df, name):
+    return df[name].astype(str).str.strip() if name in df.columns else pd.Series("", index=df.index, dtype=object)
+
+
+def _log_keys(df):
+    """로그 -> (날짜 YYYY-MM-DD, 책ID, 누가) 목록 (날짜로 읽히지 않는 값은 그대로)"""
+    d = sheet_schema.parse_dates(df['날짜'])
+    dates = d.dt.strftime("%Y-%m-%d").where(d.notna(), df['날짜'].astype(str).str.strip()).fillna("")
+    return list(zip(dates.tolist(), df['책ID'].astype(str).tolist(), df['누가'].astype(str).tolist()))
+
+
+def _reader_ids(store):
+    raw = store.read_raw("readers", ['ID'])
+    return [r[0] for r in raw[1:]]
+
+
+def _add_reader(store, reader_id):
+    icon = dict(sheet_schema.LEGACY_READERS).get(reader_id, sheet_schema.DEFAULT_ICON)
+    store.compare_and_set("readers", {reader_id: (None, {'ID': reader_id, '이름': reader_id, '아이콘': icon})})
+
+
+def _write_reads(store, updates):
+    """updates: {(책ID, 독자ID): fn(지금 행 또는 None) -> 바꿀 값 {열: 값} / None(그대로)}. 트랜잭션 안에서 부름"""
+    changes = {}
+    for (book_id, reader_id), fn in updates.items():
+        rid = read_id(book_id, reader_id)
+        ver, cur = store.get_row("reads", rid)
+        values = fn(cur)
+        if not values: continue
+        if cur is None:
+            base = {'ID': rid, '책ID': book_id, '독자ID': reader_id, '횟수': "0", '반응': STAR_OPTIONS[0], '메모': ""}
+            values = dict(base, **values)
+        changes[rid] = (ver, values)
+    # 저장소 잠금을 쥐고 있으므로 충돌하지 않음 (충돌하면 이 배치를 통째로 취소)
+    if store.compare_and_set("reads", changes): raise RuntimeError("가져오는 중 다른 곳에서 독자 기록이 바뀌었습니다")
+
+
+def _legacy_values(count, star, memo, cur):
+    """예전 독자별 값 -> 지금 행에 채울 값 (횟수는 더 클 때만, 별점/메모는 비어 있을 때만)"""
+    cur = cur or {}
+    out = {}
+    n = pd.to_numeric(count, errors='coerce')
+    if not pd.isna(n) and int(n) > _count(cur): out['횟수'] = str(int(n))
+    if star in STAR_OPTIONS[1:] and cur.get('반응', STAR_OPTIONS[0]) == STAR_OPTIONS[0]: out['반응'] = star
+    if memo and not cur.get('메모'): out['메모'] = memo
+    return out
+
+
+def _count(row):
+    n = pd.to_numeric((row or {}).get('횟수', "0"), errors='coerce')
+    return 0 if pd.isna(n) else int(n)
+
+
+class LegacyImport:
+    """store: LocalStore. books_src / logs_src: CSV 경로 또는 bytes (없으면 그 단계는 건너뜀)
+    default_reader: 누가가 없는 로그와 읽은횟수를 누구 것으로 볼지. on_progress(단계, 읽은 행 수)
+    existing: 시트에 이미 있는 로그 (LOG_COLS 열의 DataFrame, logs + 보관 시트). 아직 올리지 않은 로그는 저장소에서 읽음"""
+
+    def __init__(self, store, books_src=None, logs_src=None, default_reader=None, on_progress=None, existing=None):
+        self.store = store
+        self.books_src = books_src
+        self.logs_src = logs_src
+        self.existing = existing
+        self.default_reader = default_reader or sheet_schema.LEGACY_READERS[0][0]
+        self.on_progress = on_progress or (lambda phase, n: None)
+        self.key = STATE_KEY + fingerprint(books_src, logs_src)
+        self.state = store.get_meta(self.key) or {
+            "phase": PHASES[0], "rows": 0, "id_map": {},
+            "books_new": 0, "books_merged": 0, "logs": 0, "logs_orphan": 0, "logs_skipped": 0, "readers_new": 0, "counts_fixed": 0,
+        }
+
+    def _checkpoint(self, **kw):
+        # 배치를 쓴 트랜잭션 안에서 부름 (쓰기와 진행 위치가 함께 남음)
+        self.state.update(kw)
+        self.store.set_meta(self.key, self.state)
+
+    def _books(self):
+        """지금 저장소의 (ID 집합, 정리된 ISBN -> ID)"""
+        raw = self.store.read_raw("books", ['ID', 'ISBN'])
+        ids = {r[0] for r in raw[1:]}
+        by_isbn = {}
+        for rid, isbn in raw[1:]:
+            key = normalize_isbn(isbn)
+            if key: by_isbn.setdefault(key, rid)
+        return ids, by_isbn
+
+    def run(self):
+        """반환: 진행 상태 (새 책 / 합친 책 / 로그 / 책을 찾지 못한 로그 / 이미 있던 로그 / 새 독자 / 보정한 횟수)"""
+        if self.state["phase"] == "done": return self.state
+        steps = {"books": self._import_books, "logs": self._import_logs, "counts": self._fix_counts}
+        for phase in PHASES[PHASES.index(self.state["phase"]):]:
+            src = self.logs_src if phase == "logs" else self.books_src
+            if src is not None: steps[phase](src)
+            nxt = PHASES[PHASES.index(phase) + 1] if phase != PHASES[-1] else "done"
+            with self.store.transaction(): self._checkpoint(phase=nxt, rows=0)
+        return self.state
+
+    # --- 1) 책 ---
+    def _import_books(self, src):
+        ids, by_isbn = self._books()
+        id_map = self.state["id_map"]
+        for chunk, done in chunks(src, self.state["rows"]):
+            df = sheet_schema.normalize_books([list(chunk.columns)] + chunk.values.tolist())[0]
+            # 빈 ID는 normalize_books가 새로 채움. 같은 파일 안의 중복도 앞의 것으로 합침
+            new = {}
+            records = sheet_schema.to_records(df, BOOK_COLS)
+            for rid, isbn in zip(df['ID'].tolist(), df['ISBN'].tolist()):
+                if rid in ids: continue
+                key = normalize_isbn(isbn)
+                if key and key in by_isbn:
+                    id_map[rid] = by_isbn[key]
+                    continue
+                ids.add(rid)
+                if key: by_isbn[key] = rid
+                new[rid] = (None, records[rid])
+            with self.store.transaction():
+                if new: self.store.compare_and_set("books", new)
+                n_merged = len(df) - len(new)
+                self._checkpoint(rows=done, id_map=id_map, books_new=self.state["books_new"] + len(new),
+                                 books_merged=self.state["books_merged"] + n_merged)
+            self.on_progress("books", done)
+
+    def _target(self, rid, isbn, ids, by_isbn):
+        """예전 파일의 책 -> 저장소의 책ID (없으면 None)"""
+        rid = self.state["id_map"].get(rid, rid)
+        if rid in ids: return rid
+        return by_isbn.get(normalize_isbn(isbn)) if isbn else None
+
+    # --- 2) 로그 ---
+    def _existing_keys(self):
+        """이미 있는 로그의 (날짜, 책ID, 누가)별 수 (시트 + 아직 올리지 않은 로그, 이어서 할 때는 앞에서 가져온 것도 들어 있음)"""
+        have = Counter(_log_keys(self.existing)) if self.existing is not None and len(self.existing) else Counter()
+        _, queued = self.store.unpushed_logs()
+        if queued: have.update(_log_keys(pd.DataFrame(queued, columns=LOG_COLS)))
+        return have
+
+    def _import_logs(self, src):
+        ids, _ = self._books()
+        readers = set(_reader_ids(self.store))
+        id_map = self.state["id_map"]
+        # 같은 날 같은 책을 여러 번 읽은 기록도 있으므로 수로 비교: 이 파일에서 앞에서부터 센 수(seen)가
+        # 이미 있는 수(have)를 넘는 기록만 더함 (이어서 할 때도 파일 처음부터 세어야 하므로 앞 묶음은 세기만 함)
+        have, seen = self._existing_keys(), Counter()
+        for chunk, done in chunks(src):
+            logs = pd.DataFrame({c: _col(chunk, c) for c in LOG_COLS})
+            logs.loc[logs['누가'] == "", '누가'] = self.default_reader
+            if id_map: logs['책ID'] = logs['책ID'].map(lambda b: id_map.get(b, b))
+            keys = _log_keys(logs)
+            old = min(len(logs), max(0, self.state["rows"] - (done - len(logs))))
+            seen.update(keys[:old])
+            if old == len(logs): continue
+            take = []
+            for key in keys[old:]:
+                seen[key] += 1
+                take.append(seen[key] > have[key])
+                if take[-1]: have[key] += 1
+            skipped = take.count(False)
+            logs = logs.iloc[old:][take]
+            known = logs['책ID'].isin(ids).to_numpy()
+            counts = logs[known].groupby(['책ID', '누가'], sort=False).size()
+            new_readers = set(logs['누가'].unique()) - readers
+            with self.store.transaction():
+                for r in sorted(new_readers): _add_reader(self.store, r)
+                _write_reads(self.store, {key: (lambda cur, n=int(n): {'횟수': str(_count(cur) + n)}) for key, n in counts.items()})
+                if len(logs): self.store.add_logs(logs[LOG_COLS].values.tolist())
+                self._checkpoint(rows=done, logs=self.state["logs"] + len(logs),
+                                 logs_orphan=self.state["logs_orphan"] + int((~known).sum()),
+                                 logs_skipped=self.state.get("logs_skipped", 0) + skipped,
+                                 readers_new=self.state["readers_new"] + len(new_readers))
+            readers |= new_readers
+            self.on_progress("logs", done)
+
+    # --- 3) 예전 횟수 / 별점 / 메모 ---
+    def _fix_counts(self, src):
+        ids, by_isbn = self._books()
+        readers = _reader_ids(self.store)
+        for chunk, done in chunks(src, self.state["rows"]):
+            targets = [self._target(r, i, ids, by_isbn) for r, i in zip(_col(chunk, 'ID'), _col(chunk, 'ISBN'))]
+            totals = pd.to_numeric(_col(chunk, '읽은횟수'), errors='coerce').fillna(0).astype(int).tolist()
+            # 예전 books 시트의 독자별 열 (횟수_첫째 등)
+            wide = sorted({c.split("_", 1)[1] for c in chunk.columns if "_" in c and c.split("_", 1)[0] in READ_FIELDS})
+            cols = {(f, r): _col(chunk, f"{f}_{r}").tolist() for r in wide for f in READ_FIELDS}
+            fixed = 0
+            with self.store.transaction():
+                for r in wide:
+                    if r not in readers:
+                        _add_reader(self.store, r)
+                        readers.append(r)
+                for i, book_id in enumerate(targets):
+                    if book_id is None: continue
+                    _write_reads(self.store, {(book_id, r): partial(_legacy_values, cols[('횟수', r)][i], cols[('반응', r)][i], cols[('메모', r)][i]) for r in wide})
+                    # 읽은횟수: 책 전체 횟수가 모자라면 모자란 만큼 기본 독자에게
+                    extra = totals[i] - sum(_count(self.store.get_row("reads", read_id(book_id, r))[1]) for r in readers)
+                    if extra > 0:
+                        fixed += extra
+                        _write_reads(self.store, {(book_id, self.default_reader): lambda cur: {'횟수': str(_count(cur) + extra)}})
+                self._checkpoint(rows=done, counts_fixed=self.state["counts_fixed"] + fixed)
+            self.on_progress("counts", done)
+
+
+def run(store, books_src=None, logs_src=None, default_reader=None, on_progress=None, existing=None):
+    return LegacyImport(store, books_src, logs_src, default_reader, on_progress, existing).run()
+
+
+def main():
+    # 앱을 끈 상태에서 로컬 저장소 파일에 바로 가져오기 (다음 실행 때 동기화가 시트에 올림)
+    from local_store import LocalStore
+    ap = argparse.ArgumentParser(description="예전 books_data.csv / reading_log.csv 가져오기")
+    ap.add_argument("--books", help="책 목록 CSV")
+    ap.add_argument("--logs", help="읽기 기록 CSV")
+    ap.add_argument("--store", required=True, help="로컬 저장소 파일 (.cache/library_*.sqlite3)")
+    ap.add_argument("--reader", help="누가가 없는 기록의 독자 (기본: 첫째)")
+    ap.add_argument("--existing", help="시트에 이미 있는 기록 CSV (logs 시트를 내려받은 것, 같은 기록은 건너뜀)")
+    args = ap.parse_args()
+    existing = pd.read_csv(args.existing, dtype=str, keep_default_na=False, encoding="utf-8-sig") if args.existing else None
+    state = run(LocalStore(args.store), args.books, args.logs, args.reader,
+                lambda phase, n: print(f"{phase}: {n:,}행", flush=True), existing)
+    print(state | {"id_map": len(state["id_map"])})
+
+
+if __name__ == "__main__":
+    main()
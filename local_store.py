@@ -0,0 +1,507 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# =========================================================
+# 로컬 저장소 (SQLite WAL) + 시트와의 백그라운드 동기화
+# 화면은 로컬에서 읽고 쓰며, 바뀐 칸은 변경 기록(journal)에 남겨 두었다가
+# 동기화 때 시트에 반영. 양쪽에서 같은 칸을 고치면 나중에 고친 쪽이 이김 (행/칸 단위)
+# 행마다 버전 번호가 있어서, 화면에서 본 버전과 지금 버전이 같을 때만 쓰는 비교 후 쓰기(compare-and-set)가 가능
+# =========================================================
+STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "library.sqlite3")
+SYNC_INTERVAL = 15.0   # 초: 변경이 없어도 이 간격으로 시트의 새 내용을 가져옴
+SYNC_DELAY = 2.0       # 초: 변경 직후 이만큼 모았다가 한 번에 올림
+MAX_BACKOFF = 300.0    # 초: 연결 실패 시 재시도 간격 상한
+ROW_DELETED = ""       # journal의 col이 빈 문자열이면 행 삭제
+CAS_RETRIES = 5        # 비교 후 쓰기에서 충돌한 행을 다시 시도하는 횟수
+PUSH_LOGS_MAX = 10000  # 한 번의 동기화에서 시트에 붙이는 로그 수 상한 (나머지는 바로 이어서 다음 동기화로)
+FULL_PULL_EVERY = 600.0  # 초: 시트 수정 표시가 그대로여도 이 간격이 지나면 한 번은 전체를 다시 받음
+SQL_VARS = 500         # IN (...)에 한 번에 넣는 값 수
+
+
+class LocalStore:
+    """표(books/board/stats) 행은 {열: 값(문자열)} JSON으로 저장. rows=현재 로컬 상태, base=마지막으로 맞춘 시트 상태"""
+
+    def __init__(self, path=STORE_PATH):
+        if path != ":memory:": os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.lock = threading.RLock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(
+            "CREATE TABLE IF NOT EXISTS rows (tbl TEXT, id TEXT, pos INTEGER, data TEXT, ver INTEGER DEFAULT 0, PRIMARY KEY (tbl, id));"
+            "CREATE TABLE IF NOT EXISTS base (tbl TEXT, id TEXT, pos INTEGER, data TEXT, PRIMARY KEY (tbl, id));"
+            "CREATE TABLE IF NOT EXISTS journal (seq INTEGER PRIMARY KEY AUTOINCREMENT, tbl TEXT, id TEXT, col TEXT, value TEXT, ts REAL);"
+            "CREATE TABLE IF NOT EXISTS logs (seq INTEGER PRIMARY KEY AUTOINCREMENT, data TEXT, ts REAL);"
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);"
+        )
+        # 행 버전이 생기기 전에 만든 파일
+        if "ver" not in [c[1] for c in self.db.execute("PRAGMA table_info(rows)")]:
+            self.db.execute("ALTER TABLE rows ADD COLUMN ver INTEGER DEFAULT 0")
+        self.db.commit()
+        self.mem = {}   # 표 이름 -> {ID: 행} (rows의 메모리 사본, 순서 = pos)
+        self.vers = {}  # 표 이름 -> {ID: 행 버전} (로컬에서 바뀌거나 동기화로 내용이 바뀔 때마다 +1)
+        self.depth = 0  # transaction() 중첩 깊이 (가장 바깥에서만 커밋)
+        # 이 저장소 파일을 구분하는 값 (파일을 지우고 다시 만들면 버전 번호가 처음부터 다시 시작하므로 스냅샷 기준에 함께 씀)
+        self.uid = self.get_meta("uid")
+        if self.uid is None:
+            self.uid = uuid.uuid4().hex[:12]
+            self.set_meta("uid", self.uid)
+
+    @contextmanager
+    def _tx(self):
+        self.depth += 1
+        try:
+            yield
+        except BaseException:
+            if self.depth == 1:
+                self.db.rollback()
+                self.mem, self.vers = {}, {}  # 메모리 사본도 버리고 파일에서 다시 읽음
+            raise
+        else:
+            if self.depth == 1: self.db.commit()
+        finally:
+            self.depth -= 1
+
+    @contextmanager
+    def transaction(self):
+        """여러 쓰기(표 / 로그 / meta)를 한 번에 반영하거나 모두 취소 (가져오기의 배치 + 진행 기록 등)"""
+        with self.lock, self._tx(): yield
+
+    # --- 읽기 ---
+    def _rows(self, tbl):
+        if tbl not in self.mem:
+            cur = self.db.execute("SELECT id, data, ver FROM rows WHERE tbl = ? ORDER BY pos", (tbl,)).fetchall()
+            self.mem[tbl] = {rid: json.loads(data) for rid, data, _ in cur}
+            self.vers[tbl] = {rid: ver or 0 for rid, _, ver in cur}
+        return self.mem[tbl]
+
+    def read_raw(self, tbl, cols):
+        """시트 원본과 같은 모양 ([머리글] + 행 목록)으로 돌려줌 -> sheet_schema.normalize_*에 그대로 넣을 수 있음"""
+        with self.lock:
+            rows = self._rows(tbl)
+            return [list(cols)] + [[r.get(c, "") for c in cols] for r in rows.values()]
+
+    def read_versioned(self, tbl, cols):
+        """read_raw와 같은 시점의 행 버전도 함께. 반환: (원본 모양, {ID: 버전})"""
+        with self.lock:
+            raw = self.read_raw(tbl, cols)
+            return raw, dict(self.vers[tbl])
+
+    def select(self, tbl, cols, keep, start=0, stop=None, reverse=False):
+        """keep(행)이 참인 행 중 [start:stop]만 (게시판 한 페이지 등: 표 전체를 옮기지 않음). reverse면 뒤에서부터
+        반환: (원본 모양, {ID: 버전}, keep이 참인 전체 행 수)"""
+        with self.lock:
+            rows, vers = self._rows(tbl), self.vers[tbl]
+            ids = [rid for rid, r in rows.items() if keep(r)]
+            if reverse: ids.reverse()
+            part = ids[start:stop]
+            return [list(cols)] + [[rows[rid].get(c, "") for c in cols] for rid in part], {rid: vers[rid] for rid in part}, len(ids)
+
+    def get_row(self, tbl, rid):
+        """반환: (버전, 행 사본) (없으면 (None, None))"""
+        with self.lock:
+            row = self._rows(tbl).get(rid)
+            return (None, None) if row is None else (self.vers[tbl][rid], dict(row))
+
+    def base(self, tbl, ids=None):
+        """지난번에 시트와 맞춘 행 {ID: 행}. ids를 주면 그 행만 (로컬에서 바뀐 행만 올릴 때)"""
+        with self.lock:
+            if ids is None:
+                cur = self.db.execute("SELECT id, data FROM base WHERE tbl = ? ORDER BY pos", (tbl,)).fetchall()
+            else:
+                ids, cur = list(ids), []
+                for i in range(0, len(ids), SQL_VARS):
+                    part = ids[i:i + SQL_VARS]
+                    cur += self.db.execute(f"SELECT id, data FROM base WHERE tbl = ? AND id IN ({','.join('?' * len(part))}) ORDER BY pos",
+                                           (tbl, *part)).fetchall()
+            return {rid: json.loads(data) for rid, data in cur}
+
+    def get_meta(self, key, default=None):
+        with self.lock:
+            row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_meta(self, key, value):
+        with self.lock, self._tx():
+            self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value, ensure_ascii=False)))
+
+    def version(self, tbl):
+        """tbl(표 이름 또는 "logs")의 로컬 데이터가 바뀔 때마다 1씩 늘어나는 번호 (화면용 스냅샷의 기준, 표마다 따로)"""
+        with self.lock:
+            row = self.db.execute("SELECT value FROM meta WHERE key = ?", ("version:" + tbl,)).fetchone()
+        return int(row[0]) if row else 0
+
+    def _bump_version(self, tbl):
+        self.db.execute(
+            "INSERT INTO meta (key, value) VALUES (?, '1') "
+            "ON CONFLICT(key) DO UPDATE SET value = CAST(CAST(value AS INTEGER) + 1 AS TEXT)", ("version:" + tbl,)
+        )
+
+    # --- 로컬 쓰기 (변경 기록에 남김) ---
+    def _apply_local(self, tbl, upserts, deleted, journal):
+        rows, vers = self._rows(tbl), self.vers[tbl]
+        (pos,) = self.db.execute("SELECT COALESCE(MAX(pos), 0) FROM rows WHERE tbl = ?", (tbl,)).fetchone()
+        with self._tx():
+            for rid, r in upserts:
+                ver = vers.get(rid, 0) + 1
+                if rid in rows:
+                    self.db.execute("UPDATE rows SET data = ?, ver = ? WHERE tbl = ? AND id = ?", (json.dumps(r, ensure_ascii=False), ver, tbl, rid))
+                else:
+                    pos += 1
+                    self.db.execute("INSERT INTO rows VALUES (?, ?, ?, ?, ?)", (tbl, rid, pos, json.dumps(r, ensure_ascii=False), ver))
+                rows[rid] = r
+                vers[rid] = ver
+            for rid in deleted:
+                self.db.execute("DELETE FROM rows WHERE tbl = ? AND id = ?", (tbl, rid))
+                rows.pop(rid, None)
+                vers.pop(rid, None)
+            self.db.executemany("INSERT INTO journal (tbl, id, col, value, ts) VALUES (?, ?, ?, ?, ?)", journal)
+            self._bump_version(tbl)
+
+    def compare_and_set(self, tbl, changes, ts=None):
+        """changes: {ID: (기대 버전, {열: 값} 또는 None=삭제)}. 기대 버전이 None이면 새 행 (이미 있으면 충돌)
+        지금 버전이 기대 버전과 같은 행만 한 번에 반영. 반환: 충돌한 행 {ID: (지금 버전, 지금 행)}"""
+        ts = ts or time.time()
+        with self.lock:
+            rows, vers = self._rows(tbl), self.vers[tbl]
+            journal, upserts, deleted, conflicts = [], [], [], {}
+            for rid, (expected, values) in changes.items():
+                if vers.get(rid) != expected:
+                    conflicts[rid] = (vers.get(rid), dict(rows[rid]) if rid in rows else None)
+                elif values is None:
+                    if rid in rows:
+                        deleted.append(rid)
+                        journal.append((tbl, rid, ROW_DELETED, None, ts))
+                else:
+                    values = {c: "" if v is None else str(v) for c, v in values.items()}
+                    old = rows.get(rid, {})
+                    changed = {c: v for c, v in values.items() if rid not in rows or old.get(c) != v}
+                    if not changed: continue
+                    upserts.append((rid, dict(old, **values)))
+                    journal += [(tbl, rid, c, v, ts) for c, v in changed.items()]
+            if journal: self._apply_local(tbl, upserts, deleted, journal)
+            return conflicts
+
+    def update_rows(self, tbl, changes, resolve, retries=CAS_RETRIES):
+        """compare_and_set 후 충돌한 행만 다시 시도.
+        resolve(ID, 지금 행 또는 None, 원래 바꾸려던 값) -> 지금 행 기준으로 다시 쓸 값 ({열: 값} / None=삭제 / False=포기)
+        반환: 끝내 반영하지 못한 ID 목록"""
+        pending = dict(changes)
+        for _ in range(retries + 1):
+            conflicts = self.compare_and_set(tbl, pending)
+            retry = {}
+            for rid, (ver, row) in conflicts.items():
+                values = resolve(rid, row, pending[rid][1])
+                if values is not False: retry[rid] = (ver, values)
+            gave_up = [rid for rid in conflicts if rid not in retry]
+            if not retry: return gave_up
+            pending = retry
+        return gave_up + list(pending)
+
+    def add_log(self, row):
+        self.add_logs([row])
+
+    def add_logs(self, rows):
+        with self.lock, self._tx():
+            ts = time.time()
+            self.db.executemany("INSERT INTO logs (data, ts) VALUES (?, ?)", [(json.dumps(r, ensure_ascii=False), ts) for r in rows])
+            self._bump_version("logs")
+
+    # --- 동기화용 ---
+    def pending(self):
+        """아직 시트에 올리지 않은 변경 수 (행 단위) + 로그 수"""
+        with self.lock:
+            (n_rows,) = self.db.execute("SELECT COUNT(*) FROM (SELECT DISTINCT tbl, id FROM journal)").fetchone()
+            (n_logs,) = self.db.execute("SELECT COUNT(*) FROM logs").fetchone()
+        return n_rows + n_logs
+
+    def pending_changes(self, tbl):
+        """반환: (마지막 seq, {ID: {열: (값, 시각)}}, {ID: 지운 시각})"""
+        with self.lock:
+            cur = self.db.execute("SELECT seq, id, col, value, ts FROM journal WHERE tbl = ? ORDER BY seq", (tbl,))
+            upto, fields, deletes = 0, {}, {}
+            for seq, rid, col, value, ts in cur:
+                upto = seq
+                if col == ROW_DELETED: deletes[rid] = ts
+                else: fields.setdefault(rid, {})[col] = (value, ts)
+        return upto, fields, deletes
+
+    def unpushed_logs(self, limit=None):
+        """반환: (마지막 seq, 로그 행 목록). limit: 앞에서부터 이만큼만"""
+        upto, rows, _ = self.log_batch(limit)
+        return upto, rows
+
+    def log_batch(self, limit=None):
+        """unpushed_logs와 같고 기록ID 목록도 함께. 기록ID = 저장소 uid:seq (시트에 이미 붙은 로그인지 알아볼 때 씀)"""
+        with self.lock:
+            cur = self.db.execute("SELECT seq, data FROM logs ORDER BY seq LIMIT ?", (-1 if limit is None else limit,)).fetchall()
+        return (cur[-1][0] if cur else 0), [json.loads(d) for _, d in cur], [f"{self.uid}:{seq}" for seq, _ in cur]
+
+    def commit_sync(self, tbl, rows, deleted, upto):
+        """시트와 맞춘 행만 반영: rows {ID: 행}은 base에 쓰고, deleted(ID)는 base에서 뺌. upto까지의 변경 기록은 지움
+        로컬 행도 그 행들만 다시 계산 (시트 쪽 값 위에 동기화 중에 새로 생긴 로컬 변경을 다시 얹음). 반환: 로컬 행이 바뀌었는지"""
+        with self.lock, self._tx():
+            (pos,) = self.db.execute("SELECT COALESCE(MAX(pos), 0) FROM base WHERE tbl = ?", (tbl,)).fetchone()
+            self.db.executemany(
+                "INSERT INTO base VALUES (?, ?, ?, ?) ON CONFLICT (tbl, id) DO UPDATE SET data = excluded.data",
+                [(tbl, rid, pos + i + 1, json.dumps(r, ensure_ascii=False)) for i, (rid, r) in enumerate(rows.items())]
+            )
+            self.db.executemany("DELETE FROM base WHERE tbl = ? AND id = ?", [(tbl, rid) for rid in deleted])
+            self.db.execute("DELETE FROM journal WHERE tbl = ? AND seq <= ?", (tbl, upto))
+            later = {}
+            for rid, col, value in self.db.execute("SELECT id, col, value FROM journal WHERE tbl = ? ORDER BY seq", (tbl,)):
+                later.setdefault(rid, []).append((col, value))
+            cur, vers = self._rows(tbl), self.vers[tbl]
+            (pos,) = self.db.execute("SELECT COALESCE(MAX(pos), 0) FROM rows WHERE tbl = ?", (tbl,)).fetchone()
+            changed = False
+            for rid in list(rows) + [rid for rid in deleted if rid not in rows]:
+                row = dict(rows[rid]) if rid in rows else None
+                for col, value in later.get(rid, []):
+                    if col == ROW_DELETED: row = None
+                    else: row = dict(row or {}, **{col: value})
+                if row == cur.get(rid): continue
+                # 시트에서 받아 내용이 바뀐 행만 버전을 올림 (그 행을 보고 있던 화면의 쓰기는 충돌로 잡힘)
+                changed = True
+                if row is None:
+                    self.db.execute("DELETE FROM rows WHERE tbl = ? AND id = ?", (tbl, rid))
+                    cur.pop(rid, None)
+                    vers.pop(rid, None)
+                    continue
+                vers[rid] = vers.get(rid, 0) + 1
+                if rid in cur:
+                    self.db.execute("UPDATE rows SET data = ?, ver = ? WHERE tbl = ? AND id = ?", (json.dumps(row, ensure_ascii=False), vers[rid], tbl, rid))
+                else:
+                    pos += 1
+                    self.db.execute("INSERT INTO rows VALUES (?, ?, ?, ?, ?)", (tbl, rid, pos, json.dumps(row, ensure_ascii=False), vers[rid]))
+                cur[rid] = row
+            if changed: self._bump_version(tbl)
+            return changed
+
+    def reset_sync(self, tbl, merged, upto):
+        """표 전체를 시트와 맞춘 결과로 다시 씀 (시트를 통째로 다시 썼거나 시트에서 행 순서가 바뀐 경우)
+        동기화 중에 새로 생긴 로컬 변경은 그 위에 다시 얹음"""
+        with self.lock, self._tx():
+            self.db.execute("DELETE FROM base WHERE tbl = ?", (tbl,))
+            self.db.executemany(
+                "INSERT INTO base VALUES (?, ?, ?, ?)",
+                [(tbl, rid, i, json.dumps(r, ensure_ascii=False)) for i, (rid, r) in enumerate(merged.items())]
+            )
+            self.db.execute("DELETE FROM journal WHERE tbl = ? AND seq <= ?", (tbl, upto))
+            rows = {rid: dict(r) for rid, r in merged.items()}
+            for rid, col, value in self.db.execute("SELECT id, col, value FROM journal WHERE tbl = ? ORDER BY seq", (tbl,)):
+                if col == ROW_DELETED: rows.pop(rid, None)
+                else: rows.setdefault(rid, {})[col] = value
+            # 시트에서 받아 내용이 바뀐 행만 버전을 올림 (그 행을 보고 있던 화면의 쓰기는 충돌로 잡힘)
+            old, old_vers = self._rows(tbl), self.vers[tbl]
+            vers = {rid: old_vers.get(rid, 0) + (old.get(rid) != r) for rid, r in rows.items()}
+            self.db.execute("DELETE FROM rows WHERE tbl = ?", (tbl,))
+            self.db.executemany(
+                "INSERT INTO rows VALUES (?, ?, ?, ?, ?)",
+                [(tbl, rid, i, json.dumps(r, ensure_ascii=False), vers[rid]) for i, (rid, r) in enumerate(rows.items())]
+            )
+            self.mem[tbl] = rows
+            self.vers[tbl] = vers
+            self._bump_version(tbl)
+
+    def commit_logs(self, upto):
+        with self.lock, self._tx():
+            self.db.execute("DELETE FROM logs WHERE seq <= ?", (upto,))
+            self._bump_version("logs")
+
+
+def _moved_by_one(before, after):
+    # 숫자로 된 수정 표시(로컬 백엔드)만 비교. 시트의 수정 시각은 다른 곳의 변경과 구분할 수 없으므로 늘 False
+    try: return int(after) - int(before) == 1
+    except (TypeError, ValueError): return False
+
+def merge(base, remote, fields, deletes, remote_ts):
+    """칸 단위 '나중에 고친 쪽이 이김'.
+    base: 지난번에 맞춘 시트 상태, remote: 지금 시트 상태, fields/deletes: 로컬 변경 기록
+    remote_ts: 시트 쪽 변경 시각 (시트는 칸별 수정 시각을 주지 않으므로 지난번 동기화 시각으로 봄)"""
+    out = {}
+    for rid, r in remote.items():
+        b = base.get(rid)
+        changed = {c for c in r if b is None or b.get(c, "") != r[c]}
+        if rid in deletes and (not changed or deletes[rid] >= remote_ts): continue
+        row = dict(r)
+        for col, (value, ts) in fields.get(rid, {}).items():
+            if col in changed and remote_ts > ts: continue
+            row[col] = value
+        out[rid] = row
+    for rid, cols in fields.items():
+        if rid in out or rid in deletes: continue
+        local = {c: v for c, (v, _) in cols.items()}
+        if rid not in base: out[rid] = local  # 로컬에서 새로 만든 행
+        # 시트에서 지워진 행: 그 뒤에 로컬에서 고쳤으면 되살림
+        elif max(ts for _, ts in cols.values()) > remote_ts: out[rid] = dict(base[rid], **local)
+    return out
+
+
+def _same_order(base, merged):
+    """merged를 행 단위로 base에 반영해도 (있던 행은 제자리, 새 행은 뒤에) 순서가 merged와 같은지"""
+    return list(merged) == [rid for rid in base if rid in merged] + [rid for rid in merged if rid not in base]
+
+
+class SyncEngine:
+    """remote는 다음을 제공하는 객체 (시트 / 테스트용 가짜 워크시트 모두 가능)
+    pull(tables) -> {표: (행 {ID: {열: 값}}, 시트를 다시 써야 하는지)}
+    push(tbl, rows, deleted) -> 바뀐 행만 시트에 반영 (rows {ID: 행}: 고치거나 새로 붙일 행, deleted: 지울 ID)
+    replace(tbl, rows) -> 시트를 rows 상태로 통째로 맞춤 (예전 형식을 옮기는 등 pull이 다시 쓰라고 한 경우)
+    push_logs(rows, ids, unsure) -> 로그를 붙이고 그 로그로 바뀐 stats 행만 {ID: {열: 값}}으로 돌려줌
+        ids: 로그마다 기록ID. unsure면 지난번에 보낸 것이 반영됐을 수 있으므로 시트에 이미 있는 기록ID는 붙이지도 세지도 않음
+    revision() (선택) -> 시트 수정 표시 (예: 마지막 수정 시각). 그대로면 가져오지 않고 로컬 변경만 base 위에 얹어 올림"""
+
+    def __init__(self, store, remote, tables=("books", "board"), derived=("stats",),
+                 interval=SYNC_INTERVAL, delay=SYNC_DELAY, full_every=FULL_PULL_EVERY, on_change=None):
+        self.store = store
+        self.remote = remote
+        self.tables = list(tables)
+        self.derived = list(derived)   # 시트에서 받기만 하는 표
+        self.interval = interval
+        self.delay = delay
+        self.full_every = full_every
+        self.on_change = on_change
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.thread = None
+        self.failures = 0
+        self.last_sync = None
+        self.last_error = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="sheet-sync", daemon=True)
+            self.thread.start()
+        return self
+
+    def missing(self, tables=None):
+        """tables(기본: 동기화하는 표 전부) 중 한 번도 가져오지 않은 표 (처음 실행 / 표가 새로 생긴 뒤 처음)"""
+        pulled = set(self.store.get_meta("tables") or [])
+        return [t for t in (self.tables + self.derived if tables is None else tables) if t not in pulled]
+
+    def ready(self, tables=None):
+        return not self.missing(tables)
+
+    def kick(self):
+        """로컬 변경이 생겼음을 알림 (delay초 뒤 올림)"""
+        self.wake.set()
+
+    def _run(self):
+        while True:
+            wait = self.interval if not self.failures else min(MAX_BACKOFF, self.delay * 2 ** self.failures)
+            if self.wake.wait(wait):
+                time.sleep(self.delay)  # 연달아 누른 클릭을 한 번에
+                self.wake.clear()
+            # 처음 연 화면에 필요한 표만 받아 둔 상태면 나머지 표만 (전체는 다음 주기부터)
+            try: self.sync_once(self.missing() or None)
+            except Exception: pass  # last_error에 남기고 다음 주기에 재시도
+
+    def sync_once(self, tables=None):
+        """가져오기 -> 합치기 -> 달라진 것만 올리기. 반환: 로컬 상태가 바뀌었는지
+        tables: 이 표만 가져옴 (처음 연 화면에 필요한 표만 먼저 받고, 나머지는 바로 이어서 백그라운드에서)"""
+        with self.lock:
+            # 기다리는 동안 다른 동기화가 이미 받아 왔으면 그대로
+            if tables is not None and self.ready(tables): return False
+            try:
+                changed = self._sync(tables)
+            except Exception as e:
+                self.failures += 1
+                self.last_error = str(e)
+                raise
+            self.failures = 0
+            self.last_error = None
+            self.last_sync = time.time()
+        if tables is not None and not self.ready(): self.wake.set()
+        if changed and self.on_change: self.on_change()
+        return changed
+
+    def _sync(self, only=None):
+        store = self.store
+        every = self.tables + self.derived
+        tables = every if only is None else [t for t in every if t in only]
+        # 수정 표시는 가져오기 전에 읽어 둠 (그 사이 바뀐 것은 다음 주기에 다시 가져옴)
+        revision = self.remote.revision() if hasattr(self.remote, "revision") and only is None else None
+        remote_ts = store.get_meta("pulled_at", 0.0)
+        # 시트가 지난번에 맞춘 그대로면 (수정 표시 / 동기화할 표 구성이 같으면) 가져오지 않음
+        fresh = revision is not None and revision == store.get_meta("revision") \
+            and store.get_meta("tables") == tables and time.time() - remote_ts < self.full_every
+        if fresh and not store.pending(): return False
+        pulled_at = time.time()
+        pulled = {} if fresh else self.remote.pull(tables)
+        changed, writes = False, 0   # writes: 시트에 쓴 횟수
+        for tbl in self.tables:
+            if tbl not in tables: continue
+            upto, fields, deletes = store.pending_changes(tbl)
+            if tbl in pulled:
+                remote_rows, dirty = pulled[tbl]
+                base = store.base(tbl)
+            elif upto:
+                # 가져오지 않았으면 시트 = base: 로컬에서 바뀐 행만 base에서 꺼내 합침
+                base = store.base(tbl, set(fields) | set(deletes))
+                remote_rows, dirty = base, False
+            else:
+                continue
+            merged = merge(base, remote_rows, fields, deletes, remote_ts)
+            if dirty:
+                self.remote.replace(tbl, merged)
+                writes += 1
+            else:
+                put = {rid: r for rid, r in merged.items() if remote_rows.get(rid) != r}
+                gone = [rid for rid in remote_rows if rid not in merged]
+                if put or gone:
+                    self.remote.push(tbl, put, gone)
+                    writes += 1
+            if dirty or not _same_order(base, merged):
+                store.reset_sync(tbl, merged, upto)
+                changed = True
+            else:
+                rows = {rid: r for rid, r in merged.items() if rid in fields or base.get(rid) != r}
+                deleted = [rid for rid in set(base) | set(fields) | set(deletes) if rid not in merged]
+                changed |= store.commit_sync(tbl, rows, deleted, upto)
+
+        for tbl in self.derived:
+            if tbl not in pulled: continue
+            rows, _ = pulled[tbl]
+            base = store.base(tbl)
+            if rows == base: continue
+            if _same_order(base, rows):
+                changed |= store.commit_sync(tbl, {rid: r for rid, r in rows.items() if base.get(rid) != r},
+                                             [rid for rid in base if rid not in rows], 0)
+            else:
+                store.reset_sync(tbl, rows, 0)
+                changed = True
+        upto, logs, ids = store.log_batch(PUSH_LOGS_MAX)
+        if logs:
+            # 보낸 뒤 결과를 모르는 채로 끝난 적이 있으면 (응답이 끊김 등) 시트에 이미 붙은 로그는 빼고 올리게 함
+            unsure = store.get_meta("logs_sent") is not None
+            if not unsure: store.set_meta("logs_sent", upto)
+            stats = self.remote.push_logs(logs, ids, unsure)
+            with store.transaction():
+                store.commit_sync("stats", stats, [], 0)
+                store.commit_logs(upto)
+                store.set_meta("logs_sent", None)
+            changed = True
+            writes += 1
+            if len(logs) == PUSH_LOGS_MAX: self.wake.set()  # 남은 로그는 바로 이어서
+
+        if only is not None:
+            # 일부만 받은 경우: 받은 표만 기록 (수정 표시는 모두 받을 때만 남김)
+            done = set(store.get_meta("tables") or []) | set(tables)
+            if store.get_meta("pulled_at") is None: store.set_meta("pulled_at", pulled_at)
+            store.set_meta("tables", [t for t in every if t in done])
+            return changed
+        if not fresh:
+            store.set_meta("pulled_at", pulled_at)
+            store.set_meta("tables", tables)
+        # 올리기 전의 수정 표시를 남김 (올리는 사이 다른 곳에서 고친 것을 건너뛰지 않도록, 다음 주기에 다시 받음)
+        # 한 번 쓰고 수정 표시가 정확히 하나 늘었으면 내 쓰기뿐이므로 올린 뒤의 것을 남겨 다시 받지 않음
+        if writes == 1 and revision is not None:
+            after = self.remote.revision()
+            if _moved_by_one(revision, after): revision = after
+        store.set_meta("revision", revision)
+        return changed
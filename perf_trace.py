@@ -0,0 +1,90 @@
+import json
+import math
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+# =========================================================
+# 실행(rerun)마다 구간별 시간과 시트 API 호출 수 / 주고받은 바이트를 기록
+#   - span(run, 이름): 구간 하나를 재서 run에 더함 (같은 이름은 횟수와 합계)
+#   - Tracer: 프로세스 전체의 최근 실행 기록 (p50/p95 요약, JSON Lines 내보내기)
+# 끝난 실행은 로거 "book_app.perf"로 한 줄 JSON을 남기고, log_path가 있으면 파일에도 붙임
+# =========================================================
+RECENT = 200   # 보관할 최근 실행 수
+
+logger = logging.getLogger("book_app.perf")
+
+
+def percentile(values, q):
+    """nearest-rank 백분위수 (값이 없으면 0)"""
+    if not values: return 0.0
+    s = sorted(values)
+    return s[min(len(s) - 1, max(0, math.ceil(q / 100 * len(s)) - 1))]
+
+
+@contextmanager
+def span(run, name):
+    """run이 None이면 재기만 하고 버림 (기록 중이 아닌 실행)"""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        t1 = time.perf_counter()
+        if run is not None:
+            s = run["spans"].setdefault(name, {"ms": 0.0, "n": 0})
+            s["ms"] += (t1 - t0) * 1000
+            s["n"] += 1
+            run["_last"] = t1
+
+
+class Tracer:
+    def __init__(self, recent=RECENT, log_path=None):
+        self.runs = deque(maxlen=recent)
+        self.lock = threading.Lock()
+        self.log_path = log_path
+
+    def begin(self, kind, api=(0, 0), session=""):
+        """api: 시작 시점의 누적 (시트 호출 수, 바이트)"""
+        t0 = time.perf_counter()
+        return {"ts": datetime.now().isoformat(timespec="seconds"), "session": session, "kind": kind,
+                "spans": {}, "_t0": t0, "_last": t0, "_api": api}
+
+    def finish(self, run, api=(0, 0), complete=True):
+        """complete=False: st.rerun / st.stop으로 끝까지 못 간 실행 (마지막 구간이 끝난 시각까지만 셈)"""
+        end = time.perf_counter() if complete else run["_last"]
+        rec = {k: v for k, v in run.items() if not k.startswith("_")}
+        rec.update({
+            "total_ms": round((end - run["_t0"]) * 1000, 1),
+            "complete": complete,
+            "api_calls": api[0] - run["_api"][0],
+            "api_bytes": api[1] - run["_api"][1],
+            "spans": {name: {"ms": round(s["ms"], 1), "n": s["n"]} for name, s in run["spans"].items()},
+        })
+        with self.lock: self.runs.append(rec)
+        line = json.dumps(rec, ensure_ascii=False)
+        logger.info(line)
+        if self.log_path:
+            try:
+                with self.lock, open(self.log_path, "a", encoding="utf-8") as f: f.write(line + "\n")
+            except OSError:
+                pass  # 로그 파일 문제로 앱이 멈추지 않도록
+        return rec
+
+    def recent(self, n=None):
+        with self.lock: runs = list(self.runs)
+        return runs[-n:] if n else runs
+
+    def summary(self):
+        """구간 이름 -> 실행 횟수 / p50 / p95 / 최대 (ms). "(전체)"는 실행 한 번의 전체 시간"""
+        per = {"(전체)": []}
+        for rec in self.recent():
+            per["(전체)"].append(rec["total_ms"])
+            for name, s in rec["spans"].items(): per.setdefault(name, []).append(s["ms"])
+        return {name: {"n": len(v), "p50_ms": percentile(v, 50), "p95_ms": percentile(v, 95), "max_ms": max(v, default=0.0)}
+                for name, v in per.items() if v}
+
+    def export_jsonl(self):
+        return "".join(json.dumps(rec, ensure_ascii=False) + "\n" for rec in self.recent())
@@ -0,0 +1,102 @@
+import pandas as pd
+
+from sheet_schema import STATS_COLS, LOG_COLS, COUNT_DTYPE, with_id_index, stats_id, parse_dates
+
+# =========================================================
+# 독서 집계: 일별 / 월별 / 아이별 읽은 횟수
+# logs 전체를 매번 다시 세지 않고, 새 로그만큼 집계표(stats 시트)를 더해 감
+# =========================================================
+UNIT_DAY = "일"          # 기간: YYYY-MM-DD
+UNIT_MONTH = "월"        # 기간: YYYY-MM
+UNIT_TOTAL = "전체"      # 기간: "" (아이별 누적)
+ARCHIVE_PREFIX = "logs_"  # 보관된 로그 시트: logs_YYYY (연도별)
+
+
+def empty():
+    return with_id_index(pd.DataFrame({c: pd.Series(dtype=COUNT_DTYPE if c == '권수' else object) for c in STATS_COLS}))
+
+
+def count_logs(logs):
+    """로그(행 목록 또는 DataFrame) -> 집계 행. 날짜를 읽을 수 없는 로그는 아이별 누적에만 들어감"""
+    df = logs if isinstance(logs, pd.DataFrame) else pd.DataFrame(logs, columns=LOG_COLS)
+    if df.empty: return empty()
+    dates = parse_dates(df['날짜'])
+    who = df['누가'].astype(str).str.strip().to_numpy()
+    day = dates.dt.strftime('%Y-%m-%d').to_numpy()
+    month = dates.dt.strftime('%Y-%m').to_numpy()
+    valid = dates.notna().to_numpy()
+    parts = [
+        pd.DataFrame({'단위': UNIT_DAY, '기간': day[valid], '누가': who[valid]}),
+        pd.DataFrame({'단위': UNIT_MONTH, '기간': month[valid], '누가': who[valid]}),
+        pd.DataFrame({'단위': UNIT_TOTAL, '기간': "", '누가': who}),
+    ]
+    out = pd.concat(parts, ignore_index=True).groupby(['단위', '기간', '누가'], sort=True).size().reset_index(name='권수')
+    out['ID'] = stats_id(out['단위'], out['기간'], out['누가'])
+    out['권수'] = out['권수'].astype(COUNT_DTYPE)
+    return with_id_index(out[STATS_COLS])
+
+
+def build(logs_df):
+    """logs 전체로 집계표를 처음부터 만듦 (처음 한 번 / 다시 맞출 때만)"""
+    return count_logs(logs_df)
+
+
+def apply_logs(stats_df, logs):
+    """기존 집계표 + 새 로그 -> 새 집계표 (기존 행은 제자리에서 더하고, 새 칸은 뒤에 붙임)"""
+    delta = count_logs(logs)
+    if delta.empty: return stats_df
+    out = stats_df.copy()
+    out['권수'] = pd.to_numeric(out['권수'], errors='coerce').fillna(0).astype(COUNT_DTYPE)
+    hit = delta.index.isin(out.index)
+    common = delta.index[hit]
+    out.loc[common, '권수'] = (out.loc[common, '권수'] + delta.loc[common, '권수']).astype(COUNT_DTYPE)
+    return pd.concat([out, delta[~hit]])
+
+
+def _unit(stats_df, unit, period_col):
+    df = stats_df[stats_df['단위'] == unit]
+    return df[['기간', '누가', '권수']].rename(columns={'기간': period_col}).sort_values(period_col).reset_index(drop=True)
+
+
+def daily(stats_df):
+    return _unit(stats_df, UNIT_DAY, '날짜')
+
+
+def monthly(stats_df):
+    return _unit(stats_df, UNIT_MONTH, '월')
+
+
+def per_reader(stats_df):
+    df = stats_df[stats_df['단위'] == UNIT_TOTAL]
+    return df.set_index('누가')['권수'].astype(int)
+
+
+def total(stats_df):
+    return int(per_reader(stats_df).sum())
+
+
+def months(stats_df):
+    """집계에 있는 달 목록 (최근 달부터)"""
+    return sorted(stats_df.loc[stats_df['단위'] == UNIT_MONTH, '기간'].unique(), reverse=True)
+
+
+def archive_sheet(month):
+    return ARCHIVE_PREFIX + month[:4]
+
+
+def split_archive(raw_logs, keep_months, today):
+    """logs 시트 원본 -> (남길 행, {보관 시트 이름: 옮길 행}, 옮길 행의 위치). 최근 keep_months달과 날짜를 읽을 수 없는 행은 남김
+    위치는 머리글을 뺀 데이터 행 기준 (0부터)"""
+    if len(raw_logs) < 2: return raw_logs, {}, []
+    header, rows = raw_logs[0], raw_logs[1:]
+    cutoff = (pd.Timestamp(today).to_period('M') - (keep_months - 1)).strftime('%Y-%m')
+    pos = header.index('날짜') if '날짜' in header else 0
+    dates = parse_dates([r[pos] if len(r) > pos else "" for r in rows])
+    month = dates.dt.strftime('%Y-%m')
+    keep, moved, gone = [header], {}, []
+    for i, (r, m) in enumerate(zip(rows, month)):
+        if isinstance(m, str) and m < cutoff:
+            moved.setdefault(archive_sheet(m), []).append(r)
+            gone.append(i)
+        else: keep.append(r)
+    return keep, moved, gone
@@ -0,0 +1,151 @@
+import time
+import random
+import threading
+from http import HTTPStatus
+from urllib.parse import urlparse
+from concurrent.futures import Future
+
+import requests
+from gspread.exceptions import APIError
+from gspread.http_client import HTTPClient
+
+from call_stats import CallStats
+
+# =========================================================
+# Google Sheets 호출 조절: 분당 한도 안에서 보내고 (토큰 버킷),
+# 429/408/5xx는 지터를 넣은 지수 백오프로 재시도 (두 번 반영되면 안 되는 쓰기는 빼고), 같은 읽기 요청은 하나로 합침
+# =========================================================
+READ_PER_MIN = 60      # 사용자(서비스 계정)당 분당 읽기 한도
+WRITE_PER_MIN = 60     # 사용자(서비스 계정)당 분당 쓰기 한도
+BURST = 10             # 한 번에 몰아서 보낼 수 있는 요청 수
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0     # 초
+BACKOFF_CAP = 32.0     # 초
+TIMEOUT = (3.05, 30)   # (연결, 응답) 초
+RETRY_CODES = {HTTPStatus.TOO_MANY_REQUESTS}   # 처리하기 전에 거절한 것 -> 쓰기도 다시 보냄
+# 408/5xx는 처리됐는지 알 수 없음: 두 번 반영되면 안 되는 쓰기는 다시 보내지 않고 오류를 올림
+# (행 추가는 두 번 붙고, 행 위치로 지우거나 덮어쓰는 요청은 그 사이 밀린 다른 행을 건드림 -> 동기화가 다시 받아 비교)
+UNSAFE_REQUESTS = ("appendCells", "insertDimension", "deleteDimension", "updateCells")
+
+
+class TokenBucket:
+    """per_min: 분당 허용량. 처음 burst개는 바로, 이후는 일정한 간격으로 (어느 1분 구간도 per_min을 넘지 않음)"""
+
+    def __init__(self, per_min, burst=BURST, clock=time.monotonic, sleep=time.sleep):
+        self.capacity = burst
+        self.rate = max(per_min - burst, 1) / 60.0
+        self.tokens = float(burst)
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 하나를 얻을 때까지 기다림. 반환: 기다린 시간(초)"""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1 - 1e-9:  # 부동소수 오차로 끝없이 기다리지 않도록
+                    self.tokens -= 1
+                    return waited
+                wait = (1 - self.tokens) / self.rate
+            self.sleep(wait)
+            waited += wait
+
+
+def operation(method, endpoint):
+    """요청 URL -> 집계용 작업 이름 (예: values:batchGet, values:append, batchUpdate, get)"""
+    path = urlparse(endpoint).path
+    if "/spreadsheets/" not in path: return "drive:" + method.lower()
+    rest = path.split("/spreadsheets/", 1)[1]
+    if "/values" in rest:
+        after = rest.split("/values", 1)[1]
+        if after.startswith(":"): return "values" + after
+        if ":" in after.rsplit("/", 1)[-1]: return "values:" + after.rsplit(":", 1)[1]
+        return "values.get" if method.upper() == "GET" else "values.update"
+    if ":" in rest: return rest.split(":", 1)[1]
+    return "get"
+
+
+class ThrottledHTTPClient(HTTPClient):
+    """gspread.authorize(..., http_client=ThrottledHTTPClient)로 쓰는 HTTP 클라이언트.
+    모든 워크시트/스프레드시트 호출이 여기를 지나가므로 호출하는 쪽은 고칠 필요 없음"""
+
+    def __init__(self, auth, session=None, read_per_min=READ_PER_MIN, write_per_min=WRITE_PER_MIN,
+                 max_retries=MAX_RETRIES, sleep=time.sleep):
+        super().__init__(auth, session)
+        self.timeout = TIMEOUT
+        self.read_bucket = TokenBucket(read_per_min, sleep=sleep)
+        self.write_bucket = TokenBucket(write_per_min, sleep=sleep)
+        self.max_retries = max_retries
+        self.sleep = sleep
+        self.stats = CallStats()
+        self.inflight = {}   # 진행 중인 읽기 요청 -> Future
+        self.inflight_lock = threading.Lock()
+
+    def request(self, method, endpoint, params=None, data=None, json=None, files=None, headers=None):
+        op = operation(method, endpoint)
+        if method.upper() != "GET":
+            return self._send(op, False, method, endpoint, params, data, json, files, headers)
+
+        # 똑같은 읽기가 이미 진행 중이면 그 결과를 함께 씀
+        key = (endpoint, repr(sorted((params or {}).items())))
+        with self.inflight_lock:
+            fut = self.inflight.get(key)
+            owner = fut is None
+            if owner: fut = self.inflight[key] = Future()
+        if not owner:
+            self.stats.add(op, "coalesced")
+            return fut.result()
+        try:
+            resp = self._send(op, True, method, endpoint, params, data, json, files, headers)
+            fut.set_result(resp)
+            return resp
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        finally:
+            with self.inflight_lock: self.inflight.pop(key, None)
+
+    def _retryable(self, op, is_read, json, code):
+        if code in RETRY_CODES: return True
+        if code != HTTPStatus.REQUEST_TIMEOUT and code < HTTPStatus.INTERNAL_SERVER_ERROR: return False
+        if is_read: return True
+        if "append" in op: return False
+        return not any(k in UNSAFE_REQUESTS for r in (json or {}).get("requests", []) for k in r)
+
+    def _send(self, op, is_read, method, endpoint, params, data, json, files, headers):
+        bucket = self.read_bucket if is_read else self.write_bucket
+        attempt = 0
+        while True:
+            waited = bucket.acquire()
+            if waited: self.stats.add(op, "waited_s", round(waited, 3))
+            self.stats.add(op, "calls")
+            try:
+                resp = self.session.request(
+                    method=method, url=endpoint, json=json, params=params, data=data,
+                    files=files, headers=headers, timeout=self.timeout,
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                if not is_read or attempt >= self.max_retries:
+                    self.stats.add(op, "errors")
+                    raise
+                retry_after = None
+            else:
+                if resp.ok:
+                    req = getattr(resp, "request", None)
+                    self.stats.add(op, "bytes", len(resp.content or b"") + len(getattr(req, "body", None) or b""))
+                    return resp
+                if attempt >= self.max_retries or not self._retryable(op, is_read, json, resp.status_code):
+                    self.stats.add(op, "errors")
+                    raise APIError(resp)
+                retry_after = resp.headers.get("Retry-After")
+            attempt += 1
+            self.stats.add(op, "retries")
+            # 지터를 넣은 지수 백오프 (서버가 Retry-After를 주면 그보다 짧게 기다리지 않음)
+            delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+            if retry_after and str(retry_after).isdigit(): delay = max(delay, float(retry_after))
+            self.sleep(delay)
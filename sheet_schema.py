@@ -0,0 +1,245 @@
+import uuid
+
+import numpy as np
+import pandas as pd
+
+# =========================================================
+# 시트 스키마: 열 정의 + 시트 원본(문자열 행) -> 타입이 정해진 DataFrame
+# 모든 정리는 열 단위(벡터)로 처리
+# =========================================================
+STAR_OPTIONS = ["선택 안 함", "⭐", "⭐⭐", "⭐⭐⭐", "⭐⭐⭐⭐", "⭐⭐⭐⭐⭐"]
+# 독자 시트가 생기기 전 books에 열(횟수_첫째 등)로 있던 두 아이 = 처음 시작할 때의 기본 독자 (ID = 이름)
+LEGACY_READERS = [("첫째", "👦"), ("둘째", "👧")]
+DEFAULT_ICON = "🧒"
+
+BOOK_COLS = ['ID', '제목', 'ISBN', '레벨', '표지URL', '음원URL']
+READER_COLS = ['ID', '이름', '아이콘']   # ID는 logs/stats의 '누가'에 들어가는 값
+READ_COLS = ['ID', '책ID', '독자ID', '횟수', '반응', '메모']   # 책 x 독자 한 행 (읽었거나 별점/메모를 남긴 조합만)
+BOARD_COLS = ['ID', '날짜', '내용', '고정', '즐겨찾기', '삭제']   # 삭제: 지운 글 표시 (나중에 한꺼번에 정리)
+LOG_COLS = ['날짜', '책ID', '제목', '레벨', '누가']
+LOG_ID_POS = len(LOG_COLS)   # 시트의 logs 행에서 LOG_COLS 다음 칸: 올린 로그의 기록ID (같은 로그를 두 번 붙이지 않도록)
+STATS_COLS = ['ID', '단위', '기간', '누가', '권수']
+
+READ_FIELDS = ['횟수', '반응', '메모']   # 예전 books 시트에서는 '횟수_첫째'처럼 독자마다 열
+FLAG_COLS = ['고정', '즐겨찾기', '삭제']
+
+STAR_DTYPE = pd.CategoricalDtype(STAR_OPTIONS)
+LEVEL_DTYPE = "int8"
+COUNT_DTYPE = "int32"
+
+
+def with_id_index(df):
+    """ID를 인덱스로 (열도 유지) - 조회/수정은 books_df.at[책ID, 열]로 바로"""
+    return df.set_index(df['ID'].astype(str), drop=False).rename_axis(None)
+
+
+def _frame(raw, cols):
+    """시트 원본 행 목록 -> 필요한 열만 가진 문자열 DataFrame"""
+    if not raw: return pd.DataFrame({c: pd.Series(dtype=object) for c in cols})
+    df = pd.DataFrame(raw[1:], columns=raw[0], dtype=object)
+    df = df.loc[:, ~df.columns.duplicated()]
+    for col in cols:
+        if col not in df.columns: df[col] = ""
+    return df[cols]
+
+
+def _fill_ids(df):
+    """빈 ID에 uuid를 채움. 반환: 채운 개수"""
+    ids = df['ID'].fillna("").astype(str).str.strip().to_numpy(dtype=object)
+    missing = ids == ""
+    n = int(missing.sum())
+    # 배열에 채움 (arrow 문자열 Series에 불리언 마스크로 목록을 넣으면 pandas가 오류를 냄)
+    if n: ids[missing] = [str(uuid.uuid4()) for _ in range(n)]
+    df['ID'] = ids
+    return n
+
+
+def _levels(s):
+    return pd.to_numeric(s, errors='coerce').fillna(1).clip(1, 5).astype(LEVEL_DTYPE)
+
+
+def _flags(s):
+    return s.astype(str).str.upper().eq("TRUE")
+
+
+def _counts(s):
+    return pd.to_numeric(s, errors='coerce').fillna(0).clip(lower=0).astype(COUNT_DTYPE)
+
+
+def _stars(s):
+    return s.where(s.isin(STAR_OPTIONS), STAR_OPTIONS[0]).astype(STAR_DTYPE)
+
+
+def parse_dates(s):
+    """날짜 열 -> Timestamp (읽을 수 없으면 NaT). 첫 값의 형식으로 나머지를 읽으면 형식이 다른 행 (시각이 붙은 값,
+    예전 CSV의 2025/01/02 등)이 모두 NaT가 되므로: 대부분인 YYYY-MM-DD는 한 번에, 나머지만 하나씩 형식을 보고 읽음"""
+    s = pd.Series(s)
+    if pd.api.types.is_datetime64_any_dtype(s): return s
+    out = pd.to_datetime(s, errors='coerce', format="%Y-%m-%d")
+    rest = (out.isna() & s.notna() & s.astype(str).str.strip().ne("")).to_numpy()
+    if rest.any(): out[rest] = pd.to_datetime(s[rest], errors='coerce', format="mixed")
+    return out
+
+
+def normalize_books(raw):
+    """반환: (books_df, ID를 새로 채웠는지, 시트와 행/열 구성이 그대로 일치하는지)"""
+    df = _frame(raw, BOOK_COLS).copy()
+    filled = _fill_ids(df)
+    df['레벨'] = _levels(df['레벨'])
+    for col in ['제목', 'ISBN', '표지URL', '음원URL']:
+        df[col] = df[col].fillna("").astype(str)
+
+    n_rows = len(df)
+    df = with_id_index(df.drop_duplicates(subset=['ID'], keep='first'))
+    exact = bool(raw) and list(raw[0]) == BOOK_COLS and not filled and len(df) == n_rows
+    return df, filled > 0, exact
+
+
+def read_id(book_id, reader_id):
+    """reads 행 ID: 책ID|독자ID (책과 독자 두 키로 바로 찾음)"""
+    return str(book_id) + "|" + str(reader_id)
+
+
+def normalize_readers(raw):
+    """반환: (readers_df, ID를 새로 채웠는지, 시트와 행/열 구성이 그대로 일치하는지). 빈 ID는 이름으로"""
+    df = _frame(raw, READER_COLS).copy()
+    for col in READER_COLS:
+        df[col] = df[col].fillna("").astype(str).str.strip()
+    missing = df['ID'].eq("") & df['이름'].ne("")
+    df.loc[missing, 'ID'] = df.loc[missing, '이름']
+    df = df[df['ID'] != ""]
+    df.loc[df['이름'] == "", '이름'] = df['ID']
+    df.loc[df['아이콘'] == "", '아이콘'] = DEFAULT_ICON
+
+    n_rows = len(df)
+    df = with_id_index(df.drop_duplicates(subset=['ID'], keep='first'))
+    exact = bool(raw) and list(raw[0]) == READER_COLS and not missing.any() and len(df) == n_rows == len(raw) - 1
+    return df, bool(missing.any()), exact
+
+
+def normalize_reads(raw):
+    """반환: (reads_df, ID를 새로 채웠는지(항상 False), 시트와 행/열 구성이 그대로 일치하는지)
+    ID는 책ID/독자ID로 다시 계산. 독자ID는 몇 가지 값이 반복되므로 범주형"""
+    df = _frame(raw, READ_COLS).copy()
+    old_ids = df['ID'].fillna("").astype(str)
+    for col in ['책ID', '독자ID']:
+        df[col] = df[col].fillna("").astype(str).str.strip()
+    df['ID'] = df['책ID'] + "|" + df['독자ID']
+    ids_ok = bool(old_ids.eq(df['ID']).all())
+    df = df[(df['책ID'] != "") & (df['독자ID'] != "")]
+    df['독자ID'] = df['독자ID'].astype("category")
+    df['횟수'] = _counts(df['횟수'])
+    df['반응'] = _stars(df['반응'])
+    df['메모'] = df['메모'].fillna("").astype(str)
+
+    n_rows = len(df)
+    df = with_id_index(df.drop_duplicates(subset=['ID'], keep='first'))
+    exact = bool(raw) and list(raw[0]) == READ_COLS and ids_ok and len(df) == n_rows == len(raw) - 1
+    return df, False, exact
+
+
+def default_readers_raw():
+    return [READER_COLS] + [[name, name, icon] for name, icon in LEGACY_READERS]
+
+
+def split_wide_books(raw):
+    """예전 books 시트 (독자마다 횟수_/반응_/메모_ 열) -> (books 원본, reads 원본). 예전 열이 없으면 (raw, None)
+    빈 ID는 여기서 채워서 두 원본의 책ID가 어긋나지 않게 함. 읽은 적도 별점/메모도 없는 조합은 행을 만들지 않음"""
+    wide = [f"{f}_{name}" for name, _ in LEGACY_READERS for f in READ_FIELDS]
+    if not raw or not any(c in raw[0] for c in wide): return raw, None
+    df = _frame(raw, BOOK_COLS + wide).copy()
+    _fill_ids(df)
+    parts = []
+    for name, _ in LEGACY_READERS:
+        part = pd.DataFrame({'책ID': df['ID'], '독자ID': name})
+        for f in READ_FIELDS: part[f] = df[f"{f}_{name}"].fillna("").astype(str).str.strip()
+        used = (_counts(part['횟수']) > 0) | (_stars(part['반응']) != STAR_OPTIONS[0]) | (part['메모'] != "")
+        parts.append(part[used.to_numpy()])
+    reads = pd.concat(parts, ignore_index=True)
+    reads.insert(0, 'ID', reads['책ID'] + "|" + reads['독자ID'])
+    books = df[BOOK_COLS].fillna("")
+    return [BOOK_COLS] + books.values.tolist(), [READ_COLS] + reads[READ_COLS].values.tolist()
+
+
+def migrate_wide_books(raw):
+    """raw(표 이름 -> 원본)의 예전 books 시트를 books / reads 원본으로 나눔 (raw를 고침)
+    reads 시트에 이미 행이 있으면 reads는 그대로 둠. 반환: 옮겨서 시트에 새로 써야 하는 표 이름들"""
+    migrated = set()
+    if "books" not in raw: return migrated
+    raw["books"], wide_reads = split_wide_books(raw["books"])
+    if wide_reads is None: return migrated
+    migrated.add("books")
+    if len(raw.get("reads", [])) < 2:
+        raw["reads"] = wide_reads
+        migrated.add("reads")
+    return migrated
+
+
+def normalize_board(raw):
+    """반환: (board_df, ID를 새로 채웠는지, 시트와 행/열 구성이 그대로 일치하는지)"""
+    df = _frame(raw, BOARD_COLS).copy()
+    filled = _fill_ids(df)
+    for col in FLAG_COLS:
+        df[col] = _flags(df[col])
+    for col in ['날짜', '내용']:
+        df[col] = df[col].fillna("").astype(str)
+
+    n_rows = len(df)
+    df = with_id_index(df.drop_duplicates(subset=['ID'], keep='first'))
+    exact = bool(raw) and list(raw[0]) == BOARD_COLS and not filled and len(df) == n_rows
+    return df, filled > 0, exact
+
+
+def normalize_logs(raw):
+    """logs는 같은 값이 반복되므로 책ID/제목/누가를 범주형으로"""
+    df = _frame(raw, LOG_COLS).copy()
+    df['날짜'] = parse_dates(df['날짜'])
+    df['레벨'] = _levels(df['레벨'])
+    for col in ['책ID', '제목', '누가']:
+        df[col] = df[col].fillna("").astype(str).astype("category")
+    return df.reset_index(drop=True)
+
+
+def stats_id(unit, period, who):
+    """집계 행 ID: 단위|기간|누가 (같은 칸은 항상 같은 행으로 모임). 값 대신 열(Series)을 넣으면 열 단위로"""
+    return unit + "|" + period + "|" + who
+
+
+def normalize_stats(raw):
+    """반환: (stats_df, 시트와 행/열 구성이 그대로 일치하는지). ID는 단위/기간/누가로 다시 계산"""
+    df = _frame(raw, STATS_COLS).copy()
+    old_ids = df['ID'].fillna("").astype(str)
+    for col in ['단위', '기간', '누가']:
+        df[col] = df[col].fillna("").astype(str)
+    df['ID'] = stats_id(df['단위'], df['기간'], df['누가'])
+    ids_ok = bool(old_ids.eq(df['ID']).all())
+    df['권수'] = pd.to_numeric(df['권수'], errors='coerce').fillna(0).clip(lower=0).astype(COUNT_DTYPE)
+
+    n_rows = len(df)
+    df = with_id_index(df.drop_duplicates(subset=['ID'], keep='first'))
+    exact = bool(raw) and list(raw[0]) == STATS_COLS and ids_ok and len(df) == n_rows
+    return df, exact
+
+
+def to_sheet_values(df, cols):
+    """저장용: 범주형/numpy 값을 일반 파이썬 값으로 (빈 값은 "")"""
+    out = df[cols].astype(object)
+    return out.where(out.notna(), "")
+
+
+def to_text(v):
+    """값 하나 -> 시트에 보이는 문자열 (bool은 TRUE/FALSE)"""
+    if isinstance(v, np.generic): v = v.item()
+    if isinstance(v, bool): return "TRUE" if v else "FALSE"
+    return str(v)
+
+
+def to_records(df, cols):
+    """저장 형식 DataFrame -> {ID: {열: 시트에 보이는 문자열}} (로컬 저장소/동기화 비교용)"""
+    values = to_sheet_values(df, cols)
+    return {str(rid): {c: to_text(v) for c, v in zip(cols, row)} for rid, row in zip(values['ID'], values.itertuples(index=False))}
+
+
+def records_to_raw(records, cols):
+    """{ID: {열: 값}} -> 시트 원본 모양 ([머리글] + 행 목록)"""
+    return [list(cols)] + [[r.get(c, "") for c in cols] for r in records.values()]
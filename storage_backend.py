@@ -0,0 +1,271 @@
+import os
+import json
+import hashlib
+import time
+import random
+import sqlite3
+import threading
+
+from call_stats import CallStats
+
+# =========================================================
+# 저장소 백엔드: 앱이 쓰는 스프레드시트 기능을 한곳으로
+#   - GSheetBackend: 실제 구글 시트 (gspread)
+#   - LocalSheetBackend: 같은 기능을 SQLite 파일로 흉내 (인증 없이 테스트/벤치마크용, 지연 시간 주입 가능)
+# 앱은 open()이 돌려준 객체의 아래 기능만 사용
+#   스프레드시트: worksheets(), add_worksheet(title, rows, cols), values_batch_get(ranges),
+#               batch_update(body), get_lastUpdateTime()
+#   워크시트: title, id, spreadsheet, get_all_values(), clear(), update(range_name, values), append_rows(rows)
+# =========================================================
+LOCAL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "local_sheet.sqlite3")
+
+
+class GSheetBackend:
+    def __init__(self, service_account_info, sheet_url):
+        self.service_account_info = service_account_info
+        self.sheet_url = sheet_url
+        self.client = None
+        # 로컬 저장소/스냅샷 파일 이름에 붙일 구분자 (백엔드를 바꿔도 데이터가 섞이지 않도록)
+        self.key = "sheets_" + hashlib.sha1(sheet_url.encode("utf-8")).hexdigest()[:10]
+
+    def open(self):
+        # 필요할 때만 불러옴 (로컬 백엔드만 쓸 때는 구글 인증 라이브러리가 없어도 됨)
+        import gspread
+        from google.oauth2.service_account import Credentials
+        from sheet_client import ThrottledHTTPClient
+
+        scopes = [
+            "https://www.googleapis.com/auth/spreadsheets",
+            "https://www.googleapis.com/auth/drive"
+        ]
+        if self.client is None:
+            credentials = Credentials.from_service_account_info(self.service_account_info, scopes=scopes)
+            # 모든 시트 호출은 ThrottledHTTPClient를 지나감 (분당 한도 조절 / 429·5xx 재시도 / 같은 읽기 합치기)
+            self.client = gspread.authorize(credentials, http_client=ThrottledHTTPClient)
+        # open_by_url은 메타데이터 요청이 따라오므로 한 번만
+        return self.client.open_by_url(self.sheet_url)
+
+    def api_stats(self):
+        stats = getattr(getattr(self.client, "http_client", None), "stats", None)
+        return stats.snapshot() if stats is not None else None
+
+
+class LocalSheetBackend:
+    """latency: 호출마다 넣을 평균 지연(초). 0.5~1.5배로 흔들어서 시트 왕복 시간을 흉내"""
+
+    def __init__(self, path=LOCAL_PATH, latency=0.0):
+        self.path = path
+        self.latency = latency
+        self.stats = CallStats()
+        self.key = "local_" + hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:10]
+        self.sheet = None
+
+    def open(self):
+        if self.sheet is None: self.sheet = LocalSpreadsheet(self.path, self)
+        return self.sheet
+
+    def api_stats(self):
+        return self.stats.snapshot()
+
+    def call(self, op, payload=None):
+        """payload: 이 호출로 오갈 내용 (JSON 크기를 주고받은 바이트로 셈)"""
+        self.stats.add(op, "calls")
+        if payload is not None: self.stats.add(op, "bytes", len(json.dumps(payload, ensure_ascii=False).encode("utf-8")))
+        if self.latency > 0:
+            delay = self.latency * random.uniform(0.5, 1.5)
+            self.stats.add(op, "waited_s", round(delay, 3))
+            time.sleep(delay)
+
+
+def _shown(v):
+    """셀에 넣은 값 -> 시트가 돌려주는 표시 문자열 (실제 시트처럼 bool은 TRUE/FALSE)"""
+    if v is None: return ""
+    if isinstance(v, bool): return "TRUE" if v else "FALSE"
+    if isinstance(v, float) and v.is_integer(): return str(int(v))
+    return str(v)
+
+
+def _formatted(cell):
+    """batch_update의 userEnteredValue -> 시트가 돌려주는 표시 문자열"""
+    return _shown(next(iter(cell.get("userEnteredValue", {"stringValue": ""}).values())))
+
+
+class LocalSpreadsheet:
+    def __init__(self, path, backend):
+        if path != ":memory:": os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.backend = backend
+        self.lock = threading.RLock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(
+            "CREATE TABLE IF NOT EXISTS sheets (id INTEGER PRIMARY KEY, title TEXT UNIQUE);"
+            "CREATE TABLE IF NOT EXISTS cells (sheet_id INTEGER, pos INTEGER, data TEXT, PRIMARY KEY (sheet_id, pos));"
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);"
+        )
+        self.db.commit()
+        self.sheets = {}
+        for sid, title in self.db.execute("SELECT id, title FROM sheets ORDER BY id").fetchall():
+            self.sheets[title] = LocalWorksheet(self, sid, title)
+
+    def _touch(self):
+        self.db.execute(
+            "INSERT INTO meta (key, value) VALUES ('revision', '1') "
+            "ON CONFLICT(key) DO UPDATE SET value = CAST(CAST(value AS INTEGER) + 1 AS TEXT)"
+        )
+
+    # --- 스프레드시트 기능 ---
+    def worksheets(self):
+        self.backend.call("get")
+        with self.lock: return list(self.sheets.values())
+
+    def worksheet(self, title):
+        return self.sheets[title]
+
+    def add_worksheet(self, title, rows=100, cols=20):
+        self.backend.call("batchUpdate")
+        with self.lock, self.db:
+            if title not in self.sheets:
+                sid = self.db.execute("INSERT INTO sheets (title) VALUES (?)", (title,)).lastrowid
+                self.sheets[title] = LocalWorksheet(self, sid, title)
+                self._touch()
+            return self.sheets[title]
+
+    def values_batch_get(self, ranges, params=None):
+        out = []
+        with self.lock:
+            for r in ranges:
+                title = r.split("!")[0].strip("'")
+                values = []
+                for row in self.sheets[title]._values():
+                    # 실제 API처럼 행 끝의 빈 칸은 잘라서 줌
+                    while row and row[-1] == "": row = row[:-1]
+                    values.append(row)
+                out.append({"range": r, "values": values})
+        result = {"valueRanges": out}
+        self.backend.call("values:batchGet", result)
+        return result
+
+    def batch_update(self, body):
+        self.backend.call("batchUpdate", body)
+        by_id = {w.id: w for w in self.sheets.values()}
+        with self.lock, self.db:
+            for req in body["requests"]:
+                if "updateCells" in req:
+                    u = req["updateCells"]
+                    wks = by_id[u["start"]["sheetId"]]
+                    r0, c0 = u["start"]["rowIndex"], u["start"].get("columnIndex", 0)
+                    for dr, row in enumerate(u["rows"]):
+                        wks._set_cells(r0 + dr, c0, [_formatted(c) for c in row["values"]])
+                elif "appendCells" in req:
+                    u = req["appendCells"]
+                    by_id[u["sheetId"]]._append([[_formatted(c) for c in row["values"]] for row in u["rows"]])
+                elif "deleteDimension" in req:
+                    u = req["deleteDimension"]["range"]
+                    by_id[u["sheetId"]]._delete(u["startIndex"], u["endIndex"])
+                else:
+                    raise NotImplementedError(f"지원하지 않는 요청: {list(req)}")
+            self._touch()
+        return {}
+
+    def get_lastUpdateTime(self):
+        self.backend.call("drive:get")
+        with self.lock:
+            row = self.db.execute("SELECT value FROM meta WHERE key = 'revision'").fetchone()
+        return row[0] if row else "0"
+
+    # --- 준비용 (벤치마크/테스트에서 데이터를 한꺼번에 넣을 때, 호출 수에 포함하지 않음) ---
+    def load_rows(self, title, rows):
+        with self.lock:
+            if title not in self.sheets:
+                with self.db:
+                    sid = self.db.execute("INSERT INTO sheets (title) VALUES (?)", (title,)).lastrowid
+                self.sheets[title] = LocalWorksheet(self, sid, title)
+            wks = self.sheets[title]
+            with self.db:
+                wks._clear()
+                wks._append(rows)
+                self._touch()
+            return wks
+
+
+class LocalWorksheet:
+    def __init__(self, spreadsheet, sid, title):
+        self.spreadsheet = spreadsheet
+        self.id = sid
+        self.title = title
+        self.db = spreadsheet.db
+        cur = self.db.execute("SELECT pos, data FROM cells WHERE sheet_id = ? ORDER BY pos", (sid,))
+        self.pos, self.rows = [], []   # 행 순서대로의 저장 위치 / 값 (메모리 사본)
+        for pos, data in cur:
+            self.pos.append(pos)
+            self.rows.append(json.loads(data))
+
+    def _values(self):
+        return [list(r) for r in self.rows]
+
+    def _clear(self):
+        self.db.execute("DELETE FROM cells WHERE sheet_id = ?", (self.id,))
+        self.pos, self.rows = [], []
+
+    def _append(self, rows):
+        start = (self.pos[-1] + 1) if self.pos else 0
+        rows = [[_shown(v) for v in r] for r in rows]
+        self.db.executemany(
+            "INSERT INTO cells VALUES (?, ?, ?)",
+            [(self.id, start + i, json.dumps(r, ensure_ascii=False)) for i, r in enumerate(rows)]
+        )
+        self.pos += range(start, start + len(rows))
+        self.rows += rows
+
+    def _set_cells(self, r, c0, values):
+        if r >= len(self.rows): self._append([[]] * (r - len(self.rows) + 1))
+        row = self.rows[r]
+        row += [""] * max(0, c0 + len(values) - len(row))
+        row[c0:c0 + len(values)] = values
+        self.db.execute("UPDATE cells SET data = ? WHERE sheet_id = ? AND pos = ?", (json.dumps(row, ensure_ascii=False), self.id, self.pos[r]))
+
+    def _delete(self, start, end):
+        self.db.executemany("DELETE FROM cells WHERE sheet_id = ? AND pos = ?", [(self.id, p) for p in self.pos[start:end]])
+        del self.pos[start:end]
+        del self.rows[start:end]
+
+    # --- 워크시트 기능 ---
+    def get_all_values(self):
+        with self.spreadsheet.lock:
+            width = max((len(r) for r in self.rows), default=0)
+            values = [r + [""] * (width - len(r)) for r in self._values()]
+        self.spreadsheet.backend.call("values.get", values)
+        return values
+
+    def clear(self):
+        self.spreadsheet.backend.call("values:clear")
+        with self.spreadsheet.lock, self.db:
+            self._clear()
+            self.spreadsheet._touch()
+
+    def update(self, range_name="A1", values=None, **kwargs):
+        # 앱은 A1부터 전체를 쓰는 경우만 사용
+        self.spreadsheet.backend.call("values.update", values or [])
+        with self.spreadsheet.lock, self.db:
+            self._clear()
+            self._append(values or [])
+            self.spreadsheet._touch()
+
+    def append_rows(self, rows, **kwargs):
+        self.spreadsheet.backend.call("values:append", rows)
+        with self.spreadsheet.lock, self.db:
+            self._append(rows)
+            self.spreadsheet._touch()
+
+
+def from_config(config, sheet_url):
+    """config: st.secrets 같은 dict. [storage] backend = "sheets"(기본) | "local", path, latency_ms
+    환경변수 STORAGE_BACKEND / STORAGE_PATH / STORAGE_LATENCY_MS가 있으면 그것이 우선"""
+    storage = dict(config.get("storage", {}))
+    kind = os.environ.get("STORAGE_BACKEND", storage.get("backend", "sheets"))
+    if kind == "local":
+        path = os.environ.get("STORAGE_PATH", storage.get("path", LOCAL_PATH))
+        latency_ms = float(os.environ.get("STORAGE_LATENCY_MS", storage.get("latency_ms", 0)))
+        return LocalSheetBackend(path, latency_ms / 1000)
+    if kind != "sheets": raise ValueError(f"알 수 없는 저장소 백엔드: {kind}")
+    return GSheetBackend(config["gcp_service_account"], storage.get("sheet_url", sheet_url))
@@ -0,0 +1,98 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+from book_lookup import BookLookup, MetadataCache, normalize_isbn
+
+ISBN = "9780306406157"
+
+
+class StubProviders:
+    """Google Books(/google) / Open Library(/openlib) 흉내. answers[제공처] = (상태 코드, JSON), 받은 요청을 남김"""
+
+    def __init__(self):
+        self.answers = {"google": (200, {"totalItems": 0}), "openlib": (200, {})}
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                name = url.path.strip("/")
+                stub.requests.append((name, parse_qs(url.query)))
+                status, body = stub.answers[name]
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    s = StubProviders()
+    yield s
+    s.close()
+
+
+@pytest.fixture
+def lookup(stub):
+    cache = MetadataCache(":memory:")
+    return BookLookup(cache, google_url=stub.url + "/google", openlib_url=stub.url + "/openlib", timeout=5)
+
+
+def google_hit(title):
+    return 200, {"items": [{"volumeInfo": {"title": title, "imageLinks": {"thumbnail": "http://img/g.jpg"}}}]}
+
+
+def test_google_hit_is_cached(stub, lookup):
+    stub.answers["google"] = google_hit("Dear Zoo")
+    assert lookup.lookup(ISBN) == ("Dear Zoo", "http://img/g.jpg")
+    # 늦게 온 Open Library 응답까지 기다린 뒤 닫음 (다시 물어보면 submit에서 오류)
+    lookup.pool.shutdown(wait=True)
+    assert lookup.lookup(ISBN) == ("Dear Zoo", "http://img/g.jpg")
+
+
+def test_open_library_answers_when_google_has_nothing(stub, lookup):
+    stub.answers["openlib"] = (200, {f"ISBN:{ISBN}": {"title": "Where's Spot?", "cover": {"medium": "http://img/o.jpg"}}})
+    assert lookup.lookup(ISBN) == ("Where's Spot?", "http://img/o.jpg")
+
+
+def test_isbn10_is_queried_as_isbn13(stub, lookup):
+    assert lookup.lookup("0-306-40615-2") == (None, None)
+    queries = {name: q for name, q in stub.requests}
+    assert queries["google"]["q"] == [f"isbn:{ISBN}"]
+    assert queries["openlib"]["bibkeys"] == [f"ISBN:{ISBN}"]
+    assert normalize_isbn("0-306-40615-2") == ISBN
+
+
+def test_not_found_is_cached(stub, lookup):
+    assert lookup.lookup(ISBN) == (None, None)
+    assert lookup.cache.get(ISBN) == (True, None)
+    n = len(stub.requests)
+    assert lookup.lookup(ISBN) == (None, None)
+    assert len(stub.requests) == n
+
+
+def test_not_found_with_provider_error_is_not_cached(stub, lookup):
+    stub.answers["google"] = (500, {"error": "backend"})
+    assert lookup.lookup(ISBN) == (None, None)
+    assert lookup.cache.get(ISBN) == (False, None)
+    # 다음 조회는 다시 물어봄
+    stub.answers["google"] = google_hit("Dear Zoo")
+    assert lookup.lookup(ISBN) == ("Dear Zoo", "http://img/g.jpg")
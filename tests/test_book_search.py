@@ -0,0 +1,117 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import book_readers
+import sheet_schema
+from book_search import BookIndex, normalize
+
+BOOKS = [
+    {'ID': "b1", '제목': "해리 포터와 마법사의 돌", 'ISBN': "9788983920775", '메모': "첫째가 좋아함"},
+    {'ID': "b2", '제목': "Harry Potter", 'ISBN': "0-306-40615-2", '메모': ""},
+    {'ID': "b3", '제목': "Dear Zoo", 'ISBN': "", '메모': "동물 소리 흉내"},
+    {'ID': "b4", '제목': "사과가 쿵!", 'ISBN': "9788943300067", '메모': "잠자리 책"},
+]
+
+
+def library(books):
+    """책 목록 -> (서재 표, reads 표). 메모는 첫째의 기록으로"""
+    df = pd.DataFrame(books).set_index('ID', drop=False)
+    memos = df.pop('메모')
+    reads = [sheet_schema.READ_COLS] + [[f"{b}|첫째", b, "첫째", "1", "", m] for b, m in memos.items()]
+    return df, sheet_schema.normalize_reads(reads)[0]
+
+
+def refresh(index, version, books):
+    df, reads_df = library(books)
+    return index.refresh(version, df, reads_df), df
+
+
+def found(index, df, query):
+    return df.index[index.mask(df, query)].tolist()
+
+
+@pytest.fixture
+def indexed():
+    index = BookIndex()
+    _, df = refresh(index, 1, BOOKS)
+    return index, df
+
+
+def test_title_ignores_case_width_and_spacing(indexed):
+    index, df = indexed
+    assert found(index, df, "해리포터") == ["b1"]
+    assert found(index, df, "potter") == ["b2"]
+    assert found(index, df, "ＤＥＡＲ zoo") == ["b3"]
+
+
+def test_memo_and_all_words(indexed):
+    index, df = indexed
+    assert found(index, df, "흉내") == ["b3"]
+    assert found(index, df, "해리 좋아") == ["b1"]
+    assert found(index, df, "해리 흉내") == []
+
+
+def test_isbn_matches_exactly_after_normalizing(indexed):
+    index, df = indexed
+    assert found(index, df, "978-0306406157") == ["b2"]
+    assert found(index, df, "0306406152") == ["b2"]
+    assert found(index, df, "9788983920776") == []
+
+
+def test_queries_shorter_than_three_characters(indexed):
+    index, df = indexed
+    assert found(index, df, "쿵") == ["b4"]
+    assert found(index, df, "z") == ["b3"]
+    assert found(index, df, "돌") == ["b1"]
+    assert found(index, df, "사과") == ["b4"]
+    assert found(index, df, "과사") == []
+
+
+def test_edit_is_picked_up_incrementally():
+    # 바뀐 행이 적어야 다시 만들지 않고 고친 행만 색인함
+    books = BOOKS + [{'ID': f"f{i}", '제목': f"그림책 {i}", 'ISBN': "", '메모': ""} for i in range(50)]
+    index = BookIndex()
+    refresh(index, 1, books)
+    books = [dict(b) for b in books]
+    books[2]['제목'] = "Brown Bear"
+    n, df = refresh(index, 2, books + [{'ID': "b5", '제목': "구름빵", 'ISBN': "", '메모': ""}])
+    assert n == 2
+    assert found(index, df, "zoo") == []
+    assert found(index, df, "bear") == ["b3"]
+    assert found(index, df, "구름") == ["b5"]
+    # 같은 버전이면 다시 보지 않음
+    assert refresh(index, 2, books)[0] == 0
+
+
+def test_delete_rebuilds_and_keeps_rows_aligned(indexed):
+    index, _ = indexed
+    n, df = refresh(index, 2, [BOOKS[0], BOOKS[2], BOOKS[3]])
+    assert n == 3
+    assert found(index, df, "potter") == []
+    assert found(index, df, "잠자리") == ["b4"]
+
+
+def test_mask_on_other_frame_matches_by_id(indexed):
+    index, _ = indexed
+    other, _ = library([BOOKS[3], BOOKS[1]])
+    assert other.index[index.mask(other, "potter")].tolist() == ["b2"]
+
+
+def test_same_result_as_substring_filter():
+    rng = random.Random(7)
+    chars = "가나다라마바사아자 해리포터abcXYZ"
+    books = [{'ID': f"b{i}", '제목': "".join(rng.choice(chars) for _ in range(rng.randint(0, 12))),
+              'ISBN': "", '메모': "".join(rng.choice(chars) for _ in range(rng.randint(0, 6)))} for i in range(300)]
+    index = BookIndex()
+    df, reads_df = library(books)
+    index.refresh(1, df, reads_df)
+    titles, memos = normalize(df['제목']), normalize(book_readers.memo_text(reads_df, df.index))
+    queries = ["가", "해리", "포터", "abc", "x", "Z가", "나다라", "해리포터", "없는말"]
+    queries += [b['제목'][i:i + n] for b in books[:40] for i, n in [(rng.randint(0, 5), rng.randint(1, 4))] if b['제목'][i:i + n].strip()]
+    for q in queries:
+        term = normalize(pd.Series([q])).iat[0]
+        expected = (titles.str.contains(term, regex=False) | memos.str.contains(term, regex=False)).to_numpy()
+        assert np.array_equal(index.mask(df, q), expected), q
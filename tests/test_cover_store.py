@@ -0,0 +1,81 @@
+import time
+from io import BytesIO
+
+import pytest
+import requests
+from PIL import Image
+
+from cover_store import CoverStore
+
+DEAD = "http://img.example/dead.jpg"
+GOOD = "http://img.example/good.jpg"
+
+
+def png(width=400, height=560):
+    buf = BytesIO()
+    Image.new("RGB", (width, height), (200, 50, 50)).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class StubSession:
+    """URL -> (상태 코드, 내용) 또는 예외. 받은 요청을 남김"""
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.requested = []
+
+    def get(self, url, timeout=None):
+        self.requested.append(url)
+        answer = self.answers[url]
+        if isinstance(answer, Exception): raise answer
+        r = requests.Response()
+        r.status_code, r._content = answer
+        return r
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def covers(tmp_path):
+    clock = FakeClock()
+    store = CoverStore(str(tmp_path), fail_ttl=60, clock=clock)
+    store.session = StubSession({DEAD: (404, b""), GOOD: (200, png()), "http://img.example/slow.jpg": requests.Timeout()})
+    yield store, clock
+    store.pool.shutdown(wait=True)
+
+
+def prefetch(store, urls):
+    store.prefetch(urls)
+    while True:
+        with store.lock:
+            if not store.inflight: return
+        time.sleep(0.01)
+
+
+def test_thumbnail_is_saved_once(covers):
+    store, _ = covers
+    prefetch(store, [GOOD])
+    prefetch(store, [GOOD])
+    assert store.session.requested == [GOOD]
+    assert store.get(GOOD) == store.path_for(GOOD)
+    assert Image.open(store.path_for(GOOD)).width == store.width
+
+
+def test_failed_urls_are_not_requested_again_until_ttl(covers):
+    store, clock = covers
+    slow = "http://img.example/slow.jpg"
+    prefetch(store, [DEAD, slow])
+    clock.now += 30
+    prefetch(store, [DEAD, slow])
+    assert store.get(DEAD) == DEAD
+    assert sorted(store.session.requested) == sorted([DEAD, slow])
+    # 시간이 지나면 다시 시도
+    clock.now += 31
+    prefetch(store, [DEAD])
+    assert store.session.requested.count(DEAD) == 2
@@ -0,0 +1,59 @@
+import pandas as pd
+
+from app_core import frame_version
+from frame_snapshot import FrameSnapshot
+from local_store import LocalStore
+from sheet_schema import with_id_index
+
+NAMES = ["books", "board", "stats"]
+
+
+def frames():
+    books = with_id_index(pd.DataFrame({'ID': ["b1", "b2"], '제목': ["A", "B"], '레벨': [1, 2]}))
+    board = with_id_index(pd.DataFrame({'ID': ["p1"], '내용': ["안녕"]}))
+    stats = with_id_index(pd.DataFrame({'ID': ["전체||첫째"], '권수': [1]}))
+    return {"books": books, "board": board, "stats": stats}
+
+
+def versions(store):
+    return {name: frame_version(store, name) for name in NAMES}
+
+
+def test_same_version_reads_frames_back(tmp_path):
+    snap = FrameSnapshot(str(tmp_path))
+    snap.save({"books": 3, "board": 3}, {n: frames()[n] for n in ("books", "board")})
+    got = snap.load({"books": 3})
+    assert list(got) == ["books"]
+    pd.testing.assert_frame_equal(got["books"], frames()["books"])
+
+
+def test_missing_or_broken_snapshot_is_ignored(tmp_path):
+    snap = FrameSnapshot(str(tmp_path))
+    assert snap.load({"books": 0}) == {}
+    snap.save({"books": 1, "board": 1}, {n: frames()[n] for n in ("books", "board")})
+    (tmp_path / "books.parquet").write_bytes(b"not parquet")
+    assert list(snap.load({"books": 1, "board": 1})) == ["board"]
+
+
+def test_table_version_bump_rejects_only_that_frame(tmp_path):
+    store = LocalStore(str(tmp_path / "store.db"))
+    snap = FrameSnapshot(str(tmp_path / "frames"))
+    snap.save(versions(store), frames())
+    assert sorted(snap.load(versions(store))) == sorted(NAMES)
+    store.compare_and_set("books", {"b3": (None, {'ID': "b3", '제목': "C"})})
+    assert sorted(snap.load(versions(store))) == ["board", "stats"]
+    # 집계 화면은 아직 올리지 않은 로그도 보여 주므로 로그가 늘면 다시 만듦
+    store.add_logs([["2025-01-01", "b1", "A", 1, "첫째"]])
+    assert list(snap.load(versions(store))) == ["board"]
+
+
+def test_other_store_with_same_version_numbers_is_rejected(tmp_path):
+    snap = FrameSnapshot(str(tmp_path / "frames"))
+    store = LocalStore(str(tmp_path / "a.db"))
+    snap.save(versions(store), frames())
+    # 같은 파일을 다시 열면 그대로 씀
+    assert sorted(snap.load(versions(LocalStore(str(tmp_path / "a.db"))))) == sorted(NAMES)
+    # 저장소 파일을 새로 만들면 버전 번호는 같아도 (모두 0) 쓰지 않음
+    other = LocalStore(str(tmp_path / "b.db"))
+    assert [v[1:] for v in versions(other).values()] == [v[1:] for v in versions(store).values()]
+    assert snap.load(versions(other)) == {}
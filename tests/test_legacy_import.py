@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+
+import legacy_import
+from local_store import LocalStore
+
+BOOKS = "ID,제목,ISBN,레벨,읽은횟수\nb1,A,,1,0\nb2,B,,1,0\n".encode()
+LOGS = "날짜,책ID,제목,레벨,누가\n2025-01-03,b1,A,1,첫째\n2025-01-03,b1,A,1,첫째\n2025-01-04,b2,B,1,둘째\n".encode()
+
+
+def count(store, rid):
+    return int(store.get_row("reads", rid)[1]['횟수'])
+
+
+@pytest.fixture
+def store():
+    return LocalStore(":memory:")
+
+
+def test_logs_are_queued_and_counted(store):
+    state = legacy_import.run(store, BOOKS, LOGS)
+    assert (state["books_new"], state["logs"], state["logs_skipped"], state["logs_orphan"]) == (2, 3, 0, 0)
+    assert len(store.unpushed_logs()[1]) == 3
+    assert (count(store, "b1|첫째"), count(store, "b2|둘째")) == (2, 1)
+    # 같은 파일을 다시 가져오면 아무것도 하지 않음
+    assert legacy_import.run(store, BOOKS, LOGS) == state
+    assert len(store.unpushed_logs()[1]) == 3
+
+
+def test_books_merge_by_isbn_and_old_counts_fill_the_gap(store):
+    store.compare_and_set("books", {"x1": (None, {'ID': "x1", '제목': "A", 'ISBN': "9780306406157"})})
+    books = "ID,제목,ISBN,레벨,읽은횟수\nb1,A,0-306-40615-2,1,5\n".encode()
+    logs = "날짜,책ID,제목,레벨\n2025-01-03,b1,A,1\n2025-01-03,zz,Z,1\n".encode()
+    state = legacy_import.run(store, books, logs)
+    assert (state["books_new"], state["books_merged"], state["logs_orphan"]) == (0, 1, 1)
+    assert store.get_row("books", "b1") == (None, None)
+    # 로그로 센 1번에 예전 읽은횟수 5가 되도록 4를 기본 독자(첫째)에게
+    assert (count(store, "x1|첫째"), state["counts_fixed"]) == (5, 4)
+
+
+def test_edited_file_adds_only_new_rows(store):
+    state = legacy_import.run(store, BOOKS, LOGS)
+    assert (state["logs"], state["logs_skipped"]) == (3, 0)
+    # 같은 기록에 몇 줄 더한 파일 (지문이 달라 처음부터 다시 가져옴)
+    state = legacy_import.run(store, None, LOGS + "2025-01-03,b1,A,1,첫째\n2025-01-05,b2,B,1,둘째\n".encode())
+    assert (state["logs"], state["logs_skipped"]) == (2, 3)
+    assert len(store.unpushed_logs()[1]) == 5
+    assert (count(store, "b1|첫째"), count(store, "b2|둘째")) == (3, 2)
+
+
+def test_logs_already_on_sheet_are_skipped(store):
+    existing = pd.DataFrame({'날짜': pd.to_datetime(["2025-01-03"]), '책ID': ["b1"], '제목': ["A"], '레벨': [1], '누가': ["첫째"]})
+    state = legacy_import.run(store, BOOKS, LOGS, existing=existing)
+    assert (state["logs"], state["logs_skipped"]) == (2, 1)
+    assert count(store, "b1|첫째") == 1
+
+
+def test_resume_does_not_skip_or_repeat(store, monkeypatch):
+    monkeypatch.setattr(legacy_import.chunks, "__defaults__", (0, 1))   # 한 줄씩 묶어서 중간에 멈춤
+
+    def stop(phase, n):
+        if phase == "logs" and n == 2: raise KeyboardInterrupt
+    with pytest.raises(KeyboardInterrupt):
+        legacy_import.LegacyImport(store, BOOKS, LOGS, on_progress=stop).run()
+    assert len(store.unpushed_logs()[1]) == 2
+    state = legacy_import.run(store, BOOKS, LOGS)
+    assert (state["logs"], state["logs_skipped"]) == (3, 0)
+    assert len(store.unpushed_logs()[1]) == 3
+    assert (count(store, "b1|첫째"), count(store, "b2|둘째")) == (2, 1)
@@ -0,0 +1,86 @@
+import pytest
+
+from local_store import LocalStore
+
+
+@pytest.fixture
+def store():
+    s = LocalStore(":memory:")
+    s.compare_and_set("books", {"b1": (None, {'ID': "b1", '읽은횟수': "1"})})
+    return s
+
+
+def count(store, rid="b1"):
+    return int(store.get_row("books", rid)[1]['읽은횟수'])
+
+
+def test_cas_applies_when_version_matches(store):
+    ver, _ = store.get_row("books", "b1")
+    assert store.compare_and_set("books", {"b1": (ver, {'읽은횟수': "2"})}) == {}
+    assert store.get_row("books", "b1") == (ver + 1, {'ID': "b1", '읽은횟수': "2"})
+
+
+def test_cas_stale_version_conflicts_and_writes_nothing(store):
+    ver, _ = store.get_row("books", "b1")
+    store.compare_and_set("books", {"b1": (ver, {'읽은횟수': "5"})})
+    conflicts = store.compare_and_set("books", {"b1": (ver, {'읽은횟수': "2"}),
+                                                "b2": (None, {'ID': "b2", '읽은횟수': "1"})})
+    # 충돌한 행은 지금 버전 / 지금 행을 돌려주고, 충돌하지 않은 행만 반영
+    assert conflicts == {"b1": (ver + 1, {'ID': "b1", '읽은횟수': "5"})}
+    assert count(store) == 5
+    assert count(store, "b2") == 1
+
+
+def test_cas_new_row_conflicts_when_it_already_exists(store):
+    ver, row = store.get_row("books", "b1")
+    assert store.compare_and_set("books", {"b1": (None, {'ID': "b1", '읽은횟수': "9"})}) == {"b1": (ver, row)}
+    assert count(store) == 1
+
+
+def test_cas_delete_and_deleted_row_conflict(store):
+    ver, _ = store.get_row("books", "b1")
+    assert store.compare_and_set("books", {"b1": (ver, None)}) == {}
+    assert store.get_row("books", "b1") == (None, None)
+    assert store.compare_and_set("books", {"b1": (ver, {'읽은횟수': "2"})}) == {"b1": (None, None)}
+
+
+def test_update_rows_retries_on_current_row(store):
+    ver, _ = store.get_row("books", "b1")
+    store.compare_and_set("books", {"b1": (ver, {'읽은횟수': "4"})})   # 그 사이 다른 세션이 고침
+    add_one = lambda rid, cur, values: {'읽은횟수': str(int(cur['읽은횟수']) + 1)}
+    assert store.update_rows("books", {"b1": (ver, {'읽은횟수': "2"})}, add_one) == []
+    assert count(store) == 5
+
+
+def test_update_rows_gives_up_when_resolve_returns_false(store):
+    ver, _ = store.get_row("books", "b1")
+    store.compare_and_set("books", {"b1": (ver, None)})
+    skip_deleted = lambda rid, cur, values: False if cur is None else values
+    assert store.update_rows("books", {"b1": (ver, {'읽은횟수': "2"})}, skip_deleted) == ["b1"]
+    assert store.get_row("books", "b1") == (None, None)
+
+
+def test_update_rows_stops_after_retries(store):
+    calls = []
+
+    def always_behind(rid, cur, values):
+        # 다시 쓰기 전에 또 다른 곳에서 고쳐서 매번 충돌
+        calls.append(rid)
+        ver, _ = store.get_row("books", rid)
+        store.compare_and_set("books", {rid: (ver, {'읽은횟수': str(int(cur['읽은횟수']) + 10)})})
+        return values
+
+    ver, _ = store.get_row("books", "b1")
+    store.compare_and_set("books", {"b1": (ver, {'읽은횟수': "2"})})
+    assert store.update_rows("books", {"b1": (ver, {'읽은횟수': "3"})}, always_behind, retries=2) == ["b1"]
+    assert len(calls) == 3
+    assert count(store) == 32  # 3은 한 번도 쓰지 못함
+
+
+def test_writes_are_journaled_and_bump_only_their_table(store):
+    books, board = store.version("books"), store.version("board")
+    ver, _ = store.get_row("books", "b1")
+    store.compare_and_set("books", {"b1": (ver, {'읽은횟수': "2"})})
+    assert (store.version("books"), store.version("board")) == (books + 1, board)
+    upto, fields, deletes = store.pending_changes("books")
+    assert fields["b1"]['읽은횟수'][0] == "2" and not deletes
@@ -0,0 +1,89 @@
+import pytest
+import requests
+
+import app_core
+import sheet_schema
+from app_core import SheetRemote, get_sheet_snapshots
+from local_store import LocalStore, SyncEngine
+from sheet_schema import LOG_COLS, STATS_COLS
+from storage_backend import LocalSheetBackend
+
+LOGS = [["2025-01-01", "b1", "A", 1, "첫째"], ["2025-01-01", "b2", "B", 1, "첫째"], ["2025-01-02", "b1", "A", 1, "둘째"]]
+
+
+@pytest.fixture
+def sheet(monkeypatch):
+    """logs / stats 머리글만 있는 로컬 시트를 app_core가 쓰도록"""
+    get_sheet_snapshots.clear()
+    sheet = LocalSheetBackend(":memory:").open()
+    sheet.load_rows("logs", [LOG_COLS])
+    sheet.load_rows("stats", [STATS_COLS])
+    wss = {w.title: w for w in sheet.worksheets()}
+    monkeypatch.setattr(app_core, "get_spreadsheet", lambda: sheet)
+    monkeypatch.setattr(app_core, "get_worksheets", lambda: wss)
+    yield sheet
+    get_sheet_snapshots.clear()
+
+
+@pytest.fixture
+def engine():
+    store = LocalStore(":memory:")
+    return SyncEngine(store, SheetRemote(), tables=(), derived=())
+
+
+def fail_batch_update(sheet, monkeypatch, applied):
+    """다음 batch_update 한 번을 실패시킴. applied면 시트에는 반영하고 응답만 잃어버림"""
+    real = sheet.batch_update
+
+    def lost(body):
+        monkeypatch.setattr(sheet, "batch_update", real)
+        if applied: real(body)
+        raise requests.ConnectionError("응답 끊김")
+    monkeypatch.setattr(sheet, "batch_update", lost)
+
+
+def sheet_logs(sheet):
+    return sheet.worksheet("logs").get_all_values()[1:]
+
+
+def sheet_counts(sheet):
+    stats_df, _ = sheet_schema.normalize_stats(sheet.worksheet("stats").get_all_values())
+    return {rid: int(n) for rid, n in stats_df['권수'].items()}
+
+
+def test_logs_carry_their_record_id(sheet, engine):
+    engine.store.add_logs(LOGS)
+    engine.sync_once()
+    ids = [r[sheet_schema.LOG_ID_POS] for r in sheet_logs(sheet)]
+    assert ids == [f"{engine.store.uid}:{seq}" for seq in (1, 2, 3)]
+    assert sheet_counts(sheet)["전체||첫째"] == 2
+
+
+def test_lost_response_does_not_append_twice(sheet, engine, monkeypatch):
+    engine.store.add_logs(LOGS)
+    fail_batch_update(sheet, monkeypatch, applied=True)
+    with pytest.raises(requests.ConnectionError):
+        engine.sync_once()
+    assert len(sheet_logs(sheet)) == 3 and engine.store.pending() == 3
+    # 그 사이 새 로그가 하나 더 생김: 그것만 붙이고 세어야 함
+    engine.store.add_logs([["2025-01-03", "b3", "C", 1, "첫째"]])
+    engine.sync_once()
+    assert [r[:2] for r in sheet_logs(sheet)] == [r[:2] for r in LOGS] + [["2025-01-03", "b3"]]
+    assert sheet_counts(sheet)["전체||첫째"] == 3
+    assert sheet_counts(sheet)["일|2025-01-01|첫째"] == 2
+    assert engine.store.pending() == 0
+    # 로컬 집계도 이미 붙어 있던 로그까지 포함
+    assert engine.store.get_row("stats", "전체||첫째")[1]['권수'] == "3"
+
+
+def test_failed_push_that_was_not_applied_is_sent_again(sheet, engine, monkeypatch):
+    engine.store.add_logs(LOGS)
+    fail_batch_update(sheet, monkeypatch, applied=False)
+    with pytest.raises(requests.ConnectionError):
+        engine.sync_once()
+    assert sheet_logs(sheet) == []
+    engine.sync_once()
+    assert len(sheet_logs(sheet)) == 3
+    assert sheet_counts(sheet)["전체||첫째"] == 2
+    # 확인이 끝나면 다음 로그는 시트를 다시 읽지 않고 바로 붙임
+    assert engine.store.get_meta("logs_sent") is None
@@ -0,0 +1,83 @@
+from datetime import datetime
+
+import pandas as pd
+
+import reading_stats
+from sheet_schema import LOG_COLS
+
+LOGS = [
+    ["2024-12-31", "b1", "A", 1, "첫째"],
+    ["2025-01-01", "b1", "A", 1, "첫째"],
+    ["2025-01-01", "b2", "B", 2, "첫째"],
+    ["2025-01-01", "b2", "B", 2, "둘째"],
+    ["2025-02-10", "b3", "C", 1, "둘째"],
+    ["날짜 아님", "b3", "C", 1, "첫째"],
+]
+
+
+def counts(stats_df):
+    return {rid: int(n) for rid, n in stats_df['권수'].items()}
+
+
+def test_count_logs_rolls_up_days_months_and_readers():
+    got = counts(reading_stats.count_logs(LOGS))
+    assert got == {
+        "일|2024-12-31|첫째": 1, "일|2025-01-01|첫째": 2, "일|2025-01-01|둘째": 1, "일|2025-02-10|둘째": 1,
+        "월|2024-12|첫째": 1, "월|2025-01|첫째": 2, "월|2025-01|둘째": 1, "월|2025-02|둘째": 1,
+        # 날짜를 읽을 수 없는 로그는 아이별 누적에만
+        "전체||첫째": 4, "전체||둘째": 2,
+    }
+
+
+def test_apply_logs_in_batches_matches_build_from_scratch():
+    full = reading_stats.build(pd.DataFrame(LOGS, columns=LOG_COLS))
+    stats = reading_stats.empty()
+    for batch in (LOGS[:1], LOGS[1:4], [], LOGS[4:]):
+        stats = reading_stats.apply_logs(stats, batch)
+    assert counts(stats) == counts(full)
+    assert reading_stats.total(stats) == len(LOGS)
+
+
+def test_apply_logs_keeps_existing_rows_in_place():
+    stats = reading_stats.build(pd.DataFrame(LOGS[:2], columns=LOG_COLS))
+    out = reading_stats.apply_logs(stats, [["2025-01-01", "b9", "Z", 1, "첫째"], ["2025-03-01", "b9", "Z", 1, "셋째"]])
+    assert out.index[:len(stats)].tolist() == stats.index.tolist()
+    assert counts(out)["일|2025-01-01|첫째"] == 2
+    assert counts(out)["전체||셋째"] == 1
+
+
+def test_split_archive_respects_cutoff_and_years():
+    header = LOG_COLS
+    rows = [
+        ["2023-06-01", "b1", "A", "1", "첫째"],
+        ["2024-12-31", "b1", "A", "1", "첫째"],
+        ["2025-01-01", "b2", "B", "1", "첫째"],
+        ["2025-03-15", "b2", "B", "1", "둘째"],
+        ["", "b3", "C", "1", "둘째"],
+    ]
+    # 2025-03 기준 최근 3달 (1월~3월)은 남기고, 이전 달은 연도별 시트로
+    keep, moved, gone = reading_stats.split_archive([header] + rows, 3, datetime(2025, 3, 20))
+    assert keep == [header, rows[2], rows[3], rows[4]]
+    assert moved == {"logs_2023": [rows[0]], "logs_2024": [rows[1]]}
+    # 지울 위치는 머리글을 뺀 데이터 행 기준
+    assert gone == [0, 1]
+
+
+def test_split_archive_without_old_rows_moves_nothing():
+    raw = [LOG_COLS, ["2025-03-01", "b1", "A", "1", "첫째"]]
+    assert reading_stats.split_archive(raw, 1, datetime(2025, 3, 2)) == (raw, {}, [])
+    assert reading_stats.split_archive([LOG_COLS], 1, datetime(2025, 3, 2)) == ([LOG_COLS], {}, [])
+
+
+def test_dates_in_other_formats_are_still_counted():
+    # 첫 행의 형식으로 나머지를 읽으면 시각이 붙은 행 / 예전 CSV 형식이 빠짐
+    logs = [["2025-01-01", "b1", "A", 1, "첫째"], ["2025-01-01 19:30", "b2", "B", 1, "첫째"], ["2025/01/02", "b3", "C", 1, "첫째"]]
+    got = counts(reading_stats.count_logs(logs))
+    assert got["일|2025-01-01|첫째"] == 2 and got["일|2025-01-02|첫째"] == 1
+    assert got["월|2025-01|첫째"] == 3
+
+
+def test_split_archive_reads_dates_with_times():
+    raw = [LOG_COLS, ["2025-03-01", "b1", "A", "1", "첫째"], ["2024-05-01 08:00", "b2", "B", "1", "첫째"]]
+    keep, moved, gone = reading_stats.split_archive(raw, 1, datetime(2025, 3, 2))
+    assert moved == {"logs_2024": [raw[2]]} and gone == [1]
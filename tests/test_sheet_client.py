@@ -0,0 +1,148 @@
+import json
+
+import pytest
+import requests
+from gspread.exceptions import APIError
+
+from sheet_client import TokenBucket, ThrottledHTTPClient, operation
+
+SHEET = "https://sheets.googleapis.com/v4/spreadsheets/abc"
+
+
+class FakeClock:
+    """TokenBucket에 넣는 시계와 sleep (sleep하면 그만큼 시간이 감)"""
+
+    def __init__(self):
+        self.now = 100.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, s):
+        self.slept.append(s)
+        self.now += s
+
+
+def response(code, body=None):
+    r = requests.Response()
+    r.status_code = code
+    r._content = json.dumps(body or {"error": {"code": code, "message": "stub", "status": "STUB"}}).encode()
+    return r
+
+
+class StubSession:
+    """codes 순서대로 응답하고 받은 요청을 남김 (다 쓰면 200)"""
+
+    def __init__(self, *codes):
+        self.codes = list(codes)
+        self.sent = []
+
+    def request(self, method, url, json=None, **kwargs):
+        self.sent.append((method, url, json))
+        return response(self.codes.pop(0) if self.codes else 200, {})
+
+
+def client(*codes):
+    slept = []
+    c = ThrottledHTTPClient(None, session=StubSession(*codes), max_retries=3, sleep=slept.append)
+    return c, c.session, slept
+
+
+def test_bucket_allows_burst_then_refills_at_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(70, burst=10, clock=clock, sleep=clock.sleep)
+    assert [bucket.acquire() for _ in range(10)] == [0.0] * 10
+    # 11번째는 토큰 하나가 찰 때까지 (분당 60개 -> 1초) 기다림
+    assert bucket.acquire() == pytest.approx(1.0)
+    clock.now += 5
+    assert [bucket.acquire() for _ in range(5)] == [0.0] * 5
+    assert bucket.acquire() == pytest.approx(1.0)
+
+
+def test_bucket_never_exceeds_capacity():
+    clock = FakeClock()
+    bucket = TokenBucket(70, burst=3, clock=clock, sleep=clock.sleep)
+    clock.now += 3600
+    assert [bucket.acquire() for _ in range(3)] == [0.0] * 3
+    assert bucket.acquire() > 0
+
+
+def test_operation_names():
+    assert operation("GET", SHEET + "/values:batchGet") == "values:batchGet"
+    assert operation("POST", SHEET + "/values/logs!A1:append") == "values:append"
+    assert operation("POST", SHEET + ":batchUpdate") == "batchUpdate"
+    assert operation("GET", SHEET) == "get"
+
+
+def test_read_is_retried_on_5xx_and_429():
+    c, session, slept = client(500, 429, 503)
+    assert c.request("GET", SHEET + "/values:batchGet").ok
+    assert len(session.sent) == 4 and len(slept) == 3
+
+
+def test_append_is_not_retried_on_5xx():
+    c, session, _ = client(500)
+    with pytest.raises(APIError):
+        c.request("POST", SHEET + "/values/logs!A1:append", json={"values": [["x"]]})
+    assert len(session.sent) == 1
+    c, session, _ = client(502)
+    with pytest.raises(APIError):
+        c.request("POST", SHEET + ":batchUpdate", json={"requests": [{"appendCells": {"sheetId": 1, "rows": []}}]})
+    assert len(session.sent) == 1
+
+
+def batch(*kinds):
+    return {"requests": [{k: {"sheetId": 1}} for k in kinds]}
+
+
+@pytest.mark.parametrize("code", [500, 503, 408])
+@pytest.mark.parametrize("kinds", [("deleteDimension",), ("insertDimension",), ("updateCells",),
+                                   ("updateCells", "deleteDimension", "appendCells")])
+def test_positional_batch_update_is_not_retried(code, kinds):
+    # 첫 요청이 반영됐다면 다시 보낼 때 그 사이 밀린 다른 행을 지우거나 덮어씀
+    c, session, slept = client(code)
+    with pytest.raises(APIError):
+        c.request("POST", SHEET + ":batchUpdate", json=batch(*kinds))
+    assert len(session.sent) == 1 and slept == []
+
+
+def test_positional_batch_update_is_retried_on_429():
+    c, session, _ = client(429)
+    assert c.request("POST", SHEET + ":batchUpdate", json=batch("deleteDimension")).ok
+    assert len(session.sent) == 2
+
+
+@pytest.mark.parametrize("code", [500, 408])
+def test_writes_that_can_be_repeated_are_retried(code):
+    c, session, _ = client(code)
+    assert c.request("PUT", SHEET + "/values/books!A1", json={"values": [["x"]]}).ok
+    c, session2, _ = client(code)
+    assert c.request("POST", SHEET + ":batchUpdate", json=batch("updateSheetProperties")).ok
+    assert len(session.sent) == len(session2.sent) == 2
+
+
+def test_append_is_not_retried_on_408():
+    c, session, _ = client(408)
+    with pytest.raises(APIError):
+        c.request("POST", SHEET + "/values/logs!A1:append", json={"values": [["x"]]})
+    assert len(session.sent) == 1
+
+
+def test_read_is_retried_on_408():
+    c, session, _ = client(408)
+    assert c.request("GET", SHEET + "/values:batchGet").ok
+    assert len(session.sent) == 2
+
+
+def test_write_is_retried_on_429():
+    c, session, _ = client(429)
+    assert c.request("POST", SHEET + "/values/logs!A1:append", json={"values": [["x"]]}).ok
+    assert len(session.sent) == 2
+
+
+def test_client_error_is_not_retried():
+    c, session, _ = client(400)
+    with pytest.raises(APIError):
+        c.request("GET", SHEET + "/values:batchGet")
+    assert len(session.sent) == 1
@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+
+from app_core import write_sheet_delta, write_sheet_rows, get_sheet_snapshots
+from sheet_schema import with_id_index
+from storage_backend import LocalSheetBackend
+
+COLS = ['ID', '제목', '레벨']
+
+
+def frame(*rows):
+    return pd.DataFrame([list(r) for r in rows], columns=COLS)
+
+
+@pytest.fixture
+def sheet():
+    """ID a~e 다섯 행이 있는 시트 (스냅샷 포함)"""
+    get_sheet_snapshots.clear()
+    backend = LocalSheetBackend(":memory:")
+    wks = backend.open().load_rows("books", [COLS] + [[c, c.upper(), "1"] for c in "abcde"])
+    get_sheet_snapshots()["books"] = with_id_index(frame(*[[c, c.upper(), "1"] for c in "abcde"]))
+    yield backend, wks
+    get_sheet_snapshots.clear()
+
+
+def calls(backend):
+    return {op: row["calls"] for op, row in backend.api_stats().items()}
+
+
+def test_delete_edit_and_append_in_one_batch_update(sheet):
+    backend, wks = sheet
+    # b, d 삭제 (떨어진 두 행) / c 제목 수정 / f 추가
+    write_sheet_delta(wks, frame(["a", "A", "1"], ["c", "C2", "1"], ["e", "E", "1"], ["f", "F", "2"]))
+    assert calls(backend) == {"batchUpdate": 1}
+    assert wks.get_all_values() == [COLS, ["a", "A", "1"], ["c", "C2", "1"], ["e", "E", "1"], ["f", "F", "2"]]
+    assert get_sheet_snapshots()["books"].index.tolist() == ["a", "c", "e", "f"]
+
+
+def test_only_changed_cells_are_sent(sheet):
+    backend, wks = sheet
+    rows = [[c, c.upper(), "1"] for c in "abcde"]
+    rows[3][2] = "4"
+    write_sheet_delta(wks, frame(*rows))
+    # 그대로면 요청을 보내지 않음
+    write_sheet_delta(wks, frame(*rows))
+    assert calls(backend) == {"batchUpdate": 1}
+    assert backend.api_stats()["batchUpdate"]["bytes"] < 300
+    assert wks.get_all_values()[4] == ["d", "D", "4"]
+
+
+def test_deleting_every_row_rewrites_sheet(sheet):
+    backend, wks = sheet
+    write_sheet_delta(wks, frame(["x", "X", "1"]))
+    assert "values.update" in calls(backend)
+    assert wks.get_all_values() == [COLS, ["x", "X", "1"]]
+
+
+def test_write_sheet_rows_touches_only_given_rows(sheet):
+    backend, wks = sheet
+    write_sheet_rows(wks, frame(["c", "C2", "1"], ["g", "G", "3"]), deleted=["a", "e"])
+    assert calls(backend) == {"batchUpdate": 1}
+    assert wks.get_all_values() == [COLS, ["b", "B", "1"], ["c", "C2", "1"], ["d", "D", "1"], ["g", "G", "3"]]
+    assert get_sheet_snapshots()["books"].index.tolist() == ["b", "c", "d", "g"]
@@ -0,0 +1,90 @@
+import sheet_schema
+from sheet_schema import BOOK_COLS, READ_COLS, STAR_OPTIONS
+
+WIDE = BOOK_COLS + ['횟수_첫째', '반응_첫째', '메모_첫째', '횟수_둘째', '반응_둘째', '메모_둘째']
+
+
+def wide(*rows):
+    return [WIDE] + [list(r) for r in rows]
+
+
+def reads_by_id(reads_raw):
+    assert reads_raw[0] == READ_COLS
+    return {r[0]: dict(zip(READ_COLS, r)) for r in reads_raw[1:]}
+
+
+def test_wide_rows_become_books_and_reads():
+    books, reads = sheet_schema.split_wide_books(wide(
+        ["b1", "A", "", "2", "", "", "3", "⭐⭐", "밤마다", "1", "", ""],
+        ["b2", "B", "", "1", "", "", "0", "", "", "", "", ""],
+    ))
+    assert books == [BOOK_COLS, ["b1", "A", "", "2", "", ""], ["b2", "B", "", "1", "", ""]]
+    got = reads_by_id(reads)
+    # 읽은 적도 별점/메모도 없는 조합 (b1 둘째는 1번 읽음, b2는 아무도 안 읽음)은 행이 없음
+    assert sorted(got) == ["b1|둘째", "b1|첫째"]
+    assert got["b1|첫째"] == {'ID': "b1|첫째", '책ID': "b1", '독자ID': "첫째", '횟수': "3", '반응': "⭐⭐", '메모': "밤마다"}
+    assert got["b1|둘째"]['횟수'] == "1"
+
+
+def test_reaction_or_memo_alone_keeps_the_row():
+    _, reads = sheet_schema.split_wide_books(wide(
+        ["b1", "A", "", "1", "", "", "0", "⭐", "", "", "", " 좋아함"],
+        ["b2", "B", "", "1", "", "", "", STAR_OPTIONS[0], "", "x", "", ""],
+    ))
+    got = reads_by_id(reads)
+    assert sorted(got) == ["b1|둘째", "b1|첫째"]
+    assert (got["b1|첫째"]['반응'], got["b1|둘째"]['메모']) == ("⭐", "좋아함")
+    # 숫자가 아닌 횟수는 0으로 봄
+    assert "b2|둘째" not in got
+
+
+def test_empty_ids_are_filled_once_for_both_tables():
+    books, reads = sheet_schema.split_wide_books(wide(["", "A", "", "1", "", "", "2", "", "", "", "", ""],
+                                                      ["b2", "B", "", "1", "", "", "1", "", "", "", "", ""]))
+    book_id = books[1][0]
+    assert book_id and book_id != "b2"
+    assert [r[1] for r in reads[1:]] == [book_id, "b2"]
+
+
+def test_normalize_fills_missing_ids():
+    df, filled, exact = sheet_schema.normalize_books([BOOK_COLS, ["", "A", "", "1", "", ""], ["b2", "B", "", "1", "", ""]])
+    assert filled and not exact
+    assert df.index[1] == "b2" and len(df.index[0]) == 36
+    df, filled, _ = sheet_schema.normalize_board([sheet_schema.BOARD_COLS, [" ", "2025-01-01", "글", "", "", ""]])
+    assert filled and df.index[0].strip()
+
+
+def test_long_format_is_left_alone():
+    raw = [BOOK_COLS, ["b1", "A", "", "1", "", ""]]
+    assert sheet_schema.split_wide_books(raw) == (raw, None)
+    assert sheet_schema.split_wide_books([]) == ([], None)
+
+
+def test_migration_fills_empty_reads_sheet():
+    raw = {"books": wide(["b1", "A", "", "1", "", "", "2", "", "", "", "", ""]), "reads": [READ_COLS]}
+    assert sheet_schema.migrate_wide_books(raw) == {"books", "reads"}
+    assert raw["books"][0] == BOOK_COLS
+    assert list(reads_by_id(raw["reads"])) == ["b1|첫째"]
+
+
+def test_migration_keeps_reads_that_already_have_data():
+    existing = [READ_COLS, ["b1|첫째", "b1", "첫째", "7", "", ""]]
+    raw = {"books": wide(["b1", "A", "", "1", "", "", "2", "", "", "", "", ""]), "reads": existing}
+    # 예전 열은 books에서 빼지만 reads 시트의 기록은 덮어쓰지 않음
+    assert sheet_schema.migrate_wide_books(raw) == {"books"}
+    assert raw["books"][0] == BOOK_COLS
+    assert raw["reads"] is existing
+
+
+def test_migration_without_wide_columns_changes_nothing():
+    raw = {"books": [BOOK_COLS, ["b1", "A", "", "1", "", ""]]}
+    assert sheet_schema.migrate_wide_books(raw) == set()
+    assert "reads" not in raw
+    assert sheet_schema.migrate_wide_books({"board": []}) == set()
+
+
+def test_normalize_logs_reads_mixed_date_formats():
+    df = sheet_schema.normalize_logs([sheet_schema.LOG_COLS, ["2025-01-01", "b1", "A", "1", "첫째"],
+                                      ["2025-01-01 19:30", "b1", "A", "1", "첫째"], ["어제", "b1", "A", "1", "첫째"]])
+    assert df['날짜'].dt.strftime("%Y-%m-%d").tolist()[:2] == ["2025-01-01", "2025-01-01"]
+    assert df['날짜'].isna().tolist() == [False, False, True]
@@ -0,0 +1,215 @@
+import time
+
+import pytest
+
+from local_store import LocalStore, SyncEngine, merge
+
+
+class FakeRemote:
+    """시트 대신 메모리의 표 {표: {ID: 행}}. 고칠 때마다 수정 표시가 바뀌고, 가져온 횟수 / 올린 행을 남김"""
+
+    def __init__(self, tables):
+        self.tables = {t: {rid: dict(r) for rid, r in rows.items()} for t, rows in tables.items()}
+        self.rev = 0
+        self.pulls = 0
+        self.pushed = []
+        self.logs = []
+
+    # --- 다른 곳에서 시트를 고침 ---
+    def edit(self, tbl, rid, **values):
+        self.tables[tbl][rid].update(values)
+        self.rev += 1
+
+    def delete(self, tbl, rid):
+        del self.tables[tbl][rid]
+        self.rev += 1
+
+    # --- SyncEngine이 쓰는 것 ---
+    def revision(self):
+        return self.rev
+
+    def pull(self, tables):
+        self.pulls += 1
+        return {t: ({rid: dict(r) for rid, r in self.tables.get(t, {}).items()}, False) for t in tables}
+
+    def push(self, tbl, rows, deleted=()):
+        self.pushed.append((tbl, sorted(rows), sorted(deleted)))
+        t = self.tables.setdefault(tbl, {})
+        for rid in deleted: t.pop(rid, None)
+        for rid, r in rows.items(): t[rid] = dict(r)
+        self.rev += 1
+
+    def replace(self, tbl, rows):
+        self.tables[tbl] = {rid: dict(r) for rid, r in rows.items()}
+        self.rev += 1
+
+    def push_logs(self, logs, ids, unsure=False):
+        self.logs += logs
+        self.rev += 1
+        return {}
+
+
+COLS = ['ID', '제목', '레벨']
+
+
+def book(rid, title, level="1"):
+    return dict(zip(COLS, (rid, title, level)))
+
+
+@pytest.fixture
+def synced():
+    """한 번 맞춘 상태의 (저장소, 가짜 시트, 동기화)"""
+    remote = FakeRemote({"books": {"b1": book("b1", "A"), "b2": book("b2", "B"), "b3": book("b3", "C")}})
+    store = LocalStore(":memory:")
+    engine = SyncEngine(store, remote, tables=("books",), derived=())
+    engine.sync_once()
+    remote.pushed.clear()
+    return store, remote, engine
+
+
+def local_rows(store):
+    return {r[0]: dict(zip(COLS, r)) for r in store.read_raw("books", COLS)[1:]}
+
+
+def test_first_sync_copies_sheet(synced):
+    store, remote, _ = synced
+    assert local_rows(store) == remote.tables["books"]
+    assert store.pending() == 0
+
+
+def test_unchanged_sheet_is_not_pulled_and_only_the_edited_row_is_pushed(synced):
+    store, remote, engine = synced
+    ver, _ = store.get_row("books", "b2")
+    assert store.compare_and_set("books", {"b2": (ver, {'제목': "B2"})}) == {}
+    engine.sync_once()
+    assert remote.pulls == 1
+    assert remote.pushed == [("books", ["b2"], [])]
+    assert remote.tables["books"]["b2"] == book("b2", "B2")
+    assert store.pending() == 0
+    # 바뀐 것이 없으면 가져오지도 올리지도 않음
+    assert engine.sync_once() is False
+    assert remote.pulls == 1 and len(remote.pushed) == 1
+
+
+def test_remote_and_local_edits_to_different_fields_both_survive(synced):
+    store, remote, engine = synced
+    remote.edit("books", "b1", 레벨="5")
+    ver, _ = store.get_row("books", "b1")
+    store.compare_and_set("books", {"b1": (ver, {'제목': "A (개정판)"})})
+    engine.sync_once()
+    assert remote.pulls == 2
+    assert remote.tables["books"]["b1"] == book("b1", "A (개정판)", "5")
+    assert store.get_row("books", "b1")[1] == book("b1", "A (개정판)", "5")
+
+
+def test_remote_delete_propagates(synced):
+    store, remote, engine = synced
+    remote.delete("books", "b2")
+    assert engine.sync_once() is True
+    assert store.get_row("books", "b2") == (None, None)
+    assert list(local_rows(store)) == ["b1", "b3"]
+
+
+def test_local_edit_after_remote_delete_restores_row(synced):
+    store, remote, engine = synced
+    remote.delete("books", "b2")
+    ver, _ = store.get_row("books", "b2")
+    store.compare_and_set("books", {"b2": (ver, {'레벨': "3"})})
+    engine.sync_once()
+    assert remote.tables["books"]["b2"] == book("b2", "B", "3")
+    assert store.get_row("books", "b2")[1] == book("b2", "B", "3")
+
+
+def test_local_delete_wins_over_older_remote_edit(synced):
+    store, remote, engine = synced
+    remote.edit("books", "b3", 제목="C2")
+    ver, _ = store.get_row("books", "b3")
+    store.compare_and_set("books", {"b3": (ver, None)})
+    engine.sync_once()
+    assert "b3" not in remote.tables["books"]
+    assert store.get_row("books", "b3") == (None, None)
+
+
+def test_remote_edit_wins_over_local_delete_made_before_last_pull(synced):
+    store, remote, engine = synced
+    remote.edit("books", "b3", 제목="C2")
+    ver, _ = store.get_row("books", "b3")
+    # 지난번 동기화 전에 지웠지만 아직 올리지 못한 삭제 (예: 연결이 끊긴 동안)
+    store.compare_and_set("books", {"b3": (ver, None)}, ts=store.get_meta("pulled_at") - 10)
+    engine.sync_once()
+    assert remote.tables["books"]["b3"] == book("b3", "C2")
+    assert store.get_row("books", "b3")[1] == book("b3", "C2")
+
+
+def test_new_local_row_is_appended(synced):
+    store, remote, engine = synced
+    store.compare_and_set("books", {"b4": (None, book("b4", "D"))})
+    engine.sync_once()
+    assert remote.pushed == [("books", ["b4"], [])]
+    assert list(remote.tables["books"]) == ["b1", "b2", "b3", "b4"]
+    assert list(local_rows(store)) == ["b1", "b2", "b3", "b4"]
+
+
+def test_logs_are_pushed_once(synced):
+    store, remote, engine = synced
+    store.add_log(["2025-01-03", "b1", "A", 1, "첫째"])
+    engine.sync_once()
+    engine.sync_once()
+    assert remote.logs == [["2025-01-03", "b1", "A", 1, "첫째"]]
+    assert store.unpushed_logs() == (0, [])
+
+
+def test_edit_elsewhere_during_push_is_pulled_next_time(synced):
+    store, remote, engine = synced
+    push = remote.push
+
+    def push_then_edit_elsewhere(*args):
+        # 올리기 전 수정 표시를 읽은 뒤 다른 곳에서 고치고, 그다음 내 쓰기가 반영됨
+        remote.edit("books", "b3", 제목="C2")
+        push(*args)
+    remote.push = push_then_edit_elsewhere
+    ver, _ = store.get_row("books", "b1")
+    store.compare_and_set("books", {"b1": (ver, {'레벨': "2"})})
+    engine.sync_once()
+    remote.push = push
+    assert engine.sync_once() is True
+    assert remote.pulls == 2
+    assert store.get_row("books", "b3")[1] == book("b3", "C2")
+
+
+def test_own_push_alone_does_not_cause_a_pull(synced):
+    store, remote, engine = synced
+    ver, _ = store.get_row("books", "b1")
+    store.compare_and_set("books", {"b1": (ver, {'레벨': "2"})})
+    store.add_logs([["2025-01-01", "b1", "A", 1, "첫째"]])
+    engine.sync_once()
+    # 표와 로그를 따로 올렸으면 (두 번 씀) 그 사이를 구분할 수 없으므로 한 번 더 받음
+    engine.sync_once()
+    assert remote.pulls == 2
+    store.add_logs([["2025-01-02", "b1", "A", 1, "첫째"]])
+    engine.sync_once()
+    assert engine.sync_once() is False
+    assert remote.pulls == 2
+
+
+def test_time_revision_is_not_adopted_after_push(synced):
+    store, remote, engine = synced
+    remote.revision = lambda: f"2025-01-01T00:00:{remote.rev:02d}Z"
+    engine.sync_once()
+    pulls = remote.pulls
+    ver, _ = store.get_row("books", "b1")
+    store.compare_and_set("books", {"b1": (ver, {'레벨': "2"})})
+    engine.sync_once()
+    engine.sync_once()
+    assert remote.pulls == pulls + 1
+    assert engine.sync_once() is False
+
+
+def test_merge_same_field_later_writer_wins():
+    base = {"b1": book("b1", "A")}
+    remote = {"b1": book("b1", "A-remote")}
+    now = time.time()
+    older = {"b1": {'제목': ("A-local", now - 10)}}
+    newer = {"b1": {'제목': ("A-local", now + 10)}}
+    assert merge(base, remote, older, {}, now)["b1"]['제목'] == "A-remote"
+    assert merge(base, remote, newer, {}, now)["b1"]['제목'] == "A-local"